@@ -4,6 +4,59 @@ from mongoengine.common import _import_class
 __all__ = ("BaseDict", "BaseList")
 
 
+def _set_paths(value, instance, path):
+    """Record the path of `value` and of the embedded documents it holds in
+    the document `instance` it is stored in, so that the embedded documents
+    report their changes to `instance` with their full path.
+    """
+    EmbeddedDocument = _import_class('EmbeddedDocument')
+    if isinstance(value, EmbeddedDocument):
+        value._instance = instance
+        value._path = path
+    elif isinstance(value, (BaseDict, BaseList)):
+        value._instance = instance
+        value._path = path
+        value._set_paths()
+    elif isinstance(value, dict):
+        for key, item in value.iteritems():
+            _set_paths(item, instance, '%s.%s' % (path, key))
+    elif isinstance(value, (list, tuple)):
+        for index, item in enumerate(value):
+            _set_paths(item, instance, '%s.%s' % (path, index))
+
+
+def _unset_paths(value, instance, path):
+    """Detach `value`, taken out of `path` in the document `instance`, and
+    the embedded documents it holds from `instance`, so that their changes
+    are no longer reported to it.  Values linked to another document or
+    path since are left alone.
+    """
+    EmbeddedDocument = _import_class('EmbeddedDocument')
+    if isinstance(value, EmbeddedDocument):
+        if value._instance is instance and value._path == path:
+            value._instance = None
+            value._path = None
+    elif isinstance(value, (BaseDict, BaseList)):
+        if value._instance is instance and value._path == path:
+            value._instance = None
+            value._path = None
+            value._unset_paths(instance, path)
+    elif isinstance(value, dict):
+        for key, item in value.iteritems():
+            _unset_paths(item, instance, '%s.%s' % (path, key))
+    elif isinstance(value, (list, tuple)):
+        for index, item in enumerate(value):
+            _unset_paths(item, instance, '%s.%s' % (path, index))
+
+
+def _items_hold_embedded(instance, name):
+    """Return whether the items of the list or dict field `name` of
+    `instance` may be, or hold, embedded documents.
+    """
+    field = getattr(instance, '_fields', {}).get(name)
+    return getattr(getattr(field, 'field', None), '_holds_embedded', True)
+
+
 class BaseDict(dict):
     """A special dict so we can watch any changes
     """
@@ -11,11 +64,17 @@ class BaseDict(dict):
     _dereferenced = False
     _instance = None
     _name = None
+    _path = None
+    # Whether the items may be embedded documents, whose paths are recorded
+    _holds_embedded = True
 
     def __init__(self, dict_items, instance, name):
         self._instance = weakref.proxy(instance)
         self._name = name
-        return super(BaseDict, self).__init__(dict_items)
+        self._path = getattr(instance, '_db_field_map', {}).get(name, name)
+        self._holds_embedded = _items_hold_embedded(instance, name)
+        super(BaseDict, self).__init__(dict_items)
+        self._set_paths()
 
     def __getitem__(self, *args, **kwargs):
         value = super(BaseDict, self).__getitem__(*args, **kwargs)
@@ -25,17 +84,23 @@ class BaseDict(dict):
             value._instance = self._instance
         return value
 
-    def __setitem__(self, *args, **kwargs):
+    def __setitem__(self, key, value):
         self._mark_as_changed()
-        return super(BaseDict, self).__setitem__(*args, **kwargs)
+        old = dict.get(self, key)
+        super(BaseDict, self).__setitem__(key, value)
+        if old is not value:
+            self._unset_item(key, old)
+        _set_paths(value, self._instance, '%s.%s' % (self._path, key))
 
     def __delete__(self, *args, **kwargs):
         self._mark_as_changed()
         return super(BaseDict, self).__delete__(*args, **kwargs)
 
-    def __delitem__(self, *args, **kwargs):
+    def __delitem__(self, key):
         self._mark_as_changed()
-        return super(BaseDict, self).__delitem__(*args, **kwargs)
+        old = dict.get(self, key)
+        super(BaseDict, self).__delitem__(key)
+        self._unset_item(key, old)
 
     def __delattr__(self, *args, **kwargs):
         self._mark_as_changed()
@@ -52,24 +117,62 @@ class BaseDict(dict):
 
     def clear(self, *args, **kwargs):
         self._mark_as_changed()
+        self._unset_paths(self._instance, self._path)
         return super(BaseDict, self).clear(*args, **kwargs)
 
-    def pop(self, *args, **kwargs):
+    def pop(self, key, *args):
         self._mark_as_changed()
-        return super(BaseDict, self).pop(*args, **kwargs)
+        held = dict.__contains__(self, key)
+        value = super(BaseDict, self).pop(key, *args)
+        if held:
+            self._unset_item(key, value)
+        return value
 
     def popitem(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseDict, self).popitem(*args, **kwargs)
+        key, value = super(BaseDict, self).popitem(*args, **kwargs)
+        self._unset_item(key, value)
+        return key, value
 
     def update(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseDict, self).update(*args, **kwargs)
+        old = dict(self)
+        super(BaseDict, self).update(*args, **kwargs)
+        for key, value in old.iteritems():
+            if dict.get(self, key) is not value:
+                self._unset_item(key, value)
+        self._set_paths()
 
     def _mark_as_changed(self):
+        """Mark the whole field as changed.  Changes within the embedded
+        documents held by the dict are reported with their own path, but
+        setting or removing a key still sets the whole dict.
+        """
         if hasattr(self._instance, '_mark_as_changed'):
             self._instance._mark_as_changed(self._name)
 
+    def _set_paths(self):
+        """Record the paths of the embedded documents held by the dict."""
+        if not self._holds_embedded:
+            return
+        tracked = (_import_class('EmbeddedDocument'), dict, list, tuple)
+        for key, item in dict.iteritems(self):
+            if isinstance(item, tracked):
+                _set_paths(item, self._instance, '%s.%s' % (self._path, key))
+
+    def _unset_item(self, key, value):
+        """Detach `value`, taken out of the dict at `key`."""
+        if value is not None:
+            _unset_paths(value, self._instance, '%s.%s' % (self._path, key))
+
+    def _unset_paths(self, instance, path):
+        """Detach the embedded documents held by the dict, stored at `path`
+        in `instance`."""
+        if not self._holds_embedded:
+            return
+        for key, item in dict.iteritems(self):
+            _unset_paths(item, instance, '%s.%s' % (path, key))
+
 
 class BaseList(list):
     """A special list so we can watch any changes
@@ -78,11 +181,17 @@ class BaseList(list):
     _dereferenced = False
     _instance = None
     _name = None
+    _path = None
+    # Whether the items may be embedded documents, whose paths are recorded
+    _holds_embedded = True
 
     def __init__(self, list_items, instance, name):
         self._instance = weakref.proxy(instance)
         self._name = name
-        return super(BaseList, self).__init__(list_items)
+        self._path = getattr(instance, '_db_field_map', {}).get(name, name)
+        self._holds_embedded = _items_hold_embedded(instance, name)
+        super(BaseList, self).__init__(list_items)
+        self._set_paths()
 
     def __getitem__(self, *args, **kwargs):
         value = super(BaseList, self).__getitem__(*args, **kwargs)
@@ -92,13 +201,45 @@ class BaseList(list):
             value._instance = self._instance
         return value
 
-    def __setitem__(self, *args, **kwargs):
+    def __setitem__(self, key, value):
         self._mark_as_changed()
-        return super(BaseList, self).__setitem__(*args, **kwargs)
+        if isinstance(key, slice):
+            start = self._slice_start(key)
+            self._unset_items(xrange(*key.indices(len(self))))
+            super(BaseList, self).__setitem__(key, value)
+            self._set_paths(start)
+            return
+        index = self._index(key)
+        old = list.__getitem__(self, key)
+        super(BaseList, self).__setitem__(key, value)
+        if old is not value:
+            self._unset_item(index, old)
+        _set_paths(value, self._instance, '%s.%s' % (self._path, index))
+
+    def __delitem__(self, key):
+        self._mark_as_changed()
+        if isinstance(key, slice):
+            start = self._slice_start(key)
+            self._unset_items(xrange(*key.indices(len(self))))
+        else:
+            start = self._index(key)
+            self._unset_items([key])
+        super(BaseList, self).__delitem__(key)
+        self._set_paths(start)
+
+    def __setslice__(self, i, j, sequence):
+        self._mark_as_changed()
+        start = max(min(i, len(self)), 0)
+        self._unset_items(xrange(start, max(min(j, len(self)), start)))
+        super(BaseList, self).__setslice__(i, j, sequence)
+        self._set_paths(start)
 
-    def __delitem__(self, *args, **kwargs):
+    def __delslice__(self, i, j):
         self._mark_as_changed()
-        return super(BaseList, self).__delitem__(*args, **kwargs)
+        start = max(min(i, len(self)), 0)
+        self._unset_items(xrange(start, max(min(j, len(self)), start)))
+        super(BaseList, self).__delslice__(i, j)
+        self._set_paths(start)
 
     def __getstate__(self):
         self.instance = None
@@ -111,32 +252,186 @@ class BaseList(list):
 
     def append(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseList, self).append(*args, **kwargs)
+        super(BaseList, self).append(*args, **kwargs)
+        self._set_paths(len(self) - 1)
 
     def extend(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseList, self).extend(*args, **kwargs)
+        start = len(self)
+        super(BaseList, self).extend(*args, **kwargs)
+        self._set_paths(start)
 
-    def insert(self, *args, **kwargs):
+    def insert(self, index, value):
         self._mark_as_changed()
-        return super(BaseList, self).insert(*args, **kwargs)
+        start = min(max(self._index(index), 0), len(self))
+        super(BaseList, self).insert(index, value)
+        self._set_paths(start)
 
     def pop(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseList, self).pop(*args, **kwargs)
+        index = self._index(args[0]) if args else len(self) - 1
+        value = super(BaseList, self).pop(*args, **kwargs)
+        self._unset_item(index, value)
+        self._set_paths(index)
+        return value
 
-    def remove(self, *args, **kwargs):
+    def remove(self, value):
         self._mark_as_changed()
-        return super(BaseList, self).remove(*args, **kwargs)
+        start = self.index(value)
+        self._unset_items([start])
+        super(BaseList, self).remove(value)
+        self._set_paths(start)
 
     def reverse(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseList, self).reverse(*args, **kwargs)
+        super(BaseList, self).reverse(*args, **kwargs)
+        self._set_paths()
 
     def sort(self, *args, **kwargs):
         self._mark_as_changed()
-        return super(BaseList, self).sort(*args, **kwargs)
+        super(BaseList, self).sort(*args, **kwargs)
+        self._set_paths()
 
     def _mark_as_changed(self):
+        """Mark the whole field as changed.  Changes within the embedded
+        documents held by the list are reported with their own path, but
+        changing the items of the list still sets the whole list, as most
+        changes move the items that follow.
+        """
         if hasattr(self._instance, '_mark_as_changed'):
             self._instance._mark_as_changed(self._name)
+
+    def _index(self, index):
+        """Return the non-negative position of `index` in the list."""
+        if index < 0:
+            return index + len(self)
+        return index
+
+    def _slice_start(self, key):
+        """Return the lowest position affected by the slice `key`."""
+        start, stop, step = key.indices(len(self))
+        if step < 0:
+            start = stop + 1 + (start - stop - 1) % -step
+        return max(min(start, len(self)), 0)
+
+    def _set_paths(self, start=0):
+        """Record the paths of the embedded documents held by the list from
+        index `start` on."""
+        if not self._holds_embedded:
+            return
+        tracked = (_import_class('EmbeddedDocument'), dict, list, tuple)
+        for index in xrange(start, len(self)):
+            item = list.__getitem__(self, index)
+            if isinstance(item, tracked):
+                _set_paths(item, self._instance,
+                           '%s.%s' % (self._path, index))
+
+    def _unset_item(self, index, value):
+        """Detach `value`, taken out of the list at `index`."""
+        if value is not None:
+            _unset_paths(value, self._instance,
+                         '%s.%s' % (self._path, index))
+
+    def _unset_items(self, indexes):
+        """Detach the items at `indexes`, about to be taken out of the
+        list."""
+        for index in indexes:
+            index = self._index(index)
+            self._unset_item(index, list.__getitem__(self, index))
+
+    def _unset_paths(self, instance, path):
+        """Detach the embedded documents held by the list, stored at `path`
+        in `instance`."""
+        if not self._holds_embedded:
+            return
+        for index, item in enumerate(list.__iter__(self)):
+            _unset_paths(item, instance, '%s.%s' % (path, index))
+
+
+class LazyData(dict):
+    """The ``_data`` of documents loaded by
+    :meth:`~mongoengine.queryset.QuerySet.lazy`.  The values of the fields
+    listed in ``_raw`` are kept as they were loaded from the database and
+    are converted by the field the first time they are read.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(LazyData, self).__init__(*args, **kwargs)
+        # field name -> the function converting its value
+        self._raw = {}
+
+    def _convert(self, key):
+        convert = self._raw.pop(key)
+        value = dict.__getitem__(self, key)
+        if value is not None:
+            value = convert(value)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _convert_all(self):
+        for key in self._raw.keys():
+            self._convert(key)
+
+    def __getitem__(self, key):
+        if key in self._raw:
+            return self._convert(key)
+        return super(LazyData, self).__getitem__(key)
+
+    def get(self, key, default=None):
+        if key in self._raw:
+            return self._convert(key)
+        return super(LazyData, self).get(key, default)
+
+    def __setitem__(self, key, value):
+        self._raw.pop(key, None)
+        return super(LazyData, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._raw.pop(key, None)
+        return super(LazyData, self).__delitem__(key)
+
+    def pop(self, key, *args):
+        if key in self._raw:
+            self._convert(key)
+        return super(LazyData, self).pop(key, *args)
+
+    def setdefault(self, key, default=None):
+        if key in self._raw:
+            return self._convert(key)
+        return super(LazyData, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        for key in other:
+            self._raw.pop(key, None)
+        return super(LazyData, self).update(other)
+
+    def copy(self):
+        self._convert_all()
+        return dict(self)
+
+    def items(self):
+        self._convert_all()
+        return super(LazyData, self).items()
+
+    def iteritems(self):
+        self._convert_all()
+        return super(LazyData, self).iteritems()
+
+    def values(self):
+        self._convert_all()
+        return super(LazyData, self).values()
+
+    def itervalues(self):
+        self._convert_all()
+        return super(LazyData, self).itervalues()
+
+    def __eq__(self, other):
+        self._convert_all()
+        return super(LazyData, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
@@ -1,6 +1,7 @@
 import copy
 import operator
 import numbers
+import weakref
 from functools import partial
 
 import pymongo
@@ -16,8 +17,9 @@ from mongoengine.python_support import (PY3, UNICODE_KWARGS, txt_type,
                                         to_str_keys_recursive)
 
 from mongoengine.base.common import get_document, ALLOW_INHERITANCE
-from mongoengine.base.datastructures import BaseDict, BaseList
-from mongoengine.base.fields import ComplexBaseField
+from mongoengine.base.datastructures import (BaseDict, BaseList, LazyData,
+                                             _unset_paths)
+from mongoengine.base.fields import BaseField, ComplexBaseField, _func
 
 __all__ = ('BaseDocument', 'NON_FIELD_ERRORS')
 
@@ -30,6 +32,8 @@ class BaseDocument(object):
     _created = True
     _dynamic_lock = True
     _initialised = False
+    _son_loader = None
+    _son_dumper = None
 
     def __init__(self, *args, **values):
         """
@@ -122,9 +126,16 @@ class BaseDocument(object):
 
             # Handle marking data as changed
             if name in self._dynamic_fields:
+                old = self._data.get(name)
+                if old is not None and old is not value:
+                    _unset_paths(old, weakref.proxy(self), name)
                 self._data[name] = value
                 if hasattr(self, '_changed_fields'):
                     self._mark_as_changed(name)
+                EmbeddedDocument = _import_class('EmbeddedDocument')
+                if isinstance(value, EmbeddedDocument):
+                    value._instance = weakref.proxy(self)
+                    value._path = name
 
         if (self._is_document and not self._created and
            name in self._meta.get('shard_key', tuple()) and
@@ -231,47 +242,10 @@ class BaseDocument(object):
     def to_mongo(self):
         """Return as SON data ready for use with MongoDB.
         """
-        data = SON()
-        data["_id"] = None
-        data['_cls'] = self._class_name
-
-        for field_name in self:
-            value = self._data.get(field_name, None)
-            field = self._fields.get(field_name)
-
-            if value is not None:
-                value = field.to_mongo(value)
-
-            # Handle self generating fields
-            if value is None and field._auto_gen:
-                value = field.generate()
-                self._data[field_name] = value
-
-            if value is not None:
-                data[field.db_field] = value
-
-        # If "_id" has not been set, then try and set it
-        if data["_id"] is None:
-            data["_id"] = self._data.get("id", None)
-
-        if data['_id'] is None:
-            data.pop('_id')
-
-        # Only add _cls if allow_inheritance is True
-        if (not hasattr(self, '_meta') or
-           not self._meta.get('allow_inheritance', ALLOW_INHERITANCE)):
-            data.pop('_cls')
-
-        if not self._dynamic:
-            return data
-
-        # Sort dynamic fields by key
-        dynamic_fields = sorted(self._dynamic_fields.iteritems(),
-                                key=operator.itemgetter(0))
-        for name, field in dynamic_fields:
-            data[name] = field.to_mongo(self._data.get(name, None))
-
-        return data
+        dumper = self._son_dumper
+        if dumper is None:
+            dumper = self._compile_son_dumper()
+        return dumper(self)
 
     def validate(self, clean=True):
         """Ensure that all fields' values are valid and that required fields
@@ -285,40 +259,119 @@ class BaseDocument(object):
             except ValidationError, error:
                 errors[NON_FIELD_ERRORS] = error
 
-        # Get a list of tuples of field names and their current values
-        fields = [(field, self._data.get(name))
-                  for name, field in self._fields.items()]
-        if self._dynamic:
-            fields += [(field, self._data.get(name))
-                       for name, field in self._dynamic_fields.items()]
-
-        EmbeddedDocumentField = _import_class("EmbeddedDocumentField")
-        GenericEmbeddedDocumentField = _import_class("GenericEmbeddedDocumentField")
+        # Values that haven't been read since they were loaded lazily are
+        # left as they are in the database
+        lazy = self._unread_fields()
+        _data = self._data
 
-        for field, value in fields:
+        for name, validator, embedded, required in self._field_validators():
+            if name in lazy:
+                continue
+            value = _data.get(name)
             if value is not None:
+                if validator is None:
+                    continue
                 try:
-                    if isinstance(field, (EmbeddedDocumentField,
-                                          GenericEmbeddedDocumentField)):
-                        field._validate(value, clean=clean)
+                    if embedded:
+                        validator(value, clean=clean)
                     else:
-                        field._validate(value)
+                        validator(value)
                 except ValidationError, error:
-                    errors[field.name] = error.errors or error
+                    errors[name] = error.errors or error
                 except (ValueError, AttributeError, AssertionError), error:
-                    errors[field.name] = error
-            elif field.required and not getattr(field, '_auto_gen', False):
-                errors[field.name] = ValidationError('Field is required',
-                                                     field_name=field.name)
+                    errors[name] = error
+            elif required:
+                errors[name] = ValidationError('Field is required',
+                                               field_name=name)
+
+        if self._dynamic:
+            for name, field in self._dynamic_fields.items():
+                _validate_field(field, _data.get(name), clean, errors, name)
+
+        if errors:
+            self._raise_validation_errors(errors)
+
+    def _validate_changed(self, clean=True):
+        """Ensure that the values of the fields at the paths changed since
+        the document was loaded or saved are valid, see :meth:`validate`.
+        """
+        errors = {}
+        if clean:
+            try:
+                self.clean()
+            except ValidationError, error:
+                errors[NON_FIELD_ERRORS] = error
+
+        for path in self._get_changed_fields():
+            # Find the field at the end of the path, in the innermost
+            # document along it
+            document, field, key = self, None, []
+            value = self
+            for part in path.split('.'):
+                if isinstance(value, BaseDocument):
+                    document = value
+                    name = value._reverse_db_field_map.get(part, part)
+                    field = (value._fields.get(name) or
+                             getattr(value, '_dynamic_fields', {}).get(name))
+                    key.append(name)
+                else:
+                    field = None
+                    key.append(int(part) if part.isdigit() else part)
+                value = _get_path_item(value, part)
+                if value is None:
+                    break
+            if field is None:
+                continue
+            field_errors = {}
+            value = document._data.get(field.name)
+            _validate_field(field, value, clean, field_errors, key[-1])
+            if not field_errors:
+                continue
+            # Nest the errors like those of embedded documents and lists
+            path_errors = errors
+            for part in key[:-1]:
+                path_errors = path_errors.setdefault(part, {})
+                if not isinstance(path_errors, dict):
+                    break
+            else:
+                path_errors.update(field_errors)
 
         if errors:
-            pk = "None"
-            if hasattr(self, 'pk'):
-                pk = self.pk
-            elif self._instance:
-                pk = self._instance.pk
-            message = "ValidationError (%s:%s) " % (self._class_name, pk)
-            raise ValidationError(message, errors=errors)
+            self._raise_validation_errors(errors)
+
+    def _raise_validation_errors(self, errors):
+        pk = "None"
+        if hasattr(self, 'pk'):
+            pk = self.pk
+        elif self._instance:
+            pk = self._instance.pk
+        message = "ValidationError (%s:%s) " % (self._class_name, pk)
+        raise ValidationError(message, errors=errors)
+
+    @classmethod
+    def _field_validators(cls):
+        """Return the ``(name, validator, embedded, required)`` of each field
+        used by :meth:`validate`, worked out the first time the class is
+        validated.  The validator is `None` for fields without constraints.
+        """
+        validators = cls.__dict__.get('_validators')
+        if validators is None:
+            EmbeddedDocumentField = _import_class("EmbeddedDocumentField")
+            GenericEmbeddedDocumentField = _import_class(
+                "GenericEmbeddedDocumentField")
+            validators = []
+            for name, field in cls._fields.iteritems():
+                if _func(field.__class__._validate) is _func(
+                        BaseField._validate):
+                    validator = field._get_validator()
+                else:
+                    validator = field._validate
+                embedded = isinstance(field, (EmbeddedDocumentField,
+                                              GenericEmbeddedDocumentField))
+                required = field.required and not field._auto_gen
+                validators.append((name, validator, embedded, required))
+            cls._validators = validators
+        return validators
 
     def to_json(self):
         """Converts a document to JSON"""
@@ -373,147 +426,143 @@ class BaseDocument(object):
            key not in self._changed_fields):
             self._changed_fields.append(key)
 
+    def _unread_fields(self):
+        """Return the names of the fields of a lazily loaded document whose
+        values haven't been read yet.
+        """
+        if isinstance(self._data, LazyData):
+            return self._data._raw
+        return ()
+
     def _clear_changed_fields(self):
+        """Clears the changed fields of the document and of the embedded
+        documents along and within the changed paths.
+        """
+        changed_fields = getattr(self, '_changed_fields', None)
         self._changed_fields = []
-        EmbeddedDocumentField = _import_class("EmbeddedDocumentField")
-        for field_name, field in self._fields.iteritems():
-            if (isinstance(field, ComplexBaseField) and
-               isinstance(field.field, EmbeddedDocumentField)):
-                field_value = getattr(self, field_name, None)
-                if field_value:
-                    for idx in (field_value if isinstance(field_value, dict)
-                                else xrange(len(field_value))):
-                        field_value[idx]._clear_changed_fields()
-            elif isinstance(field, EmbeddedDocumentField):
-                field_value = getattr(self, field_name, None)
-                if field_value:
-                    field_value._clear_changed_fields()
-
-    def _get_changed_fields(self, key='', inspected=None):
+        for path in changed_fields or ():
+            value = self
+            for part in path.split('.'):
+                value = _get_path_item(value, part)
+                if value is None:
+                    break
+                if isinstance(value, _import_class('EmbeddedDocument')):
+                    value._changed_fields = []
+            else:
+                _clear_embedded_changed_fields(value)
+
+    def _get_changed_fields(self):
         """Returns a list of all fields that have explicitly been changed.
+
+        Embedded documents and the lists and dicts holding them report the
+        full path of their changes as they happen, so only the paths within
+        another changed path are left out.
         """
-        EmbeddedDocument = _import_class("EmbeddedDocument")
-        DynamicEmbeddedDocument = _import_class("DynamicEmbeddedDocument")
+        changed_fields = getattr(self, '_changed_fields', [])
+        if len(changed_fields) < 2:
+            return list(changed_fields)
+        paths = set(changed_fields)
         _changed_fields = []
-        _changed_fields += getattr(self, '_changed_fields', [])
-
-        inspected = inspected or set()
-        if hasattr(self, 'id'):
-            if self.id in inspected:
-                return _changed_fields
-            inspected.add(self.id)
-
-        field_list = self._fields.copy()
-        if self._dynamic:
-            field_list.update(self._dynamic_fields)
-
-        for field_name in field_list:
-
-            db_field_name = self._db_field_map.get(field_name, field_name)
-            key = '%s.' % db_field_name
-            field = self._data.get(field_name, None)
-            if hasattr(field, 'id'):
-                if field.id in inspected:
-                    continue
-                inspected.add(field.id)
-
-            if (isinstance(field, (EmbeddedDocument, DynamicEmbeddedDocument))
-               and db_field_name not in _changed_fields):
-                 # Find all embedded fields that have been changed
-                changed = field._get_changed_fields(key, inspected)
-                _changed_fields += ["%s%s" % (key, k) for k in changed if k]
-            elif (isinstance(field, (list, tuple, dict)) and
-                    db_field_name not in _changed_fields):
-                # Loop list / dict fields as they contain documents
-                # Determine the iterator to use
-                if not hasattr(field, 'items'):
-                    iterator = enumerate(field)
-                else:
-                    iterator = field.iteritems()
-                for index, value in iterator:
-                    if not hasattr(value, '_get_changed_fields'):
-                        continue
-                    list_key = "%s%s." % (key, index)
-                    changed = value._get_changed_fields(list_key, inspected)
-                    _changed_fields += ["%s%s" % (list_key, k)
-                                        for k in changed if k]
+        for path in changed_fields:
+            parts = path.split('.')
+            if not any('.'.join(parts[:i]) in paths
+                       for i in xrange(1, len(parts))):
+                _changed_fields.append(path)
         return _changed_fields
 
     def _delta(self):
         """Returns the delta (set, unset) of the changes for a document.
         Gets any values that have been explicitly changed.
+
+        Only the values at the changed paths are converted for MongoDB.
         """
-        # Handles cases where not loaded from_son but has _id
-        doc = self.to_mongo()
+        if not hasattr(self, '_changed_fields'):
+            # Handles cases where not loaded from_son but has _id
+            set_data = self.to_mongo()
+            set_data.pop('_id', None)
+            path_fields = dict((field.db_field, field)
+                               for field in self._fields.itervalues())
+            return self._split_unset(set_data, path_fields)
 
-        set_fields = self._get_changed_fields()
         set_data = {}
+        path_fields = {}
+        for path in self._get_changed_fields():
+            path, value, field = self._path_to_mongo(path)
+            set_data[path] = value
+            path_fields[path] = field
+        return self._split_unset(set_data, path_fields)
+
+    def _path_to_mongo(self, path):
+        """Return the path to set for a changed `path`, the value at the path
+        converted for MongoDB and the document field holding the value, or
+        `None` for items of lists and dicts.  Paths through a reference end
+        at the reference.
+        """
+        Document = _import_class('Document')
+
+        parts = path.split('.')
+        value = self
+        # The field of the value and of the list or dict holding it
+        field = container = None
+        for index, part in enumerate(parts):
+            if index and isinstance(value, (Document, DBRef)):
+                # Set the whole reference
+                path = '.'.join(parts[:index])
+                break
+            if isinstance(value, BaseDocument):
+                document = value
+                name = document._reverse_db_field_map.get(part, part)
+                field = (document._fields.get(name) or
+                         getattr(document, '_dynamic_fields', {}).get(name))
+                container = None
+                value = document._data.get(name)
+                # Handle self generating fields
+                if value is None and getattr(field, '_auto_gen', False):
+                    value = field.generate()
+                    document._data[name] = value
+            else:
+                if field is not None:
+                    container = field
+                if isinstance(field, ComplexBaseField):
+                    field = field.field
+                else:
+                    field = None
+                value = _get_path_item(value, part)
+            if value is None:
+                break
+
+        document_field = field if container is None else None
+        if value is None:
+            return path, None, document_field
+        if field is not None:
+            value = field.to_mongo(value)
+        elif container is not None:
+            value = container.to_mongo([value])[0]
+        return path, value, document_field
+
+    def _split_unset(self, set_data, path_fields):
+        """Move the empty values of `set_data` that are the default of their
+        field, or of a dynamic field, to the unset data.
+
+        :param set_data: the values to set keyed by path
+        :param path_fields: the document fields of the paths
+        """
         unset_data = {}
-        parts = []
-        if hasattr(self, '_changed_fields'):
-            set_data = {}
-            # Fetch each set item from its path
-            for path in set_fields:
-                parts = path.split('.')
-                d = doc
-                new_path = []
-                for p in parts:
-                    if isinstance(d, DBRef):
-                        break
-                    elif isinstance(d, list) and p.isdigit():
-                        d = d[int(p)]
-                    elif hasattr(d, 'get'):
-                        d = d.get(p)
-                    new_path.append(p)
-                path = '.'.join(new_path)
-                set_data[path] = d
-        else:
-            set_data = doc
-            if '_id' in set_data:
-                del(set_data['_id'])
-
-        # Determine if any changed items were actually unset.
         for path, value in set_data.items():
             if value or isinstance(value, (numbers.Number, bool)):
                 continue
 
             # If we've set a value that ain't the default value dont unset it.
-            default = None
-            if (self._dynamic and len(parts) and parts[0] in
-               self._dynamic_fields):
-                del(set_data[path])
-                unset_data[path] = 1
-                continue
-            elif path in self._fields:
-                default = self._fields[path].default
-            else:  # Perform a full lookup for lists / embedded lookups
-                d = self
-                parts = path.split('.')
-                db_field_name = parts.pop()
-                for p in parts:
-                    if isinstance(d, list) and p.isdigit():
-                        d = d[int(p)]
-                    elif (hasattr(d, '__getattribute__') and
-                          not isinstance(d, dict)):
-                        real_path = d._reverse_db_field_map.get(p, p)
-                        d = getattr(d, real_path)
-                    else:
-                        d = d.get(p)
-
-                if hasattr(d, '_fields'):
-                    field_name = d._reverse_db_field_map.get(db_field_name,
-                                                             db_field_name)
-                    if field_name in d._fields:
-                        default = d._fields.get(field_name).default
-                    else:
-                        default = None
-
-            if default is not None:
-                if callable(default):
-                    default = default()
-
-            if default != value:
-                continue
+            if not (self._dynamic and
+                    path.split('.', 1)[0] in self._dynamic_fields):
+                field = path_fields.get(path)
+                default = None
+                if field is not None:
+                    default = field.default
+                    if callable(default):
+                        default = default()
+                if default != value:
+                    continue
 
             del(set_data[path])
             unset_data[path] = 1
@@ -526,23 +575,40 @@ class BaseDocument(object):
         return cls._meta.get('collection', None)
 
     @classmethod
-    def _from_son(cls, son, _auto_dereference=True):
+    def _from_son(cls, son, _auto_dereference=True, _lazy=False):
         """Create an instance of a Document (subclass) from a PyMongo SON.
+
+        If `_lazy` is set the values of the fields are converted when they
+        are first read, if the class can be loaded without its constructor.
         """
 
         # get the class name from the document, falling back to the given
         # class if unavailable
         class_name = son.get('_cls', cls._class_name)
+
+        # Return correct subclass for document type
+        if class_name != cls._class_name:
+            cls = get_document(class_name)
+
+        # Use the loader compiled by the metaclass unless init signals need
+        # to see the full constructor call
+        if cls._son_loader is not None and not (
+           signals.pre_init.has_receivers_for(cls) or
+           signals.post_init.has_receivers_for(cls)):
+            return cls._son_loader(son, _auto_dereference, _lazy)
+        return cls._from_son_via_init(son, _auto_dereference)
+
+    @classmethod
+    def _from_son_via_init(cls, son, _auto_dereference=True):
+        """Create an instance from a PyMongo SON by converting the values
+        and passing them through the class constructor.
+        """
         data = dict(("%s" % key, value) for key, value in son.iteritems())
         if not UNICODE_KWARGS:
             # python 2.6.4 and lower cannot handle unicode keys
             # passed to class constructor example: cls(**data)
             to_str_keys_recursive(data)
 
-        # Return correct subclass for document type
-        if class_name != cls._class_name:
-            cls = get_document(class_name)
-
         changed_fields = []
         errors_dict = {}
 
@@ -569,11 +635,7 @@ class BaseDocument(object):
                     changed_fields.append(field_name)
 
         if errors_dict:
-            errors = "\n".join(["%s - %s" % (k, v)
-                     for k, v in errors_dict.items()])
-            msg = ("Invalid data to create a `%s` instance.\n%s"
-                   % (cls._class_name, errors))
-            raise InvalidDocumentError(msg)
+            cls._raise_son_errors(errors_dict)
 
         obj = cls(__auto_convert=False, **data)
         obj._changed_fields = changed_fields
@@ -582,6 +644,271 @@ class BaseDocument(object):
             obj._fields = fields
         return obj
 
+    @classmethod
+    def _raise_son_errors(cls, errors_dict):
+        errors = "\n".join(["%s - %s" % (k, v)
+                            for k, v in errors_dict.items()])
+        msg = ("Invalid data to create a `%s` instance.\n%s"
+               % (cls._class_name, errors))
+        raise InvalidDocumentError(msg)
+
+    @classmethod
+    def _compile_setattr(cls):
+        """Build the ``__setattr__`` of the class.  Classes that aren't
+        dynamic and have no shard key get one that only has to notice the
+        primary key of a new document being set, the others use
+        :meth:`BaseDocument.__setattr__`.  Returns ``None`` if the class
+        defines its own.
+        """
+        for klass in cls.__mro__:
+            if '__setattr__' in klass.__dict__:
+                if (klass is not BaseDocument and
+                   not klass.__dict__.get('_compiled_setattr')):
+                    return None
+                break
+        if cls._dynamic or cls._meta.get('shard_key'):
+            return BaseDocument.__dict__['__setattr__']
+
+        object_setattr = object.__setattr__
+        if not cls._is_document:
+            return object_setattr
+
+        id_field = cls._meta.get('id_field')
+
+        def __setattr__(self, name, value):
+            # Check if the user has created a new instance of a class
+            if name == id_field and self._initialised and self._created:
+                object_setattr(self, '_created', False)
+            object_setattr(self, name, value)
+        return __setattr__
+
+    @classmethod
+    def _compile_son_dumper(cls):
+        """Build the serializer used by :meth:`to_mongo` for this class.
+
+        The order of the fields in the SON and the conversion of each field
+        are worked out once, so values that a field stores unchanged (such as
+        unicode values of a :class:`~mongoengine.StringField`) skip its
+        ``to_mongo`` and the items of typed lists are converted directly.
+        """
+        names = cls._fields_ordered
+        if 'id' in cls._fields and 'id' not in names:
+            names = ('id',) + tuple(names)
+
+        # (field name, db field, converter or None, field if self generating)
+        id_specs = []
+        specs = []
+        for name in names:
+            field = cls._fields[name]
+            spec = (name, field.db_field, _mongo_converter(field),
+                    field if field._auto_gen else None)
+            if field.db_field == '_id' and not id_specs:
+                id_specs.append(spec)
+            else:
+                specs.append(spec)
+        dynamic = cls._dynamic
+
+        def dump_fields(data, _data, lazy, specs):
+            for name, db_field, convert, auto_gen in specs:
+                if name in lazy:
+                    # Values that haven't been read are stored as they were
+                    # loaded
+                    data[db_field] = dict.get(_data, name)
+                    continue
+                value = _data.get(name, None)
+                if value is not None and convert is not None:
+                    value = convert(value)
+                # Handle self generating fields
+                if value is None and auto_gen is not None:
+                    value = auto_gen.generate()
+                    _data[name] = value
+                if value is not None:
+                    data[db_field] = value
+
+        def dump(doc):
+            data = SON()
+            _data = doc._data
+            lazy = doc._unread_fields()
+
+            dump_fields(data, _data, lazy, id_specs)
+            if '_id' not in data:
+                value = _data.get('id', None)
+                if value is not None:
+                    data['_id'] = value
+
+            # Only add _cls if allow_inheritance is True
+            meta = getattr(doc, '_meta', None)
+            if meta and meta.get('allow_inheritance', ALLOW_INHERITANCE):
+                data['_cls'] = doc._class_name
+
+            dump_fields(data, _data, lazy, specs)
+
+            if dynamic:
+                # Sort dynamic fields by key
+                dynamic_fields = sorted(doc._dynamic_fields.iteritems(),
+                                        key=operator.itemgetter(0))
+                for name, field in dynamic_fields:
+                    data[name] = field.to_mongo(_data.get(name, None))
+            return data
+
+        return dump
+
+    @classmethod
+    def _compile_son_loader(cls):
+        """Build the loader used by :meth:`_from_son` for this class.
+
+        The loader fills ``_data`` straight from the SON instead of going
+        through :meth:`__init__`, skipping the ``to_python`` call for fields
+        that don't convert their values.  Fields with their own descriptor
+        logic are still assigned through ``setattr``.  Lazy loads keep the
+        values of the other fields in a :class:`LazyData` to be converted when
+        they are first read.  Returns ``None`` if the
+        class has to be built through its constructor (dynamic documents or a
+        custom ``__init__``).
+        """
+        if cls._dynamic or not UNICODE_KWARGS:
+            return None
+        for klass in cls.__mro__:
+            if '__init__' in klass.__dict__:
+                if klass.__module__ not in ('mongoengine.base.document',
+                                            'mongoengine.document'):
+                    return None
+                break
+
+        ReferenceField = _import_class('ReferenceField')
+        GenericReferenceField = _import_class('GenericReferenceField')
+        EmbeddedDocument = _import_class('EmbeddedDocument')
+
+        def func(method):
+            return getattr(method, '__func__', method)
+
+        identity = func(BaseField.to_python)
+        plain_getters = set(func(k.__get__) for k in (
+            BaseField, ComplexBaseField, ReferenceField,
+            GenericReferenceField))
+        plain_setters = set(func(k.__set__) for k in (
+            BaseField, ComplexBaseField))
+
+        # db_field -> (field name, converter or None, plain descriptor)
+        db_fields = {}
+        # (field name, field, complex) for plain fields, used for defaults
+        plain_fields = []
+        special_fields = []
+        for name, field in cls._fields.iteritems():
+            klass = field.__class__
+            plain = (func(klass.__get__) in plain_getters and
+                     func(klass.__set__) in plain_setters)
+            convert = field.to_python
+            if func(convert) is identity:
+                convert = None
+            db_fields[field.db_field] = (name, convert, plain)
+            if plain:
+                plain_fields.append((name, field,
+                                     isinstance(field, ComplexBaseField)))
+            else:
+                special_fields.append(name)
+
+        all_fields = tuple(cls._fields.itervalues())
+        choice_fields = tuple(f for f in all_fields if f.choices)
+        field_names = frozenset(cls._fields)
+
+        def load(son, _auto_dereference=True, _lazy=False):
+            fields = cls._fields
+            if not _auto_dereference:
+                fields = copy.copy(fields)
+            for field in all_fields:
+                field._auto_dereference = _auto_dereference
+
+            data = {}
+            if _lazy:
+                data = LazyData()
+                lazy = []
+            special = {}
+            extra = []
+            errors_dict = {}
+            for key, value in son.iteritems():
+                spec = db_fields.get(key)
+                if spec is None:
+                    extra.append((key, value))
+                    continue
+                name, convert, plain = spec
+                if _lazy and plain and convert is not None:
+                    lazy.append((name, convert))
+                elif value is not None and convert is not None:
+                    try:
+                        value = convert(value)
+                    except (AttributeError, ValueError), e:
+                        errors_dict[name] = e
+                        continue
+                if plain:
+                    data[name] = value
+                else:
+                    special[name] = value
+
+            if errors_dict:
+                cls._raise_son_errors(errors_dict)
+            if _lazy:
+                data._raw.update(lazy)
+
+            obj = cls.__new__(cls)
+            obj.__dict__['_data'] = data
+
+            changed_fields = []
+            for name, field, is_complex in plain_fields:
+                if name in data:
+                    continue
+                value = field.default
+                if callable(value):
+                    value = value()
+                if isinstance(value, BaseDocument):
+                    if field.default:
+                        changed_fields.append(name)
+                    if (isinstance(value, EmbeddedDocument) and
+                       value._instance is None):
+                        value._instance = weakref.proxy(obj)
+                        value._path = field.db_field
+                elif is_complex:
+                    if (isinstance(value, (list, tuple)) and
+                       not isinstance(value, BaseList)):
+                        value = BaseList(value, obj, name)
+                    elif (isinstance(value, dict) and
+                          not isinstance(value, BaseDict)):
+                        value = BaseDict(value, obj, name)
+                data[name] = value
+
+            for name in special_fields:
+                if name in special:
+                    setattr(obj, name, special[name])
+                else:
+                    setattr(obj, name, getattr(obj, name, None))
+                    if (cls._fields[name].default and
+                       isinstance(data.get(name), BaseDocument)):
+                        changed_fields.append(name)
+
+            for key, value in extra:
+                key = "%s" % key
+                if key in field_names:
+                    if key not in data and key not in special:
+                        setattr(obj, key, value)
+                elif key == '_cls':
+                    obj.__dict__[key] = value
+                elif key in ('id', 'pk'):
+                    setattr(obj, key, value)
+                else:
+                    data[key] = value
+
+            for field in choice_fields:
+                setattr(obj, 'get_%s_display' % field.name,
+                        partial(obj.__get_field_display, field=field))
+
+            obj.__dict__.update(_initialised=True, _created=False,
+                                _changed_fields=changed_fields)
+            if not _auto_dereference:
+                obj._fields = fields
+            return obj
+
+        return load
+
     @classmethod
     def _build_index_specs(cls, meta_indexes):
         """Generate and merge the full index specs
@@ -813,3 +1140,124 @@ class BaseDocument(object):
         if field.choices and isinstance(field.choices[0], (list, tuple)):
             return dict(field.choices).get(value, value)
         return value
+
+
+def _validate_field(field, value, clean, errors, key):
+    """Validate the `value` of `field`, adding any error to `errors` under
+    `key`."""
+    EmbeddedDocumentField = _import_class("EmbeddedDocumentField")
+    GenericEmbeddedDocumentField = _import_class(
+        "GenericEmbeddedDocumentField")
+    if value is not None:
+        try:
+            if isinstance(field, (EmbeddedDocumentField,
+                                  GenericEmbeddedDocumentField)):
+                field._validate(value, clean=clean)
+            else:
+                field._validate(value)
+        except ValidationError, error:
+            errors[key] = error.errors or error
+        except (ValueError, AttributeError, AssertionError), error:
+            errors[key] = error
+    elif field.required and not getattr(field, '_auto_gen', False):
+        errors[key] = ValidationError('Field is required',
+                                      field_name=field.name)
+
+
+def _get_path_item(value, part):
+    """Return the item at `part` of a changed path in `value`, or `None`."""
+    if isinstance(value, BaseDocument):
+        name = value._reverse_db_field_map.get(part, part)
+        if name in value._unread_fields():
+            return None
+        return dict.get(value._data, name)
+    if isinstance(value, dict):
+        return dict.get(value, part)
+    if isinstance(value, (list, tuple)) and part.isdigit():
+        index = int(part)
+        if index < len(value):
+            if isinstance(value, list):
+                return list.__getitem__(value, index)
+            return value[index]
+    return None
+
+
+def _clear_embedded_changed_fields(value):
+    """Clear the changed fields of the embedded documents within `value`."""
+    if isinstance(value, _import_class('EmbeddedDocument')):
+        value._changed_fields = []
+        lazy = value._unread_fields()
+        for name, item in dict.iteritems(value._data):
+            if name not in lazy:
+                _clear_embedded_changed_fields(item)
+    elif isinstance(value, dict):
+        for item in dict.itervalues(value):
+            _clear_embedded_changed_fields(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _clear_embedded_changed_fields(item)
+
+
+_UNCHANGED_TYPES = {}
+
+
+def _unchanged_types(field):
+    """Return the types of the values the ``to_mongo`` of `field` returns
+    unchanged, `True` if it returns every value unchanged or `None`.
+    """
+    klass = field.__class__
+    if _func(klass.to_mongo) is not _func(BaseField.to_mongo):
+        return None
+    to_python = _func(klass.to_python)
+    if to_python is _func(BaseField.to_python):
+        return True
+    if not _UNCHANGED_TYPES:
+        for name, types in (('StringField', (unicode,)),
+                            ('IntField', (int,)),
+                            ('LongField', (long,)),
+                            ('FloatField', (float,)),
+                            ('BooleanField', (bool,))):
+            klass = _import_class(name)
+            _UNCHANGED_TYPES[_func(klass.to_python)] = frozenset(types)
+    return _UNCHANGED_TYPES.get(to_python)
+
+
+def _mongo_converter(field):
+    """Return the function converting the values of `field` for
+    :meth:`BaseDocument.to_mongo`, or `None` if they are stored unchanged.
+    """
+    types = _unchanged_types(field)
+    if types is True:
+        return None
+    to_mongo = field.to_mongo
+    if types is not None:
+        return lambda value: value if type(value) in types else to_mongo(value)
+
+    item_field = getattr(field, 'field', None)
+    if (item_field is None or _func(field.__class__.to_mongo) is not
+       _func(ComplexBaseField.to_mongo)):
+        return to_mongo
+
+    # Typed lists are converted item by item
+    types = _unchanged_types(item_field)
+    if types is True:
+        def convert(value):
+            if isinstance(value, (list, tuple)):
+                return list(value)
+            return to_mongo(value)
+    elif types is not None:
+        item_to_mongo = item_field.to_mongo
+
+        def convert(value):
+            if isinstance(value, (list, tuple)):
+                return [item if type(item) in types else item_to_mongo(item)
+                        for item in value]
+            return to_mongo(value)
+    else:
+        convert_item = _mongo_converter(item_field) or item_field.to_mongo
+
+        def convert(value):
+            if isinstance(value, (list, tuple)):
+                return [convert_item(item) for item in value]
+            return to_mongo(value)
+    return convert
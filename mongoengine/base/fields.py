@@ -8,11 +8,17 @@ from mongoengine.common import _import_class
 from mongoengine.errors import ValidationError
 
 from mongoengine.base.common import ALLOW_INHERITANCE
-from mongoengine.base.datastructures import BaseDict, BaseList
+from mongoengine.base.datastructures import (BaseDict, BaseList,
+                                             _items_hold_embedded, _set_paths,
+                                             _unset_paths)
 
 __all__ = ("BaseField", "ComplexBaseField", "ObjectIdField")
 
 
+def _func(method):
+    return getattr(method, '__func__', method)
+
+
 class BaseField(object):
     """A base class for fields in a MongoDB document. Instances of this class
     may be added to subclasses of `Document` to define a document's schema.
@@ -24,6 +30,9 @@ class BaseField(object):
     _geo_index = False
     _auto_gen = False  # Call `generate` to generate a value
     _auto_dereference = True
+    # Whether values may be embedded documents, which are linked to the
+    # document holding them when read or set
+    _holds_embedded = True
 
     # These track each time a Field instance is created. Used to retain order.
     # The auto_creation_counter is used for fields that MongoEngine implicitly
@@ -73,21 +82,33 @@ class BaseField(object):
             if callable(value):
                 value = value()
 
-        EmbeddedDocument = _import_class('EmbeddedDocument')
-        if isinstance(value, EmbeddedDocument) and value._instance is None:
-            value._instance = weakref.proxy(instance)
+        if self._holds_embedded:
+            EmbeddedDocument = _import_class('EmbeddedDocument')
+            if (isinstance(value, EmbeddedDocument) and
+               value._instance is None):
+                value._instance = weakref.proxy(instance)
+                value._path = self.db_field
         return value
 
     def __set__(self, instance, value):
         """Descriptor for assigning a value to a field in a document.
         """
         changed = False
-        if (self.name not in instance._data or
-           instance._data[self.name] != value):
+        old = instance._data.get(self.name)
+        if (self.name not in instance._data or old != value):
             changed = True
             instance._data[self.name] = value
         if changed and instance._initialised:
             instance._mark_as_changed(self.name)
+        if not self._holds_embedded:
+            return
+        # Link embedded documents to the instance to report their changes,
+        # and detach those of the value replaced
+        if changed and old is not None and old is not value:
+            _unset_paths(old, weakref.proxy(instance), self.db_field)
+        if isinstance(value, (_import_class('EmbeddedDocument'), dict, list,
+                              tuple)):
+            _set_paths(value, weakref.proxy(instance), self.db_field)
 
     def error(self, message="", errors=None, field_name=None):
         """Raises a ValidationError.
@@ -116,34 +137,85 @@ class BaseField(object):
         pass
 
     def _validate(self, value, **kwargs):
+        validator = self._get_validator()
+        if validator is not None:
+            validator(value, **kwargs)
+
+    def _get_validator(self):
+        """Return the validator of the field, compiled the first time it is
+        used, see :meth:`_compile_validator`.
+        """
+        try:
+            return self.__dict__['_validator']
+        except KeyError:
+            validator = self.__dict__['_validator'] = self._compile_validator()
+            return validator
+
+    def _compile_validator(self):
+        """Return a function checking a value against the choices, the
+        validation argument and :meth:`validate` of the field, with the
+        choices and validation worked out once, or `None` if the field has
+        nothing to check.
+        """
+        checks = []
+        if self.choices:
+            checks.append(self._compile_choices_check())
+
+        validation = self.validation
+        if validation is not None:
+            if callable(validation):
+                def check_validation(value):
+                    if not validation(value):
+                        self.error('Value does not match custom validation '
+                                   'method')
+            else:
+                def check_validation(value):
+                    raise ValueError('validation argument for "%s" must be a '
+                                     'callable.' % self.name)
+            checks.append(check_validation)
+
+        validate = self.validate
+        if getattr(validate, '__func__', None) is _func(BaseField.validate):
+            validate = None
+        if not checks:
+            return validate
+
+        def validator(value, **kwargs):
+            for check in checks:
+                check(value)
+            if validate is not None:
+                validate(value, **kwargs)
+        return validator
+
+    def _compile_choices_check(self):
+        """Return a function checking that a value is one of the choices of
+        the field, looked up in a frozenset when the choices are hashable.
+        """
         Document = _import_class('Document')
         EmbeddedDocument = _import_class('EmbeddedDocument')
-        # check choices
-        if self.choices:
+
+        if isinstance(self.choices[0], (list, tuple)):
+            option_keys = [k for k, v in self.choices]
+        else:
+            option_keys = self.choices
+        try:
+            options = frozenset(option_keys)
+        except TypeError:
+            options = option_keys
+
+        def check_choices(value):
             is_cls = isinstance(value, (Document, EmbeddedDocument))
             value_to_check = value.__class__ if is_cls else value
-            err_msg = 'an instance' if is_cls else 'one'
-            if isinstance(self.choices[0], (list, tuple)):
-                option_keys = [k for k, v in self.choices]
-                if value_to_check not in option_keys:
-                    msg = ('Value must be %s of %s' %
+            try:
+                found = value_to_check in options
+            except TypeError:
+                # Unhashable values are compared with each choice
+                found = value_to_check in option_keys
+            if not found:
+                err_msg = 'an instance' if is_cls else 'one'
+                self.error('Value must be %s of %s' %
                            (err_msg, unicode(option_keys)))
-                    self.error(msg)
-            elif value_to_check not in self.choices:
-                msg = ('Value must be %s of %s' %
-                       (err_msg, unicode(self.choices)))
-                self.error(msg)
-
-        # check validation argument
-        if self.validation is not None:
-            if callable(self.validation):
-                if not self.validation(value):
-                    self.error('Value does not match custom validation method')
-            else:
-                raise ValueError('validation argument for "%s" must be a '
-                                 'callable.' % self.name)
-
-        self.validate(value, **kwargs)
+        return check_choices
 
 
 class ComplexBaseField(BaseField):
@@ -204,6 +276,16 @@ class ComplexBaseField(BaseField):
     def __set__(self, instance, value):
         """Descriptor for assigning a value to a field in a document.
         """
+        old = instance._data.get(self.name)
+        if old is not None and old is not value:
+            _unset_paths(old, weakref.proxy(instance), self.db_field)
+        if isinstance(value, (BaseList, BaseDict)):
+            # Lists and dicts of another document now report to this one
+            value._name = self.name
+            value._holds_embedded = _items_hold_embedded(instance, self.name)
+        if isinstance(value, (_import_class('EmbeddedDocument'), dict, list,
+                              tuple)):
+            _set_paths(value, weakref.proxy(instance), self.db_field)
         instance._data[self.name] = value
         instance._mark_as_changed(self.name)
 
@@ -371,6 +453,8 @@ class ObjectIdField(BaseField):
     """A field wrapper around MongoDB's ObjectIds.
     """
 
+    _holds_embedded = False
+
     def to_python(self, value):
         if not isinstance(value, ObjectId):
             value = ObjectId(value)
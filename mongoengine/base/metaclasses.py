@@ -2,6 +2,8 @@ import warnings
 
 import pymongo
 
+from mongoengine import signals
+from mongoengine.cache import DocumentCache
 from mongoengine.common import _import_class
 from mongoengine.errors import InvalidDocumentError
 from mongoengine.python_support import PY3
@@ -178,6 +180,16 @@ class DocumentMetaclass(type):
         # Add class to the _document_registry
         _document_registry[new_class._class_name] = new_class
 
+        # Compile the SON loader used when hydrating query results and the
+        # serializer used by to_mongo
+        cls._set_son_loader(new_class)
+        cls._set_setattr(new_class)
+
+        # Caches of the compiled query and update plans of the class, see
+        # mongoengine.queryset.transform
+        new_class._query_plans = {}
+        new_class._update_plans = {}
+
         # In Python 2, User-defined methods objects have special read-only
         # attributes 'im_func' and 'im_self' which contain the function obj
         # and class instance object respectively.  With Python 3 these special
@@ -217,6 +229,21 @@ class DocumentMetaclass(type):
             for child_base in cls.__get_bases(base.__bases__):
                 yield child_base
 
+    @classmethod
+    def _set_son_loader(cls, new_class):
+        loader = new_class._compile_son_loader()
+        if loader is not None:
+            loader = staticmethod(loader)
+        new_class._son_loader = loader
+        new_class._son_dumper = staticmethod(new_class._compile_son_dumper())
+
+    @classmethod
+    def _set_setattr(cls, new_class):
+        setattr_ = new_class._compile_setattr()
+        if setattr_ is not None:
+            new_class.__setattr__ = setattr_
+            new_class._compiled_setattr = True
+
     @classmethod
     def _import_classes(cls):
         Document = _import_class('Document')
@@ -374,6 +401,24 @@ class TopLevelDocumentMetaclass(DocumentMetaclass):
             exception = type(name, parents, {'__module__': module})
             setattr(new_class, name, exception)
 
+        # Recompile the SON loader and serializer now the primary key field
+        # is known
+        cls._set_son_loader(new_class)
+        cls._set_setattr(new_class)
+
+        # Set up the document cache, shared with the parent if it has one
+        cache_opts = meta.get('cache')
+        if cache_opts:
+            if not signals.signals_available:
+                msg = ("The cache meta option of %s requires the blinker "
+                       "library to invalidate the cache" % name)
+                raise InvalidDocumentError(msg)
+            if new_class._document_cache is None:
+                if cache_opts is True:
+                    cache_opts = {}
+                new_class._document_cache = DocumentCache(**cache_opts)
+            DocumentCache.connect(new_class)
+
         return new_class
 
 
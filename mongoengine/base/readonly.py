@@ -0,0 +1,306 @@
+import types
+
+from mongoengine.common import _import_class
+from mongoengine.errors import OperationError
+from mongoengine.python_support import PY3, txt_type
+
+from mongoengine.base.common import get_document
+from mongoengine.base.fields import BaseField, ComplexBaseField
+
+__all__ = ('ReadOnlyDocument',)
+
+
+class ReadOnlyDocument(object):
+    """The base class of the frozen documents loaded by
+    :meth:`~mongoengine.queryset.QuerySet.readonly`.
+
+    A class with a ``__slots__`` entry for each field is generated for each
+    document class, so instances hold their values without the ``_data``
+    dict, change tracking or :class:`~mongoengine.base.BaseList` and
+    :class:`~mongoengine.base.BaseDict` wrappers of regular documents.  The
+    methods, properties, class methods and static methods defined on the
+    document class are copied to it, class methods being called with the
+    document class.
+    References are not dereferenced and setting attributes, saving,
+    updating or deleting raises an
+    :class:`~mongoengine.errors.OperationError`.
+
+    The document class is available as :attr:`_document`.
+
+    .. versionadded:: 0.8
+    """
+
+    __slots__ = ()
+
+    _document = None
+    _fields_ordered = ()
+
+    def __setattr__(self, name, value):
+        raise OperationError("Can't set %s of a read-only %s document" %
+                             (name, self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise OperationError("Can't delete %s of a read-only %s document" %
+                             (name, self.__class__.__name__))
+
+    def __getattr__(self, name):
+        # Values of dynamic documents that are not declared fields
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def __reduce__(self):
+        return (_rebuild_readonly, (self._document, self._values()))
+
+    def _values(self):
+        values = dict((name, getattr(self, name))
+                      for name in self._fields_ordered)
+        if self._extra:
+            values.update(self._extra)
+        return values
+
+    def __iter__(self):
+        return iter(self._fields_ordered)
+
+    def __getitem__(self, name):
+        """Dictionary-style field access, return a field's value if present.
+        """
+        if name in self._fields_ordered:
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        try:
+            return getattr(self, name) is not None
+        except AttributeError:
+            return False
+
+    def __len__(self):
+        return len(self._fields_ordered)
+
+    def __repr__(self):
+        try:
+            u = self.__str__()
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            u = '[Bad Unicode data]'
+        repr_type = type(u)
+        return repr_type('<%s: %s>' % (self.__class__.__name__, u))
+
+    def __str__(self):
+        if hasattr(self, '__unicode__'):
+            if PY3:
+                return self.__unicode__()
+            else:
+                return unicode(self).encode('utf-8')
+        return txt_type('%s object' % self.__class__.__name__)
+
+    def __eq__(self, other):
+        if not (isinstance(other, ReadOnlyDocument) and
+                other._document is self._document):
+            return False
+        id_field = self._document._meta.get('id_field')
+        if id_field:
+            return getattr(self, id_field) == getattr(other, id_field)
+        return self._values() == other._values()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self.pk is None:
+            return super(ReadOnlyDocument, self).__hash__()
+        return hash(self.pk)
+
+    @property
+    def pk(self):
+        """The primary key of the document, if it has one."""
+        id_field = self._document._meta.get('id_field')
+        if id_field:
+            return getattr(self, id_field)
+        return None
+
+    def save(self, *args, **kwargs):
+        raise OperationError("Read-only %s documents can't be saved" %
+                             self.__class__.__name__)
+
+    def update(self, *args, **kwargs):
+        raise OperationError("Read-only %s documents can't be updated" %
+                             self.__class__.__name__)
+
+    def delete(self, *args, **kwargs):
+        raise OperationError("Read-only %s documents can't be deleted" %
+                             self.__class__.__name__)
+
+
+def _rebuild_readonly(doc_cls, values):
+    readonly_cls = readonly_class(doc_cls)
+    obj = object.__new__(readonly_cls)
+    extra = None
+    for name, value in values.iteritems():
+        if name in readonly_cls._fields_ordered:
+            readonly_cls.__dict__[name].__set__(obj, value)
+        else:
+            extra = extra or {}
+            extra[name] = value
+    readonly_cls.__dict__['_extra'].__set__(obj, extra)
+    return obj
+
+
+def readonly_class(doc_cls):
+    """Return the read-only class of `doc_cls`, generating it the first time
+    it is used.
+    """
+    readonly_cls = doc_cls.__dict__.get('_readonly_class')
+    if readonly_cls is None:
+        readonly_cls = _compile_readonly_class(doc_cls)
+        doc_cls._readonly_class = readonly_cls
+    return readonly_cls
+
+
+def _readonly_converter(field):
+    """Return the function converting a SON value of `field` for read-only
+    documents, or `None` if the value is kept as is.
+    """
+    EmbeddedDocumentField = _import_class('EmbeddedDocumentField')
+    GenericEmbeddedDocumentField = _import_class(
+        'GenericEmbeddedDocumentField')
+
+    if isinstance(field, EmbeddedDocumentField):
+        document_type = field.document_type
+        return lambda value: from_son_readonly(document_type, value)
+
+    if isinstance(field, GenericEmbeddedDocumentField):
+        def convert(value):
+            if isinstance(value, dict):
+                doc_cls = get_document(value['_cls'])
+                return from_son_readonly(doc_cls, value)
+            return value
+        return convert
+
+    if isinstance(field, ComplexBaseField) and _embeds_documents(field):
+        convert_item = _readonly_converter(field.field)
+
+        def convert(value):
+            if isinstance(value, dict):
+                return dict((k, convert_item(v))
+                            for k, v in value.iteritems())
+            if isinstance(value, (list, tuple)):
+                return [convert_item(v) for v in value]
+            return value
+        return convert
+
+    convert = field.to_python
+    identity = BaseField.to_python
+    if (getattr(convert, '__func__', convert) is
+       getattr(identity, '__func__', identity)):
+        return None
+    return convert
+
+
+def _embeds_documents(field):
+    """Whether the values of a complex field hold embedded documents."""
+    EmbeddedDocumentField = _import_class('EmbeddedDocumentField')
+    GenericEmbeddedDocumentField = _import_class(
+        'GenericEmbeddedDocumentField')
+
+    field = field.field
+    if isinstance(field, (EmbeddedDocumentField,
+                          GenericEmbeddedDocumentField)):
+        return True
+    if isinstance(field, ComplexBaseField) and field.field is not None:
+        return _embeds_documents(field)
+    return False
+
+
+def _compile_readonly_class(doc_cls):
+    """Generate the read-only class of `doc_cls` and its SON loader."""
+    field_names = tuple(name for name in doc_cls._fields
+                        if name not in doc_cls._fields_ordered)
+    field_names += tuple(doc_cls._fields_ordered)
+
+    attrs = {'__slots__': field_names + ('_extra',),
+             '__module__': doc_cls.__module__,
+             '_document': doc_cls,
+             '_fields_ordered': field_names}
+
+    # Copy the methods and properties defined on the document classes
+    for klass in reversed(doc_cls.__mro__):
+        if klass.__module__.startswith('mongoengine.'):
+            continue
+        for name, value in klass.__dict__.iteritems():
+            if (name in field_names or name in ReadOnlyDocument.__dict__ or
+               name in ('__init__', '__new__')):
+                continue
+            if isinstance(value, (types.FunctionType, property,
+                                  staticmethod)):
+                attrs[name] = value
+            elif isinstance(value, classmethod):
+                # Class methods stay bound to the document class, whose
+                # queryset and fields they are written for
+                attrs[name] = staticmethod(getattr(doc_cls, name))
+
+    readonly_cls = type(doc_cls.__name__, (ReadOnlyDocument,), attrs)
+
+    # db_field -> (field name, slot setter, converter or None)
+    db_fields = {}
+    # (field name, slot setter, field) used to set defaults
+    all_fields = []
+    for name in field_names:
+        field = doc_cls._fields[name]
+        setter = readonly_cls.__dict__[name].__set__
+        db_fields[field.db_field] = (name, setter,
+                                     _readonly_converter(field))
+        all_fields.append((name, setter, field))
+    set_extra = readonly_cls.__dict__['_extra'].__set__
+    dynamic = doc_cls._dynamic
+    new = object.__new__
+
+    def load(son):
+        obj = new(readonly_cls)
+        loaded = set()
+        extra = None
+        errors_dict = {}
+        for key, value in son.iteritems():
+            spec = db_fields.get(key)
+            if spec is None:
+                if dynamic and key != '_cls':
+                    if extra is None:
+                        extra = {}
+                    extra["%s" % key] = value
+                continue
+            name, setter, convert = spec
+            if value is not None and convert is not None:
+                try:
+                    value = convert(value)
+                except (AttributeError, ValueError), e:
+                    errors_dict[name] = e
+                    continue
+            setter(obj, value)
+            loaded.add(name)
+
+        if errors_dict:
+            doc_cls._raise_son_errors(errors_dict)
+
+        if len(loaded) < len(all_fields):
+            for name, setter, field in all_fields:
+                if name not in loaded:
+                    value = field.default
+                    if callable(value):
+                        value = value()
+                    setter(obj, value)
+        set_extra(obj, extra)
+        return obj
+
+    readonly_cls._load = staticmethod(load)
+    return readonly_cls
+
+
+def from_son_readonly(doc_cls, son):
+    """Create a read-only instance of `doc_cls`, or of the subclass named by
+    the ``_cls`` of `son`, from a PyMongo SON.
+    """
+    class_name = son.get('_cls', doc_cls._class_name)
+    if class_name != doc_cls._class_name:
+        doc_cls = get_document(class_name)
+    return readonly_class(doc_cls)._load(son)
@@ -0,0 +1,234 @@
+import threading
+import time
+
+from mongoengine import signals
+from mongoengine.connection import DEFAULT_CONNECTION_NAME
+from mongoengine.errors import ValidationError
+
+__all__ = ('DocumentCache',)
+
+
+def _copy_son(value):
+    """Copy the containers of a SON document so that documents loaded from
+    the cache never share mutable data"""
+    if isinstance(value, dict):
+        return dict((k, _copy_son(v)) for k, v in value.iteritems())
+    if isinstance(value, list):
+        return [_copy_son(v) for v in value]
+    return value
+
+
+class DocumentCache(object):
+    """A process wide, least recently used cache of documents read by their
+    id.  It is enabled for a :class:`~mongoengine.Document` and the classes
+    inheriting from it through the `cache` meta option::
+
+        class Setting(Document):
+            name = StringField()
+            meta = {'cache': {'max_entries': 50000, 'ttl': 30}}
+
+    :meth:`~mongoengine.queryset.QuerySet.with_id`,
+    :meth:`~mongoengine.queryset.QuerySet.in_bulk`, ``get(pk=...)`` and
+    dereferencing read through the cache.  The SON of each document is
+    stored so every hit returns a new document instance.
+
+    Entries are removed by the `post_save` signal and by
+    :meth:`~mongoengine.queryset.QuerySet.update` and
+    :meth:`~mongoengine.queryset.QuerySet.delete`, which
+    :meth:`~mongoengine.Document.delete` goes through.
+
+    .. versionadded:: 0.8
+    """
+
+    def __init__(self, max_entries=1000, ttl=None):
+        """Construct the cache.
+
+        :param max_entries: the number of documents to keep, the least
+            recently used documents are evicted first
+        :param ttl: the number of seconds a document is kept for, or `None`
+            to keep it until it is evicted or invalidated
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+        # Circular doubly linked list of [prev, next, key, son, expires]
+        # entries, the most recently used entry is linked before the root
+        self._root = root = []
+        root[:] = [root, root, None, None, None]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return a dict of the number of hits, misses and entries."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(self._entries)}
+
+    def _prefix(self, doc_cls):
+        return (doc_cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME),
+                doc_cls._get_collection_name())
+
+    def _key(self, doc_cls, object_id):
+        id_field = doc_cls._fields[doc_cls._meta['id_field']]
+        return self._prefix(doc_cls) + (id_field.to_mongo(object_id),)
+
+    def _unlink(self, entry):
+        prev, next = entry[0], entry[1]
+        prev[1] = next
+        next[0] = prev
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._unlink(entry)
+
+    def get_son(self, doc_cls, object_id):
+        """Return a copy of the cached SON of the document with `object_id`
+        or `None`, counting the hit or miss.
+
+        :param doc_cls: the document class to look up
+        :param object_id: the id of the document
+        """
+        try:
+            key = self._key(doc_cls, object_id)
+        except ValidationError:
+            return None
+
+        self._lock.acquire()
+        try:
+            entry = self._entries.get(key)
+            if entry is not None and entry[4] is not None and \
+               entry[4] < time.time():
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Move the entry to the most recently used position
+            self._unlink(entry)
+            root = self._root
+            last = root[0]
+            entry[0], entry[1] = last, root
+            last[1] = root[0] = entry
+            son = entry[3]
+        finally:
+            self._lock.release()
+        return _copy_son(son)
+
+    def get(self, doc_cls, object_id):
+        """Return a new instance of the cached document of `doc_cls` with
+        `object_id` or `None`.
+
+        :param doc_cls: the document class to look up
+        :param object_id: the id of the document
+        """
+        son = self.get_son(doc_cls, object_id)
+        if son is None:
+            return None
+        doc = doc_cls._from_son(son)
+        if isinstance(doc, doc_cls):
+            return doc
+        return None
+
+    def add(self, doc_cls, son):
+        """Store the SON of a document read from the database.
+
+        :param doc_cls: the document class the SON was read for
+        :param son: the SON of the document
+        """
+        if son is None or '_id' not in son:
+            return
+        key = self._prefix(doc_cls) + (son['_id'],)
+        expires = None
+        if self.ttl is not None:
+            expires = time.time() + self.ttl
+        son = _copy_son(son)
+
+        self._lock.acquire()
+        try:
+            self._pop(key)
+            root = self._root
+            last = root[0]
+            entry = [last, root, key, son, expires]
+            last[1] = root[0] = self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._pop(root[1][2])
+        finally:
+            self._lock.release()
+
+    def discard(self, doc_cls, object_ids):
+        """Remove documents from the cache.
+
+        :param doc_cls: the document class of the documents
+        :param object_ids: the ids of the documents to remove
+        """
+        self._lock.acquire()
+        try:
+            for object_id in object_ids:
+                try:
+                    self._pop(self._key(doc_cls, object_id))
+                except ValidationError:
+                    pass
+        finally:
+            self._lock.release()
+
+    def discard_query(self, doc_cls, query):
+        """Remove the documents that may match a query.  Only the ids of
+        queries on the ``_id`` (and ``_cls``) alone are removed, otherwise
+        every document in the collection of `doc_cls` is.
+
+        :param doc_cls: the document class being queried
+        :param query: the raw query
+        """
+        object_ids = None
+        if [k for k in query if k != '_cls'] == ['_id']:
+            object_ids = query['_id']
+            if isinstance(object_ids, dict):
+                if object_ids.keys() == ['$in']:
+                    object_ids = object_ids['$in']
+                else:
+                    object_ids = None
+            else:
+                object_ids = [object_ids]
+        if object_ids is not None:
+            return self.discard(doc_cls, object_ids)
+
+        prefix = self._prefix(doc_cls)
+        self._lock.acquire()
+        try:
+            for key in [k for k in self._entries if k[:2] == prefix]:
+                self._pop(key)
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        """Remove every document and reset the counters."""
+        self._lock.acquire()
+        try:
+            self._entries.clear()
+            root = self._root
+            root[:] = [root, root, None, None, None]
+            self.hits = self.misses = 0
+        finally:
+            self._lock.release()
+
+    @classmethod
+    def connect(cls, doc_cls):
+        """Invalidate the cache of `doc_cls` when one of its documents is
+        saved.  Deletes are handled by the queryset, so no delete signal is
+        connected that would make :meth:`QuerySet.delete` delete documents
+        one at a time.
+
+        :param doc_cls: the document class to connect the signals of
+        """
+        signals.post_save.connect(_discard_document, sender=doc_cls)
+
+
+def _discard_document(sender, document, **kwargs):
+    cache = getattr(sender, '_document_cache', None)
+    if cache is not None and document.pk is not None:
+        cache.discard(sender, [document.pk])
@@ -11,9 +11,12 @@ def _import_class(cls_name):
     field_classes = ('DictField', 'DynamicField', 'EmbeddedDocumentField',
                      'FileField', 'GenericReferenceField',
                      'GenericEmbeddedDocumentField', 'GeoPointField',
-                     'ReferenceField', 'StringField', 'ComplexBaseField')
+                     'ReferenceField', 'StringField', 'ComplexBaseField',
+                     'IntField', 'LongField', 'FloatField', 'BooleanField',
+                     'DateTimeField', 'ListField')
     queryset_classes = ('OperationError',)
     deref_classes = ('DeReference',)
+    context_classes = ('identity_map',)
 
     if cls_name in doc_classes:
         from mongoengine import document as module
@@ -27,6 +30,9 @@ def _import_class(cls_name):
     elif cls_name in deref_classes:
         from mongoengine import dereference as module
         import_classes = deref_classes
+    elif cls_name in context_classes:
+        from mongoengine import context_managers as module
+        import_classes = context_classes
     else:
         raise ValueError('No import set for: ' % cls_name)
 
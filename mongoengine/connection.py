@@ -83,6 +83,14 @@ def disconnect(alias=DEFAULT_CONNECTION_NAME):
         del _dbs[alias]
 
 
+def _reset_connections():
+    """Forget every connection without closing it, such as in a forked
+    process whose sockets are shared with its parent.
+    """
+    _connections.clear()
+    _dbs.clear()
+
+
 def get_connection(alias=DEFAULT_CONNECTION_NAME, reconnect=False):
     global _connections
     # Connect to the database if not already connected
@@ -145,6 +153,16 @@ def get_db(alias=DEFAULT_CONNECTION_NAME, reconnect=False):
     return _dbs[alias]
 
 
+def _get_db_alias(db):
+    """Return the alias of the connected database `db`, or `None` if it
+    wasn't returned by :func:`get_db`.
+    """
+    for alias, alias_db in _dbs.iteritems():
+        if alias_db is db:
+            return alias
+    return None
+
+
 def connect(db, alias=DEFAULT_CONNECTION_NAME, **kwargs):
     """Connect to the database specified by the 'db' argument.
 
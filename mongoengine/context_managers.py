@@ -1,8 +1,12 @@
+import threading
+
 from mongoengine.common import _import_class
 from mongoengine.connection import DEFAULT_CONNECTION_NAME, get_db
+from mongoengine.errors import ValidationError
 from mongoengine.queryset import OperationError, QuerySet
 
-__all__ = ("switch_db", "switch_collection", "no_dereference", "query_counter")
+__all__ = ("switch_db", "switch_collection", "no_dereference",
+           "identity_map", "query_counter")
 
 
 class switch_db(object):
@@ -136,6 +140,103 @@ class QuerySetNoDeRef(QuerySet):
             return items
 
 
+class identity_map(object):
+    """ identity_map context manager.
+
+    Keeps every document loaded by its id for the duration of the context
+    manager, so that loading it again is served from memory rather than
+    from the database::
+
+        with identity_map():
+            user = User.objects.with_id(user_id)
+            post = Post.objects.get(pk=post_id)
+            post.author  # No query if the author is the same user
+
+    References, generic references, `select_related`,
+    :meth:`~mongoengine.queryset.QuerySet.with_id` and ``get(pk=...)``
+    lookups use the map.  Saving or deleting a document removes it from the
+    map and updating or deleting through a queryset removes every document
+    of that collection.
+
+    Documents are keyed by ``(db_alias, collection, _id)``.  The map is local
+    to the current thread and nested blocks share the outermost map.
+
+    .. versionadded:: 0.8
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        """ Construct the identity_map context manager. """
+        self.documents = {}
+        self.outer = None
+
+    def __enter__(self):
+        """ Make this map the active one, unless one is already active """
+        self.outer = identity_map.current()
+        if self.outer is not None:
+            return self.outer
+        identity_map._local.map = self
+        return self
+
+    def __exit__(self, t, value, traceback):
+        """ Clear the map and deactivate it """
+        if self.outer is None:
+            identity_map._local.map = None
+            self.documents.clear()
+
+    @classmethod
+    def current(cls):
+        """ Return the active identity map or `None` """
+        return getattr(cls._local, 'map', None)
+
+    def _key(self, doc_cls, object_id):
+        id_field = doc_cls._fields[doc_cls._meta['id_field']]
+        return (doc_cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME),
+                doc_cls._get_collection_name(), id_field.to_mongo(object_id))
+
+    def get(self, doc_cls, object_id):
+        """ Return the loaded document of `doc_cls` with `object_id` or
+        `None` if it has not been loaded.
+
+        :param doc_cls: the document class to look up
+        :param object_id: the id of the document
+        """
+        try:
+            doc = self.documents.get(self._key(doc_cls, object_id))
+        except ValidationError:
+            return None
+        if isinstance(doc, doc_cls):
+            return doc
+        return None
+
+    def add(self, doc):
+        """ Store a loaded document in the map.
+
+        :param doc: the document to store, ignored if `None` or unsaved
+        """
+        if doc is not None and doc.pk is not None:
+            self.documents[self._key(doc.__class__, doc.pk)] = doc
+
+    def discard(self, doc):
+        """ Remove a document from the map.
+
+        :param doc: the document to remove
+        """
+        if doc.pk is not None:
+            self.documents.pop(self._key(doc.__class__, doc.pk), None)
+
+    def discard_collection(self, doc_cls):
+        """ Remove every document stored in the collection of `doc_cls`.
+
+        :param doc_cls: the document class whose collection to remove
+        """
+        prefix = (doc_cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME),
+                  doc_cls._get_collection_name())
+        for key in [k for k in self.documents if k[:2] == prefix]:
+            del self.documents[key]
+
+
 class query_counter(object):
     """ Query_counter context manager to get the number of queries. """
 
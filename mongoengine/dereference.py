@@ -5,6 +5,7 @@ from fields import (ReferenceField, ListField, DictField, MapField)
 from connection import get_db
 from queryset import QuerySet
 from document import Document
+from context_managers import identity_map
 
 
 class DeReference(object):
@@ -60,7 +61,15 @@ class DeReference(object):
                             for k, v in items.iteritems()]
                         )
 
-        self.reference_map = self._find_references(items)
+        reference_map = self._find_references(items)
+        if isinstance(doc_type, TopLevelDocumentMetaclass):
+            # DBRefs are found by collection name, fetch those of the field's
+            # collection as its documents so the identity map is used
+            collection = doc_type._get_collection_name()
+            if collection in reference_map:
+                reference_map.setdefault(doc_type, []).extend(
+                    reference_map.pop(collection))
+        self.reference_map = self._group_by_collection(reference_map)
         self.object_map = self._fetch_objects(doc_type=doc_type)
         return self._attach_objects(items, 0, instance, name)
 
@@ -109,17 +118,44 @@ class DeReference(object):
 
         return reference_map
 
+    def _group_by_collection(self, reference_map):
+        """Merge the references to document classes sharing a collection so
+        that each collection is only queried once
+
+        :param reference_map: The references found by `_find_references`
+        """
+        grouped_map = {}
+        collections = {}
+        for col, refs in reference_map.iteritems():
+            if hasattr(col, '_get_collection_name'):
+                key = (col._meta.get('db_alias'), col._get_collection_name())
+                col = collections.setdefault(key, col)
+            grouped_map.setdefault(col, []).extend(refs)
+        return grouped_map
+
     def _fetch_objects(self, doc_type=None):
         """Fetch all references and convert to their document objects
         """
         object_map = {}
+        id_map = identity_map.current()
         for col, dbrefs in self.reference_map.iteritems():
             keys = object_map.keys()
             refs = list(set([dbref for dbref in dbrefs if unicode(dbref).encode('utf-8') not in keys]))
-            if hasattr(col, 'objects'):  # We have a document class for the refs
-                references = col.objects.in_bulk(refs)
+            # We have a document class for the refs
+            if isinstance(col, TopLevelDocumentMetaclass):
+                if id_map is not None:
+                    for ref in refs:
+                        doc = id_map.get(col, ref)
+                        if doc is not None:
+                            object_map[ref] = doc
+                    refs = [ref for ref in refs if ref not in object_map]
+                    if not refs:
+                        continue
+                references = col.objects.readonly(False).in_bulk(refs)
                 for key, doc in references.iteritems():
                     object_map[key] = doc
+                    if id_map is not None:
+                        id_map.add(doc)
             else:  # Generic reference: use the refs data to convert to document
                 if isinstance(doc_type, (ListField, DictField, MapField,)):
                     continue
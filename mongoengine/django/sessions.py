@@ -65,7 +65,7 @@ class SessionStore(SessionBase):
             return {}
 
     def exists(self, session_key):
-        return bool(MongoSession.objects(session_key=session_key).first())
+        return MongoSession.objects(session_key=session_key).exists()
 
     def create(self):
         while True:
@@ -11,7 +11,8 @@ from mongoengine.base import (DocumentMetaclass, TopLevelDocumentMetaclass,
                               ALLOW_INHERITANCE, get_document)
 from mongoengine.queryset import OperationError, NotUniqueError, QuerySet
 from mongoengine.connection import get_db, DEFAULT_CONNECTION_NAME
-from mongoengine.context_managers import switch_db, switch_collection
+from mongoengine.context_managers import (switch_db, switch_collection,
+                                          identity_map)
 
 __all__ = ('Document', 'EmbeddedDocument', 'DynamicDocument',
            'DynamicEmbeddedDocument', 'OperationError',
@@ -43,11 +44,23 @@ class EmbeddedDocument(BaseDocument):
     __metaclass__ = DocumentMetaclass
 
     _instance = None
+    # The path of the document in its nearest enclosing document
+    _path = None
 
     def __init__(self, *args, **kwargs):
         super(EmbeddedDocument, self).__init__(*args, **kwargs)
         self._changed_fields = []
 
+    def _mark_as_changed(self, key):
+        """Marks a key as changed and reports its full path to the enclosing
+        document.
+        """
+        super(EmbeddedDocument, self)._mark_as_changed(key)
+        if (key and self._path is not None and
+           hasattr(self._instance, '_mark_as_changed')):
+            key = self._db_field_map.get(key, key)
+            self._instance._mark_as_changed('%s.%s' % (self._path, key))
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
             return self._data == other._data
@@ -98,6 +111,11 @@ class Document(BaseDocument):
     doesn't contain a list) if allow_inheritance is True. This can be
     disabled by either setting cls to False on the specific index or
     by setting index_cls to False on the meta dictionary for the document.
+
+    Documents that are read often and rarely change may be kept in a process
+    wide :class:`~mongoengine.cache.DocumentCache` by specifying :attr:`cache`
+    in the :attr:`meta` dictionary, either as ``True`` or as a dict with the
+    :attr:`max_entries` and :attr:`ttl` (in seconds) of the cache.
     """
 
     # The __metaclass__ attribute is removed by 2to3 when running with Python3
@@ -105,6 +123,9 @@ class Document(BaseDocument):
     my_metaclass  = TopLevelDocumentMetaclass
     __metaclass__ = TopLevelDocumentMetaclass
 
+    # Set by the metaclass when the `cache` meta option is used
+    _document_cache = None
+
     def pk():
         """Primary key alias
         """
@@ -167,7 +188,9 @@ class Document(BaseDocument):
 
         :param force_insert: only try to create a new document, don't allow
             updates of existing documents
-        :param validate: validates the document; set to ``False`` to skip.
+        :param validate: validates the document; set to ``False`` to skip or
+            to ``'changed'`` to only validate the fields changed since an
+            existing document was loaded or saved.
         :param clean: call the document clean method, requires `validate` to be
             True.
         :param write_concern: Extra keyword arguments are passed down to
@@ -195,18 +218,27 @@ class Document(BaseDocument):
             meta['cascade'] = False  Also you can pass different kwargs to
             the cascade save using cascade_kwargs which overwrites the
             existing kwargs with custom values
+        .. versionchanged:: 0.8
+            `validate` may be ``'changed'`` to validate the changed fields
         """
         signals.pre_save.send(self.__class__, document=self)
 
-        if validate:
+        if (validate == 'changed' and not self._created and
+           hasattr(self, '_changed_fields')):
+            self._validate_changed(clean=clean)
+        elif validate:
             self.validate(clean=clean)
 
         if not write_concern:
             write_concern = {}
 
-        doc = self.to_mongo()
-
-        created = ('_id' not in doc or self._created or force_insert)
+        # Existing documents only serialize their changes
+        doc = None
+        id_field = self._meta['id_field']
+        if self._created or force_insert or self._data.get(id_field) is None:
+            doc = self.to_mongo()
+        created = (doc is not None and
+                   ('_id' not in doc or self._created or force_insert))
 
         try:
             collection = self._get_collection()
@@ -216,14 +248,22 @@ class Document(BaseDocument):
                 else:
                     object_id = collection.save(doc, **write_concern)
             else:
-                object_id = doc['_id']
+                if doc is None:
+                    object_id = self._fields[id_field].to_mongo(
+                        self._data[id_field])
+                else:
+                    object_id = doc['_id']
                 updates, removals = self._delta()
                 # Need to add shard key to query, or you get an error
                 select_dict = {'_id': object_id}
                 shard_key = self.__class__._meta.get('shard_key', tuple())
                 for k in shard_key:
                     actual_key = self._db_field_map.get(k, k)
-                    select_dict[actual_key] = doc[actual_key]
+                    if doc is not None:
+                        select_dict[actual_key] = doc[actual_key]
+                    elif self._data.get(k) is not None:
+                        select_dict[actual_key] = self._fields[k].to_mongo(
+                            self._data[k])
 
                 def is_new_object(last_error):
                     if last_error is not None:
@@ -266,10 +306,13 @@ class Document(BaseDocument):
                 message = u'Tried to save duplicate unique keys (%s)'
                 raise NotUniqueError(message % unicode(err))
             raise OperationError(message % unicode(err))
-        id_field = self._meta['id_field']
         if id_field not in self._meta.get('shard_key', []):
             self[id_field] = self._fields[id_field].to_python(object_id)
 
+        id_map = identity_map.current()
+        if id_map is not None:
+            id_map.discard(self)
+
         self._clear_changed_fields()
         self._created = False
         signals.post_save.send(self.__class__, document=self, created=created)
@@ -306,7 +349,8 @@ class Document(BaseDocument):
         Returns the queryset to use for updating / reloading / deletions
         """
         if not hasattr(self, '__objects'):
-            self.__objects = QuerySet(self, self._get_collection())
+            self.__objects = QuerySet(self, self._get_collection()
+                                      ).readonly(False)
         return self.__objects
 
     @property
@@ -346,11 +390,16 @@ class Document(BaseDocument):
         signals.pre_delete.send(self.__class__, document=self)
 
         try:
-            self._qs.filter(**self._object_key).delete(write_concern=write_concern)
+            self._qs.filter(**self._object_key).delete(
+                write_concern=write_concern, _from_doc_delete=True)
         except pymongo.errors.OperationFailure, err:
             message = u'Could not delete document (%s)' % err.message
             raise OperationError(message)
 
+        id_map = identity_map.current()
+        if id_map is not None:
+            id_map.discard(self)
+
         signals.post_delete.send(self.__class__, document=self)
 
     def switch_db(self, db_alias):
@@ -485,6 +534,8 @@ class Document(BaseDocument):
         cls._collection = None
         db = cls._get_db()
         db.drop_collection(cls._get_collection_name())
+        if cls._document_cache is not None:
+            cls._document_cache.discard_query(cls, {})
 
     @classmethod
     def ensure_index(cls, key_or_list, drop_dups=False, background=False,
@@ -18,6 +18,7 @@ from base import (BaseField, ComplexBaseField, ObjectIdField,
                   get_document, BaseDocument)
 from queryset import DO_NOTHING, QuerySet
 from document import Document, EmbeddedDocument
+from context_managers import identity_map
 from connection import get_db, DEFAULT_CONNECTION_NAME
 
 try:
@@ -41,10 +42,35 @@ __all__ = ['StringField',  'URLField',  'EmailField',  'IntField',  'LongField',
 RECURSIVE_REFERENCE_CONSTANT = 'self'
 
 
+def _dereference(doc_cls, reference):
+    """Load the document of `doc_cls` a :class:`~bson.dbref.DBRef` refers
+    to, from the active identity map or the document cache if possible.
+    """
+    doc = None
+    id_map = identity_map.current()
+    cache = doc_cls._document_cache
+    if id_map is not None:
+        doc = id_map.get(doc_cls, reference.id)
+    if doc is None and cache is not None:
+        doc = cache.get(doc_cls, reference.id)
+    if doc is None:
+        son = doc_cls._get_db().dereference(reference)
+        if son is None:
+            return None
+        if cache is not None:
+            cache.add(doc_cls, son)
+        doc = doc_cls._from_son(son)
+    if id_map is not None:
+        id_map.add(doc)
+    return doc
+
+
 class StringField(BaseField):
     """A unicode string field.
     """
 
+    _holds_embedded = False
+
     def __init__(self, regex=None, max_length=None, min_length=None, **kwargs):
         self.regex = re.compile(regex) if regex else None
         self.max_length = max_length
@@ -159,6 +185,8 @@ class IntField(BaseField):
     """An 32-bit integer field.
     """
 
+    _holds_embedded = False
+
     def __init__(self, min_value=None, max_value=None, **kwargs):
         self.min_value, self.max_value = min_value, max_value
         super(IntField, self).__init__(**kwargs)
@@ -193,6 +221,8 @@ class LongField(BaseField):
     """An 64-bit integer field.
     """
 
+    _holds_embedded = False
+
     def __init__(self, min_value=None, max_value=None, **kwargs):
         self.min_value, self.max_value = min_value, max_value
         super(LongField, self).__init__(**kwargs)
@@ -227,6 +257,8 @@ class FloatField(BaseField):
     """An floating point number field.
     """
 
+    _holds_embedded = False
+
     def __init__(self, min_value=None, max_value=None, **kwargs):
         self.min_value, self.max_value = min_value, max_value
         super(FloatField, self).__init__(**kwargs)
@@ -264,6 +296,8 @@ class DecimalField(BaseField):
     .. versionadded:: 0.3
     """
 
+    _holds_embedded = False
+
     def __init__(self, min_value=None, max_value=None, force_string=False,
                  precision=2, rounding=decimal.ROUND_HALF_UP, **kwargs):
         """
@@ -333,6 +367,8 @@ class BooleanField(BaseField):
     .. versionadded:: 0.1.2
     """
 
+    _holds_embedded = False
+
     def to_python(self, value):
         try:
             value = bool(value)
@@ -354,6 +390,8 @@ class DateTimeField(BaseField):
       need accurate microsecond support.
     """
 
+    _holds_embedded = False
+
     def validate(self, value):
         if not isinstance(value, (datetime.datetime, datetime.date)):
             self.error(u'cannot parse date "%s"' % value)
@@ -803,6 +841,8 @@ class ReferenceField(BaseField):
     .. versionchanged:: 0.5 added `reverse_delete_rule`
     """
 
+    _holds_embedded = False
+
     def __init__(self, document_type, dbref=False,
                  reverse_delete_rule=DO_NOTHING, **kwargs):
         """Initialises the Reference Field.
@@ -843,9 +883,9 @@ class ReferenceField(BaseField):
         self._auto_dereference = instance._fields[self.name]._auto_dereference
         # Dereference DBRefs
         if self._auto_dereference and isinstance(value, DBRef):
-            value = self.document_type._get_db().dereference(value)
-            if value is not None:
-                instance._data[self.name] = self.document_type._from_son(value)
+            doc = _dereference(self.document_type, value)
+            if doc is not None:
+                instance._data[self.name] = doc
 
         return super(ReferenceField, self).__get__(instance, owner)
 
@@ -917,6 +957,8 @@ class GenericReferenceField(BaseField):
     .. versionadded:: 0.3
     """
 
+    _holds_embedded = False
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
@@ -944,10 +986,7 @@ class GenericReferenceField(BaseField):
     def dereference(self, value):
         doc_cls = get_document(value['_cls'])
         reference = value['_ref']
-        doc = doc_cls._get_db().dereference(reference)
-        if doc is not None:
-            doc = doc_cls._from_son(doc)
-        return doc
+        return _dereference(doc_cls, reference)
 
     def to_mongo(self, document):
         if document is None:
@@ -984,6 +1023,8 @@ class BinaryField(BaseField):
     """A binary data field.
     """
 
+    _holds_embedded = False
+
     def __init__(self, max_bytes=None, **kwargs):
         self.max_bytes = max_bytes
         super(BinaryField, self).__init__(**kwargs)
@@ -1393,6 +1434,7 @@ class GeoPointField(BaseField):
     """
 
     _geo_index = True
+    _holds_embedded = False
 
     def validate(self, value):
         """Make sure that a geo-value is of type (x, y)
@@ -1430,6 +1472,7 @@ class SequenceField(BaseField):
     """
 
     _auto_gen = True
+    _holds_embedded = False
     COLLECTION_NAME = 'mongoengine.counters'
     VALUE_DECORATOR = int
 
@@ -1503,6 +1546,8 @@ class UUIDField(BaseField):
 
     .. versionadded:: 0.6
     """
+
+    _holds_embedded = False
     _binary = None
 
     def __init__(self, binary=True, **kwargs):
@@ -1,11 +1,14 @@
 from mongoengine.errors import (DoesNotExist, MultipleObjectsReturned,
                                 InvalidQueryError, OperationError,
                                 NotUniqueError)
+from mongoengine.queryset.bulk import *
 from mongoengine.queryset.field_list import *
 from mongoengine.queryset.manager import *
+from mongoengine.queryset.prepared import *
 from mongoengine.queryset.queryset import *
 from mongoengine.queryset.transform import *
 from mongoengine.queryset.visitor import *
 
-__all__ = (field_list.__all__ + manager.__all__ + queryset.__all__ +
-           transform.__all__ + visitor.__all__)
+__all__ = (bulk.__all__ + field_list.__all__ + manager.__all__ +
+           prepared.__all__ + queryset.__all__ + transform.__all__ +
+           visitor.__all__)
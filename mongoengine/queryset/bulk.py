@@ -0,0 +1,219 @@
+import pymongo
+
+from mongoengine.errors import OperationError
+
+__all__ = ('BulkInsert', 'BulkUpdate', 'BulkDelete', 'BulkWriteResult')
+
+
+class BulkOperation(object):
+    """Base class for the operations sent by
+    :meth:`~mongoengine.queryset.QuerySet.bulk_write`.
+    """
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.__dict__)
+
+
+class BulkInsert(BulkOperation):
+    """Insert a new document::
+
+        BulkInsert(User(name="Ross"))
+
+    :param document: the document to insert
+    """
+
+    def __init__(self, document):
+        self.document = document
+
+
+class BulkUpdate(BulkOperation):
+    """Update the documents matching a :class:`~mongoengine.queryset.Q`
+    object, using the same keyword arguments as
+    :meth:`~mongoengine.queryset.QuerySet.update`::
+
+        BulkUpdate(Q(name="Ross"), set__age=30)
+        BulkUpdate(Q(name="Bob"), upsert=True, multi=False, set__age=1)
+
+    :param q_obj: the documents to update, all the documents of the
+        queryset if `None`
+    :param upsert: insert a document if none match
+    :param multi: update every matching document rather than the first
+    :param update: Django-style update keyword arguments
+    """
+
+    def __init__(self, q_obj=None, upsert=False, multi=True, **update):
+        if not update:
+            raise OperationError("No update parameters, would remove data")
+        self.q_obj = q_obj
+        self.upsert = upsert
+        self.multi = multi
+        self.update = update
+
+
+class BulkDelete(BulkOperation):
+    """Delete the documents matching a :class:`~mongoengine.queryset.Q`
+    object::
+
+        BulkDelete(Q(age__lt=18))
+
+    :param q_obj: the documents to delete, all the documents of the
+        queryset if `None`
+    :param multi: delete every matching document rather than the first
+    """
+
+    def __init__(self, q_obj=None, multi=True):
+        self.q_obj = q_obj
+        self.multi = multi
+
+
+class BulkWriteResult(object):
+    """The result of :meth:`~mongoengine.queryset.QuerySet.bulk_write`.
+
+    The totals of the write are kept in :attr:`n_inserted`,
+    :attr:`n_upserted`, :attr:`n_matched`, :attr:`n_modified` and
+    :attr:`n_removed`.  :attr:`n_modified` is `None` when the server does not
+    report it.
+
+    The results of each operation are keyed by its index in the operations
+    passed: :attr:`inserted_ids` and :attr:`upserted_ids` map the index of
+    successful inserts and upserts to the id of the new document and
+    :attr:`errors` lists a dict with the `index`, `code`, `errmsg` and `op`
+    of every operation that failed.
+    """
+
+    def __init__(self):
+        self.n_inserted = 0
+        self.n_upserted = 0
+        self.n_matched = 0
+        self.n_modified = 0
+        self.n_removed = 0
+        self.inserted_ids = {}
+        self.upserted_ids = {}
+        self.errors = []
+        self.write_concern_errors = []
+
+    def __repr__(self):
+        return ('<BulkWriteResult: %s inserted, %s upserted, %s matched, '
+                '%s removed, %s errors>' % (self.n_inserted, self.n_upserted,
+                                            self.n_matched, self.n_removed,
+                                            len(self.errors)))
+
+    def _merge(self, details, ops, offset, ordered):
+        """Add the result of executing a batch of `ops`, the first of which
+        is at `offset` in the operations passed to bulk_write, and return the
+        indexes of the operations of the batch that succeeded"""
+        self.n_inserted += details.get('nInserted', 0)
+        self.n_upserted += details.get('nUpserted', 0)
+        self.n_matched += details.get('nMatched', 0)
+        self.n_removed += details.get('nRemoved', 0)
+        n_modified = details.get('nModified')
+        if n_modified is None or self.n_modified is None:
+            self.n_modified = None
+        else:
+            self.n_modified += n_modified
+
+        for upserted in details.get('upserted', []):
+            self.upserted_ids[offset + upserted['index']] = upserted['_id']
+
+        failed = set()
+        for error in details.get('writeErrors', []):
+            failed.add(error['index'])
+            self.errors.append({'index': offset + error['index'],
+                                'code': error.get('code'),
+                                'errmsg': error.get('errmsg'),
+                                'op': ops[error['index']]})
+        self.write_concern_errors.extend(
+            details.get('writeConcernErrors', []))
+
+        # Writes stop at the first error of ordered batches
+        last = len(ops)
+        if ordered and failed:
+            last = min(failed)
+        return [i for i in xrange(last) if i not in failed]
+
+
+class _LegacyBulkWriteOperation(object):
+    """Sends the operations of a bulk write one at a time, with the same
+    interface as the bulk write API of PyMongo 2.7+ for older versions.
+    """
+
+    def __init__(self, collection, ordered):
+        self.collection = collection
+        self.ordered = ordered
+        self.ops = []
+
+    def insert(self, document):
+        self.ops.append(('insert', document, None, False, False))
+
+    def find(self, selector):
+        return _LegacyBulkWriteView(self, selector)
+
+    def execute(self, write_concern=None):
+        write_concern = write_concern or {}
+        details = {'nInserted': 0, 'nUpserted': 0, 'nMatched': 0,
+                   'nModified': None, 'nRemoved': 0, 'upserted': [],
+                   'writeErrors': []}
+        for index, (kind, spec, document, upsert, multi) in \
+                enumerate(self.ops):
+            try:
+                if kind == 'insert':
+                    self.collection.insert(spec, **write_concern)
+                    details['nInserted'] += 1
+                    continue
+                if kind == 'update':
+                    ret = self.collection.update(spec, document,
+                                                 upsert=upsert, multi=multi,
+                                                 **write_concern)
+                elif multi:
+                    ret = self.collection.remove(spec, **write_concern)
+                else:
+                    ret = self.collection.remove(spec, multi=False,
+                                                 **write_concern)
+            except pymongo.errors.OperationFailure, err:
+                details['writeErrors'].append({
+                    'index': index, 'code': getattr(err, 'code', None),
+                    'errmsg': unicode(err)})
+                if self.ordered:
+                    break
+                continue
+
+            ret = ret or {}
+            if kind == 'remove':
+                details['nRemoved'] += ret.get('n', 0)
+            elif 'upserted' in ret:
+                details['nUpserted'] += 1
+                details['upserted'].append({'index': index,
+                                            '_id': ret['upserted']})
+            else:
+                details['nMatched'] += ret.get('n', 0)
+        return details
+
+
+class _LegacyBulkWriteView(object):
+    """The operations on the documents matching a selector of a
+    :class:`_LegacyBulkWriteOperation`.
+    """
+
+    def __init__(self, bulk, selector, upsert=False):
+        self.bulk = bulk
+        self.selector = selector
+        self.is_upsert = upsert
+
+    def upsert(self):
+        return _LegacyBulkWriteView(self.bulk, self.selector, True)
+
+    def _add(self, kind, document, multi):
+        self.bulk.ops.append((kind, self.selector, document, self.is_upsert,
+                              multi))
+
+    def update(self, document):
+        self._add('update', document, True)
+
+    def update_one(self, document):
+        self._add('update', document, False)
+
+    def remove(self):
+        self._add('remove', None, True)
+
+    def remove_one(self):
+        self._add('remove', None, False)
@@ -0,0 +1,116 @@
+import array
+import calendar
+import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mongoengine.common import _import_class
+
+__all__ = ()
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# The typecode of 64-bit integers, which is 'q' where C longs are smaller
+INT64 = 'l' if array.array('l').itemsize == 8 else 'q'
+
+
+def _datetime_to_millis(value):
+    return (calendar.timegm(value.utctimetuple()) * 1000 +
+            value.microsecond // 1000)
+
+
+def _millis_to_datetime(value):
+    return EPOCH + datetime.timedelta(milliseconds=value)
+
+
+def _float_or_nan(value):
+    if value is None:
+        return float('nan')
+    return value
+
+
+class _Column(object):
+    """The values of a field read by
+    :meth:`~mongoengine.queryset.QuerySet.to_columns`.  They are stored in an
+    :class:`array.array` while they all fit its type and in a list
+    otherwise.
+    """
+
+    def __init__(self, typecode=None, dtype=None, to_item=None,
+                 from_item=None):
+        self.dtype = dtype
+        self.to_item = to_item
+        self.from_item = from_item
+        if typecode is None:
+            self.values = []
+        else:
+            self.values = array.array(typecode)
+
+    @classmethod
+    def for_field(cls, field):
+        """Return an empty column for the values of `field`."""
+        IntField = _import_class('IntField')
+        LongField = _import_class('LongField')
+        FloatField = _import_class('FloatField')
+        BooleanField = _import_class('BooleanField')
+        DateTimeField = _import_class('DateTimeField')
+
+        if isinstance(field, IntField):
+            return cls('i')
+        if isinstance(field, LongField):
+            return cls(INT64)
+        if isinstance(field, FloatField):
+            return cls('d', to_item=_float_or_nan)
+        if isinstance(field, BooleanField):
+            return cls('b', dtype=numpy and numpy.bool_, from_item=bool)
+        if isinstance(field, DateTimeField) and numpy is not None:
+            # Stored as milliseconds since the epoch, the precision of BSON
+            return cls(INT64, dtype='datetime64[ms]',
+                       to_item=_datetime_to_millis,
+                       from_item=_millis_to_datetime)
+        return cls()
+
+    def extend(self, new_values):
+        values = self.values
+        if isinstance(values, list):
+            values.extend(new_values)
+            return
+        start = len(values)
+        try:
+            if self.to_item is not None:
+                new_values = [self.to_item(v) for v in new_values]
+            values.extend(new_values)
+        except (TypeError, OverflowError, AttributeError):
+            # A value doesn't fit the array, such as None in a column of
+            # integers, so keep all values in a list from now on
+            del values[start:]
+            values = values.tolist()
+            if self.from_item is not None:
+                values = [self.from_item(v) for v in values]
+            values.extend(new_values)
+            self.values = values
+
+    def finish(self):
+        """Return the values as a NumPy array if NumPy is installed, as they
+        were stored otherwise.
+        """
+        values = self.values
+        if numpy is None:
+            return values
+
+        if isinstance(values, list):
+            column = numpy.empty(len(values), dtype=object)
+            for i, value in enumerate(values):
+                column[i] = value
+            return column
+
+        if values:
+            column = numpy.frombuffer(values, dtype=values.typecode)
+        else:
+            column = numpy.empty(0, dtype=values.typecode)
+        if self.dtype is not None:
+            column = column.view(self.dtype)
+        return column
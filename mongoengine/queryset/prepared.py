@@ -0,0 +1,61 @@
+from mongoengine.errors import InvalidQueryError, OperationError
+from mongoengine.queryset import transform
+
+__all__ = ('PreparedUpdate',)
+
+
+class PreparedUpdate(object):
+    """An update compiled once by
+    :meth:`~mongoengine.queryset.QuerySet.prepare_update` and executed many
+    times with new values and filters::
+
+        hit = Page.objects.prepare_update(inc__views=1, set__last_seen=None)
+        hit.execute(Q(pk=page_id), set__last_seen=datetime.now())
+
+    The values passed when preparing the update are the defaults of those
+    not passed to :meth:`execute`.
+
+    .. versionadded:: 0.8
+    """
+
+    def __init__(self, queryset, upsert=False, multi=True, write_concern=None,
+                 **update):
+        if not update:
+            raise OperationError("No update parameters, would remove data")
+
+        # Compile the update so that invalid keys are raised straight away
+        transform._update_plan(queryset._document, update)
+
+        self._queryset = queryset
+        self.upsert = upsert
+        self.multi = multi
+        self.write_concern = write_concern
+        self.defaults = update
+
+    def __repr__(self):
+        return '<PreparedUpdate: %s %r>' % (self._queryset._document.__name__,
+                                             self.defaults)
+
+    def execute(self, q_obj=None, **values):
+        """Update the documents matching the queryset the update was prepared
+        on and `q_obj`, returning the number of documents updated.
+
+        :param q_obj: a :class:`~mongoengine.queryset.Q` object to filter
+            the documents to update with
+        :param values: the new values of the update, keyed like the keyword
+            arguments passed to
+            :meth:`~mongoengine.queryset.QuerySet.prepare_update`
+        """
+        unknown = [key for key in values if key not in self.defaults]
+        if unknown:
+            raise InvalidQueryError("Values passed for keys that are not in "
+                                    "the prepared update: %s" %
+                                    ', '.join(sorted(unknown)))
+        update = self.defaults.copy()
+        update.update(values)
+
+        queryset = self._queryset
+        if q_obj is not None:
+            queryset = queryset.filter(q_obj)
+        return queryset.update(upsert=self.upsert, multi=self.multi,
+                               write_concern=self.write_concern, **update)
@@ -1,25 +1,40 @@
 from __future__ import absolute_import
 
+import base64
 import copy
 import itertools
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+from collections import deque
+from functools import partial
 import operator
 import pprint
 import re
 import warnings
 
 from bson.code import Code
-from bson import json_util
+from bson import BSON, json_util
 import pymongo
 from pymongo.common import validate_read_preference
 
 from mongoengine import signals
+from mongoengine.base.common import get_document, _document_registry
+from mongoengine.base.fields import BaseField, ComplexBaseField
+from mongoengine.base.readonly import from_son_readonly
 from mongoengine.common import _import_class
+from mongoengine.connection import (DEFAULT_CONNECTION_NAME, get_db,
+                                    _get_db_alias, _reset_connections)
 from mongoengine.errors import (OperationError, NotUniqueError,
-                                InvalidQueryError)
+                                InvalidQueryError, LookUpError)
 
 from mongoengine.queryset import transform
+from mongoengine.queryset.columns import _Column
+from mongoengine.queryset.bulk import (BulkInsert, BulkUpdate, BulkDelete,
+                                       BulkWriteResult,
+                                       _LegacyBulkWriteOperation)
 from mongoengine.queryset.field_list import QueryFieldList
-from mongoengine.queryset.visitor import Q, QNode
+from mongoengine.queryset.prepared import PreparedUpdate
+from mongoengine.queryset.visitor import Q, QNode, QCombination
 
 
 __all__ = ('QuerySet', 'DO_NOTHING', 'NULLIFY', 'CASCADE', 'DENY', 'PULL')
@@ -27,6 +42,10 @@ __all__ = ('QuerySet', 'DO_NOTHING', 'NULLIFY', 'CASCADE', 'DENY', 'PULL')
 # The maximum number of items to display in a QuerySet.__repr__
 REPR_OUTPUT_SIZE = 20
 
+# The number of results pulled from the cursor and converted at a time
+# while iterating a QuerySet
+ITER_CHUNK_SIZE = 100
+
 # Delete rules
 DO_NOTHING = 0
 NULLIFY = 1
@@ -36,6 +55,48 @@ PULL = 4
 
 RE_TYPE = type(re.compile(''))
 
+# The number of documents sampled for each partition made by
+# QuerySet.partition
+PARTITION_SAMPLE_SIZE = 20
+
+
+def _as_is(value):
+    return value
+
+
+def _func(method):
+    return getattr(method, '__func__', method)
+
+
+def _son_value(son, key):
+    """Return the value at the dotted `key` of `son`, or None if it's unset
+    """
+    value = son
+    for part in key.split('.'):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def _init_worker_process():
+    """Make a worker process of QuerySet.parallel_map connect to the
+    database itself rather than using the sockets of its parent.
+    """
+    _reset_connections()
+    for doc_cls in _document_registry.values():
+        if hasattr(doc_cls, '_get_collection'):
+            doc_cls._collection = None
+
+
+def _merge_results(results):
+    """Add up numbers and concatenate lists returned for each partition by
+    QuerySet.parallel_map
+    """
+    if all(isinstance(r, (int, long, float)) for r in results):
+        return sum(results)
+    if all(isinstance(r, list) for r in results):
+        return list(itertools.chain.from_iterable(results))
+    return results
+
 
 class QuerySet(object):
     """A set of results returned from a query. Wraps a MongoDB cursor,
@@ -60,9 +121,15 @@ class QuerySet(object):
         self._read_preference = None
         self._iter = False
         self._scalar = []
+        self._scalar_plans = {}
         self._none = False
         self._as_pymongo = False
         self._as_pymongo_coerce = False
+        self._as_pymongo_plan = None
+        self._readonly = document._meta.get('readonly_hydration', False)
+        self._lazy = False
+        self._result_buffer = deque()
+        self._result_convert = None
 
         # If inheritance is allowed, only return instances and instances of
         # subclasses of the class being used
@@ -145,13 +212,15 @@ class QuerySet(object):
         # Integer index provided
         elif isinstance(key, int):
             if queryset._scalar:
-                return queryset._get_scalar(
-                    queryset._document._from_son(queryset._cursor[key],
-                                                 _auto_dereference=self._auto_dereference))
+                return queryset._get_scalar_from_son(queryset._cursor[key])
             if queryset._as_pymongo:
                 return queryset._get_as_pymongo(queryset._cursor.next())
+            if queryset._readonly:
+                return from_son_readonly(queryset._document,
+                                         queryset._cursor[key])
             return queryset._document._from_son(queryset._cursor[key],
-                                                _auto_dereference=self._auto_dereference)
+                                                _auto_dereference=self._auto_dereference,
+                                                _lazy=queryset._lazy)
         raise AttributeError
 
     def __repr__(self):
@@ -193,7 +262,19 @@ class QuerySet(object):
         `DocumentName.DoesNotExist` if no results are found.
 
         .. versionadded:: 0.3
+        .. versionchanged:: 0.8 ``get(pk=...)`` uses the active
+            :class:`~mongoengine.context_managers.identity_map` and the
+            document cache
         """
+        by_id = False
+        if not q_objs and len(query) == 1:
+            field, object_id = query.items()[0]
+            by_id = field in ('pk', self._document._meta['id_field'])
+        if by_id:
+            result = self._get_cached(object_id)
+            if result is not None:
+                return result
+
         queryset = self.__call__(*q_objs, **query)
         queryset = queryset.limit(2)
         try:
@@ -205,6 +286,8 @@ class QuerySet(object):
         try:
             queryset.next()
         except StopIteration:
+            if by_id:
+                self._add_cached(result)
             return result
 
         queryset.rewind()
@@ -276,6 +359,20 @@ class QuerySet(object):
             result = None
         return result
 
+    def exists(self):
+        """Return whether any document matches the query, fetching only the
+        ``_id`` of one of them.
+
+        .. versionadded:: 0.8
+        """
+        if self._none or self._limit == 0:
+            return False
+        queryset = self.clone()
+        queryset._loaded_fields = QueryFieldList(['_id'])
+        for son in queryset._cursor.limit(1):
+            return True
+        return False
+
     def insert(self, doc_or_docs, load_bulk=True, write_concern=None):
         """bulk insert documents
 
@@ -334,7 +431,7 @@ class QuerySet(object):
                 self._document, documents=docs, loaded=False)
             return return_one and ids[0] or ids
 
-        documents = self.in_bulk(ids)
+        documents = self.readonly(False).in_bulk(ids)
         results = []
         for obj_id in ids:
             results.append(documents.get(obj_id))
@@ -342,6 +439,62 @@ class QuerySet(object):
             self._document, documents=results, loaded=True)
         return return_one and results[0] or results
 
+    def insert_stream(self, docs, chunk_size=1000, continue_on_error=False,
+                      write_concern=None):
+        """Insert documents from any iterable, such as a generator, in
+        chunks of `chunk_size` so that only one chunk is held in memory::
+
+            stats = Page.objects.insert_stream(
+                (Page(title=line) for line in open('titles.txt')),
+                continue_on_error=True)
+
+        Unlike :meth:`insert` the documents are not read back from the
+        database: the ids generated for them are set on the documents, which
+        are then marked as saved.  `pre_bulk_insert` and `post_bulk_insert`
+        are sent for every chunk.
+
+        Returns a list with the statistics of each chunk sent, a dict of the
+        chunk's `index`, the number of documents `sent` and `inserted` and
+        the `errors` of the documents that were not inserted as returned by
+        :meth:`bulk_write`.
+
+        :param docs: an iterable of documents to insert
+        :param chunk_size: the number of documents inserted at a time
+        :param continue_on_error: carry on inserting the rest of the
+            documents when an insert fails, for instance on a duplicate key;
+            by default the inserts stop at the first error
+        :param write_concern: Extra keyword arguments are passed down which
+            will be used as options for the resultant
+            ``getLastError`` command.  For example,
+            ``insert_stream(..., write_concern={w: 2, fsync: True})`` will
+            wait until at least two servers have recorded the write and
+            will force an fsync on the primary server.
+
+        .. versionadded:: 0.8
+        """
+        if not write_concern:
+            write_concern = {}
+
+        ordered = not continue_on_error
+        docs = iter(docs)
+        stats = []
+        offset = 0
+        while True:
+            chunk = [BulkInsert(doc)
+                     for doc in itertools.islice(docs, chunk_size)]
+            if not chunk:
+                break
+            result = BulkWriteResult()
+            succeeded = self._bulk_write_batch(chunk, offset, ordered,
+                                               write_concern, result)
+            stats.append({'index': len(stats), 'sent': len(chunk),
+                          'inserted': result.n_inserted,
+                          'errors': result.errors})
+            if ordered and not succeeded:
+                break
+            offset += len(chunk)
+        return stats
+
     def count(self, with_limit_and_skip=True):
         """Count the selected elements in the query.
 
@@ -353,9 +506,13 @@ class QuerySet(object):
             return 0
         return self._cursor.count(with_limit_and_skip=with_limit_and_skip)
 
-    def delete(self, write_concern=None):
+    def delete(self, write_concern=None, _from_doc_delete=False):
         """Delete the documents matched by the query.
 
+        The `pre_bulk_delete` and `post_bulk_delete` signals are sent once
+        for the whole delete.  Receivers of `pre_delete` or `post_delete`
+        make the documents be deleted one at a time.
+
         :param write_concern: Extra keyword arguments are passed down which
             will be used as options for the resultant
             ``getLastError`` command.  For example,
@@ -363,22 +520,31 @@ class QuerySet(object):
             wait until at least two servers have recorded the write and
             will force an fsync on the primary server.
         """
-        queryset = self.clone()
+        # Documents are loaded to be deleted one by one or to match their
+        # references, which read-only documents can't be used for
+        queryset = self.readonly(False)
         doc = queryset._document
 
-        has_delete_signal = signals.signals_available and (
+        has_delete_signal = (
             signals.pre_delete.has_receivers_for(self._document) or
             signals.post_delete.has_receivers_for(self._document))
 
         if not write_concern:
             write_concern = {}
 
-        # Handle deletes where skips or limits have been applied or has a
-        # delete signal
-        if queryset._skip or queryset._limit or has_delete_signal:
-            for doc in queryset:
-                doc.delete(write_concern=write_concern)
-            return
+        if not _from_doc_delete:
+            signals.pre_bulk_delete.send(doc, queryset=queryset)
+
+            # Handle deletes where skips or limits have been applied or has
+            # a delete signal
+            if queryset._skip or queryset._limit or has_delete_signal:
+                deleted = 0
+                for obj in queryset:
+                    obj.delete(write_concern=write_concern)
+                    deleted += 1
+                signals.post_bulk_delete.send(doc, queryset=queryset,
+                                              deleted=deleted)
+                return
 
         delete_rules = doc._meta.get('delete_rules') or {}
         # Check for DENY rules before actually deleting/nullifying any other
@@ -387,7 +553,7 @@ class QuerySet(object):
             document_cls, field_name = rule_entry
             rule = doc._meta['delete_rules'][rule_entry]
             if rule == DENY and document_cls.objects(
-                    **{field_name + '__in': self}).count() > 0:
+                    **{field_name + '__in': queryset}).count() > 0:
                 msg = ("Could not delete document (%s.%s refers to it)"
                        % (document_cls.__name__, field_name))
                 raise OperationError(msg)
@@ -396,23 +562,33 @@ class QuerySet(object):
             document_cls, field_name = rule_entry
             rule = doc._meta['delete_rules'][rule_entry]
             if rule == CASCADE:
-                ref_q = document_cls.objects(**{field_name + '__in': self})
+                ref_q = document_cls.objects.readonly(False)(
+                    **{field_name + '__in': queryset})
                 ref_q_count = ref_q.count()
                 if (doc != document_cls and ref_q_count > 0
                    or (doc == document_cls and ref_q_count > 0)):
                     ref_q.delete(write_concern=write_concern)
             elif rule == NULLIFY:
-                document_cls.objects(**{field_name + '__in': self}).update(
+                document_cls.objects(**{field_name + '__in': queryset}).update(
                     write_concern=write_concern, **{'unset__%s' % field_name: 1})
             elif rule == PULL:
-                document_cls.objects(**{field_name + '__in': self}).update(
+                document_cls.objects(**{field_name + '__in': queryset}).update(
                     write_concern=write_concern,
-                    **{'pull_all__%s' % field_name: self})
+                    **{'pull_all__%s' % field_name: queryset})
 
-        queryset._collection.remove(queryset._query, write_concern=write_concern)
+        ret = queryset._collection.remove(queryset._query,
+                                          write_concern=write_concern)
+        queryset._invalidate_cached()
+        if not _from_doc_delete:
+            deleted = ret.get('n') if isinstance(ret, dict) else None
+            signals.post_bulk_delete.send(doc, queryset=queryset,
+                                          deleted=deleted)
 
     def update(self, upsert=False, multi=True, write_concern=None, **update):
         """Perform an atomic update on the fields matched by the query.
+        The `pre_bulk_update` signal is sent with the update keyword
+        arguments, which its receivers may change, and `post_bulk_update`
+        with the number of documents updated.
 
         :param upsert: Any existing document with that "_id" is overwritten.
         :param multi: Update multiple documents.
@@ -434,21 +610,21 @@ class QuerySet(object):
 
         queryset = self.clone()
         query = queryset._query
-        update = transform.update(queryset._document, **update)
-
-        # If doing an atomic upsert on an inheritable class
-        # then ensure we add _cls to the update operation
-        if upsert and '_cls' in query:
-            if '$set' in update:
-                update["$set"]["_cls"] = queryset._document._class_name
-            else:
-                update["$set"] = {"_cls": queryset._document._class_name}
+        signals.pre_bulk_update.send(queryset._document, queryset=queryset,
+                                     update=update)
+        raw_update = queryset._transform_update(query, upsert, update)
 
         try:
-            ret = queryset._collection.update(query, update, multi=multi,
+            ret = queryset._collection.update(query, raw_update, multi=multi,
                                               upsert=upsert, **write_concern)
+            queryset._invalidate_cached()
+            updated = None
             if ret is not None and 'n' in ret:
-                return ret['n']
+                updated = ret['n']
+            signals.post_bulk_update.send(queryset._document,
+                                          queryset=queryset, update=update,
+                                          updated=updated)
+            return updated
         except pymongo.errors.OperationFailure, err:
             if unicode(err) == u'multi not coded yet':
                 message = u'update() method requires MongoDB 1.1.3+'
@@ -471,6 +647,193 @@ class QuerySet(object):
         """
         return self.update(upsert=upsert, multi=False, write_concern=None, **update)
 
+    def prepare_update(self, upsert=False, multi=True, write_concern=None,
+                       **update):
+        """Compile an update to execute many times with new values and
+        filters, see :class:`~mongoengine.queryset.PreparedUpdate`::
+
+            hit = Page.objects.prepare_update(inc__views=1,
+                                              set__last_seen=None)
+            hit.execute(Q(pk=page_id), set__last_seen=datetime.now())
+
+        The documents updated are those matching this queryset and the
+        filter passed to :meth:`~mongoengine.queryset.PreparedUpdate.execute`.
+
+        :param upsert: Any existing document with that "_id" is overwritten.
+        :param multi: Update multiple documents.
+        :param write_concern: Extra keyword arguments are passed down which
+            will be used as options for the resultant
+            ``getLastError`` command.
+        :param update: Django-style update keyword arguments, with the
+            default values of the update
+
+        .. versionadded:: 0.8
+        """
+        return PreparedUpdate(self.clone(), upsert=upsert, multi=multi,
+                              write_concern=write_concern, **update)
+
+    def bulk_write(self, ops, ordered=False, batch_size=1000,
+                   write_concern=None):
+        """Send a mix of inserts, updates, upserts and deletes in batches::
+
+            result = User.objects.bulk_write([
+                BulkInsert(User(name="Ross")),
+                BulkUpdate(Q(name="Bob"), set__age=30),
+                BulkUpdate(Q(name="Ann"), upsert=True, multi=False,
+                           set__age=21),
+                BulkDelete(Q(age__lt=18)),
+            ])
+
+        The query of each operation is combined with the query of the
+        queryset.  As with :meth:`update` and :meth:`delete` no delete rules
+        or delete signals are applied.  Inserted documents are not validated,
+        like with :meth:`insert`, but get their id set once written.
+
+        Write errors are not raised, they are reported per operation in the
+        returned :class:`~mongoengine.queryset.BulkWriteResult`.
+
+        :param ops: an iterable of :class:`~mongoengine.queryset.BulkInsert`,
+            :class:`~mongoengine.queryset.BulkUpdate` and
+            :class:`~mongoengine.queryset.BulkDelete` operations, which is
+            consumed a batch at a time
+        :param ordered: send the operations in order, stopping at the first
+            error; by default every operation is tried
+        :param batch_size: the number of operations sent in each batch
+        :param write_concern: Extra keyword arguments are passed down which
+            will be used as options for the resultant
+            ``getLastError`` command.  For example,
+            ``bulk_write(..., write_concern={w: 2, fsync: True})`` will
+            wait until at least two servers have recorded the write and
+            will force an fsync on the primary server.
+
+        .. versionadded:: 0.8
+        """
+        if not write_concern:
+            write_concern = {}
+
+        queryset = self.clone()
+        result = BulkWriteResult()
+        ops = iter(ops)
+        offset = 0
+        while True:
+            batch = list(itertools.islice(ops, batch_size))
+            if not batch:
+                break
+            succeeded = queryset._bulk_write_batch(batch, offset, ordered,
+                                                   write_concern, result)
+            if ordered and not succeeded:
+                break
+            offset += len(batch)
+        return result
+
+    def save_all(self, docs, validate=True, clean=True, batch_size=1000,
+                 write_concern=None):
+        """Save many documents with batched writes rather than calling
+        :meth:`~mongoengine.Document.save` on each of them::
+
+            for user in users:
+                user.score += 1
+            User.objects.save_all(users)
+
+        New documents are inserted and the changes of existing documents
+        are sent as atomic updates, the documents with identical changes
+        sharing a single update.  The `pre_save` and `post_save` signals are
+        sent for every document but, unlike
+        :meth:`~mongoengine.Document.save`, references are not cascaded.
+
+        If any write fails an :class:`~mongoengine.queryset.OperationError`
+        (or :class:`~mongoengine.queryset.NotUniqueError`) is raised once
+        the others were sent, only the documents that were written are
+        marked as saved.
+
+        :param docs: the documents to save
+        :param validate: validates the documents; set to ``False`` to skip.
+        :param clean: call the document clean methods, requires `validate`
+            to be True.
+        :param batch_size: the number of writes sent in each batch
+        :param write_concern: Extra keyword arguments are passed down which
+            will be used as options for the resultant
+            ``getLastError`` command.  For example,
+            ``save_all(..., write_concern={w: 2, fsync: True})`` will
+            wait until at least two servers have recorded the write and
+            will force an fsync on the primary server.
+
+        .. versionadded:: 0.8
+        """
+        docs = list(docs)
+        for doc in docs:
+            if not isinstance(doc, self._document):
+                msg = ("Some documents saved aren't instances of %s"
+                       % str(self._document))
+                raise OperationError(msg)
+            signals.pre_save.send(doc.__class__, document=doc)
+            if validate:
+                doc.validate(clean=clean)
+
+        # Build the writes, sharing the updates of identical changes
+        ops = []
+        op_docs = []
+        grouped = {}
+        unchanged = []
+        can_group = not self._document._meta.get('shard_key')
+        for doc in docs:
+            if doc._created or doc.pk is None:
+                ops.append(BulkInsert(doc))
+                op_docs.append([doc])
+                continue
+
+            updates, removals = doc._delta()
+            update_query = {}
+            if updates:
+                update_query["$set"] = updates
+            if removals:
+                update_query["$unset"] = removals
+            if not update_query:
+                unchanged.append(doc)
+                continue
+
+            if can_group:
+                key = BSON.encode(update_query)
+                if key in grouped:
+                    op_docs[grouped[key]].append(doc)
+                    continue
+                grouped[key] = len(ops)
+            ops.append(BulkUpdate(Q(**doc._object_key), __raw__=update_query))
+            op_docs.append([doc])
+
+        for index in grouped.itervalues():
+            if len(op_docs[index]) > 1:
+                ids = [doc.pk for doc in op_docs[index]]
+                ops[index].q_obj = Q(pk__in=ids)
+
+        result = self.bulk_write(ops, batch_size=batch_size,
+                                 write_concern=write_concern)
+
+        failed = set(error['index'] for error in result.errors)
+        for index, op in enumerate(ops):
+            if index in failed:
+                continue
+            created = isinstance(op, BulkInsert)
+            for doc in op_docs[index]:
+                doc._clear_changed_fields()
+                doc._created = False
+                signals.post_save.send(doc.__class__, document=doc,
+                                       created=created)
+        for doc in unchanged:
+            signals.post_save.send(doc.__class__, document=doc,
+                                   created=False)
+
+        if result.errors:
+            errmsg = result.errors[0]['errmsg']
+            if re.match('^E1100[01] duplicate key', errmsg):
+                # E11000 - duplicate key error index
+                # E11001 - duplicate key on update
+                message = u'Tried to save duplicate unique keys (%s)'
+                raise NotUniqueError(message % errmsg)
+            message = u'Could not save %s documents (%s)'
+            raise OperationError(message % (len(failed), errmsg))
+        return docs
+
     def with_id(self, object_id):
         """Retrieve the object matching the id provided.  Uses `object_id` only
         and raises InvalidQueryError if a filter has been applied. Returns
@@ -479,12 +842,20 @@ class QuerySet(object):
         :param object_id: the value for the id of the document to look up
 
         .. versionchanged:: 0.6 Raises InvalidQueryError if filter has been set
+        .. versionchanged:: 0.8 Uses the active
+            :class:`~mongoengine.context_managers.identity_map` and the
+            document cache
         """
         queryset = self.clone()
         if not queryset._query_obj.empty:
             msg = "Cannot use a filter whilst using `with_id`"
             raise InvalidQueryError(msg)
-        return queryset.filter(pk=object_id).first()
+
+        doc = queryset._get_cached(object_id)
+        if doc is None:
+            doc = queryset.filter(pk=object_id).first()
+            queryset._add_cached(doc)
+        return doc
 
     def in_bulk(self, object_ids):
         """Retrieve a set of documents by their ids.
@@ -494,24 +865,306 @@ class QuerySet(object):
                 Document subclasses as values.
 
         .. versionadded:: 0.3
+        .. versionchanged:: 0.8 Uses the document cache
         """
         doc_map = {}
 
-        docs = self._collection.find({'_id': {'$in': object_ids}},
-                                     **self._cursor_args)
+        cache = self._document._document_cache
+        if cache is None or self._loaded_fields:
+            docs = self._collection.find({'_id': {'$in': object_ids}},
+                                         **self._cursor_args)
+        else:
+            docs = []
+            missing_ids = []
+            for object_id in object_ids:
+                son = cache.get_son(self._document, object_id)
+                if son is None:
+                    missing_ids.append(object_id)
+                else:
+                    docs.append(son)
+            if missing_ids:
+                for son in self._collection.find(
+                        {'_id': {'$in': missing_ids}}, **self._cursor_args):
+                    cache.add(self._document, son)
+                    docs.append(son)
+
         if self._scalar:
             for doc in docs:
-                doc_map[doc['_id']] = self._get_scalar(
-                    self._document._from_son(doc))
+                doc_map[doc['_id']] = self._get_scalar_from_son(doc)
         elif self._as_pymongo:
             for doc in docs:
                 doc_map[doc['_id']] = self._get_as_pymongo(doc)
+        elif self._readonly:
+            for doc in docs:
+                doc_map[doc['_id']] = from_son_readonly(self._document, doc)
         else:
             for doc in docs:
-                doc_map[doc['_id']] = self._document._from_son(doc)
+                doc_map[doc['_id']] = self._document._from_son(
+                    doc, _lazy=self._lazy)
 
         return doc_map
 
+    def iter_batches(self, size=ITER_CHUNK_SIZE, select_related=False,
+                     max_depth=1):
+        """Iterate over the results in lists of up to `size` items.
+
+        Each batch is read from the cursor and converted in one pass, which is
+        cheaper than converting the results one by one when iterating over
+        large result sets. ::
+
+            for batch in BlogPost.objects.iter_batches(500, select_related=True):
+                for post in batch:
+                    print post.author.name
+
+        :param size: the number of results in each batch, also used as the
+            cursor batch size
+        :param select_related: dereference the references of each batch with
+            a single query per referenced collection
+        :param max_depth: the depth of references to dereference when
+            `select_related` is set
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        queryset._cursor.batch_size(size)
+        while True:
+            batch = queryset._next_batch(size)
+            if not batch:
+                break
+            if select_related and not (queryset._scalar or
+                                       queryset._as_pymongo or
+                                       queryset._readonly):
+                queryset._dereference(batch, max_depth=max_depth + 1)
+            yield batch
+
+    def paginate(self, after=None, size=ITER_CHUNK_SIZE):
+        """Return a page of up to `size` results and the token to pass as
+        `after` to read the next page, or ``None`` after the last page. ::
+
+            page, token = BlogPost.objects.order_by('-published').paginate(
+                size=20)
+            while token is not None:
+                page, token = BlogPost.objects.order_by(
+                    '-published').paginate(after=token, size=20)
+
+        Unlike slicing, which makes the server skip over all the earlier
+        results, each page is found by a range query on the ordering, so
+        every page costs the same.  The results are ordered by the keys of
+        :meth:`order_by` (or the ``ordering`` of the document) followed by
+        ``_id`` to make the order stable.  The fields in the ordering should
+        be set in every document and loaded by the query.  Any skip or limit
+        set on the queryset is ignored.
+
+        :param after: the token returned with the previous page
+        :param size: the number of results in the page
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        keys = list(queryset._ordering or
+                    queryset._get_order_by(self._document._meta['ordering']))
+        if '_id' not in [key for key, direction in keys]:
+            keys.append(('_id', pymongo.ASCENDING))
+        queryset._ordering = keys
+        queryset._skip = queryset._limit = None
+
+        if after is not None:
+            values = queryset._decode_page_token(after, keys)
+            branches = []
+            for i, (key, direction) in enumerate(keys):
+                op = '$gt' if direction == pymongo.ASCENDING else '$lt'
+                branch = dict((k, v) for (k, d), v in zip(keys[:i], values))
+                branch[key] = {op: values[i]}
+                branches.append(Q(__raw__=branch))
+            queryset._query_obj &= QCombination(QNode.OR, branches)
+        queryset._cursor_obj = None
+        queryset._mongo_query = None
+
+        if queryset._none or size < 1:
+            return [], None
+        # Read the values of the ordering even if they are not loaded
+        reader = queryset.clone()
+        reader._loaded_fields = queryset._page_fields(keys)
+        docs = list(reader._cursor.limit(size + 1))
+        if len(docs) <= size:
+            token = None
+        else:
+            del docs[size:]
+            token = queryset._encode_page_token(docs[-1], keys)
+        if not docs:
+            return [], None
+        return queryset._convert_batch(docs), token
+
+    def _page_fields(self, keys):
+        """Return the fields loaded by the queryset with the keys of the
+        ordering `keys` added, so pages can be continued after their last
+        result.
+        """
+        loaded = self._loaded_fields
+        fields = set(loaded.fields)
+        for key, direction in keys:
+            if loaded.value == QueryFieldList.EXCLUDE:
+                fields = set(f for f in fields if not (
+                    key == f or key.startswith(f + '.') or
+                    f.startswith(key + '.')))
+            elif fields and not any(key == f or key.startswith(f + '.')
+                                    for f in fields):
+                fields = set(f for f in fields
+                             if not f.startswith(key + '.'))
+                fields.add(key)
+        page_fields = QueryFieldList(fields, loaded.value,
+                                     loaded.always_include,
+                                     loaded._only_called)
+        page_fields.slice = loaded.slice
+        return page_fields
+
+    def _encode_page_token(self, son, keys):
+        """Return the token of the page after `son` in the order of `keys`
+        """
+        values = [_son_value(son, key) for key, direction in keys]
+        data = json_util.dumps({'k': keys, 'v': values})
+        return base64.urlsafe_b64encode(data.encode('utf-8'))
+
+    def _decode_page_token(self, token, keys):
+        """Return the values of `keys` in a token made by
+        :meth:`_encode_page_token`
+        """
+        try:
+            data = json_util.loads(
+                base64.urlsafe_b64decode(str(token)).decode('utf-8'))
+            token_keys = [(key, direction) for key, direction in data['k']]
+            values = data['v']
+        except Exception:
+            raise InvalidQueryError('Invalid page token %r' % (token,))
+        if token_keys != keys or len(values) != len(keys):
+            msg = "The page token doesn't match the ordering of the query"
+            raise InvalidQueryError(msg)
+        return values
+
+    def partition(self, n):
+        """Split the queryset into up to `n` querysets matching disjoint
+        ranges of ``_id``, or of the first field of the shard key of sharded
+        documents, which together match the same documents as the queryset.
+
+        The ranges are split at values sampled from the matching documents
+        with ``$sample``, or on servers without it at the values read by
+        skipping through the documents in order, so the partitions hold
+        about the same number of documents.  Any skip or limit set on the
+        queryset is ignored.
+
+        :param n: the number of partitions
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        queryset._skip = queryset._limit = None
+        if n < 2 or queryset._none:
+            return [queryset]
+
+        shard_key = self._document._meta.get('shard_key')
+        name = shard_key[0] if shard_key else 'pk'
+        key = self._document._translate_field_name(name)
+        name = name.replace('.', '__')
+
+        values = queryset._sample_values(key, n)
+        values.sort()
+        split_points = []
+        for i in xrange(1, n):
+            value = values[len(values) * i // n] if values else None
+            if value is not None and (not split_points or
+                                      value > split_points[-1]):
+                split_points.append(value)
+        if not split_points:
+            return [queryset]
+
+        def make_partition(**query):
+            partition = queryset.clone()
+            partition._query_obj &= Q(**query)
+            partition._mongo_query = None
+            partition._cursor_obj = None
+            return partition
+
+        # The first partition takes the documents missing the key or with
+        # values of another type, which don't match a range of values
+        partitions = [make_partition(**{name + '__not__gte': split_points[0]})]
+        for lower, upper in zip(split_points, split_points[1:]):
+            partitions.append(make_partition(**{name + '__gte': lower,
+                                                name + '__lt': upper}))
+        partitions.append(make_partition(**{name + '__gte': split_points[-1]}))
+        return partitions
+
+    def _sample_values(self, key, n):
+        """Return values of `key` from ``n * PARTITION_SAMPLE_SIZE`` random
+        matching documents, or from `n` evenly spaced ones
+        """
+        try:
+            docs = self.aggregate(
+                {'$sample': {'size': n * PARTITION_SAMPLE_SIZE}},
+                {'$project': {key: True}})
+            return [_son_value(doc, key) for doc in docs]
+        except (NotImplementedError, pymongo.errors.OperationFailure):
+            pass
+
+        # $sample requires MongoDB 3.2, read the values at the start of each
+        # partition in the order of the key instead
+        count = self.count()
+        size = min(n, count)
+        values = []
+        for i in xrange(size):
+            cursor = self._collection.find(self._query, {key: True})
+            cursor = cursor.sort(key, pymongo.ASCENDING)
+            for son in cursor.skip(count * i // size).limit(1):
+                values.append(_son_value(son, key))
+        return values
+
+    def parallel_map(self, fn, workers=None, executor='thread',
+                     partitions=None):
+        """Call `fn` with each of the querysets made by :meth:`partition`
+        in a pool of worker threads or processes, and merge the results::
+
+            def reindex(posts):
+                count = 0
+                for batch in posts.iter_batches(500):
+                    search.index(batch)
+                    count += len(batch)
+                return count
+
+            indexed = BlogPost.objects(published=True).parallel_map(
+                reindex, workers=8, executor='process')
+
+        Numbers returned by `fn`, such as counts, are added up and lists are
+        concatenated.  Any other results are returned in a list in the order
+        of the partitions.
+
+        Worker processes connect to the database again rather than share
+        the connections of the parent process, and `fn` and its results
+        have to be picklable, so `fn` can't be a lambda or a nested function
+        and the documents have to be defined at the top level of a module.
+
+        :param fn: the function to call with each partition
+        :param workers: the number of threads or processes, by default the
+            number of CPUs
+        :param executor: ``'thread'`` or ``'process'``
+        :param partitions: the number of partitions, by default `workers`
+
+        .. versionadded:: 0.8
+        """
+        workers = workers or multiprocessing.cpu_count()
+        if executor == 'thread':
+            pool = ThreadPool(workers)
+        elif executor == 'process':
+            pool = multiprocessing.Pool(workers,
+                                        initializer=_init_worker_process)
+        else:
+            raise ValueError("executor must be 'thread' or 'process', not %r"
+                             % (executor,))
+        try:
+            results = pool.map(fn, self.partition(partitions or workers), 1)
+        finally:
+            pool.terminate()
+            pool.join()
+        return _merge_results(results)
+
     def none(self):
         """Helper that just returns a list"""
         queryset = self.clone()
@@ -530,7 +1183,8 @@ class QuerySet(object):
                       '_where_clause', '_loaded_fields', '_ordering', '_snapshot',
                       '_timeout', '_class_check', '_slave_okay', '_read_preference',
                       '_iter', '_scalar', '_as_pymongo', '_as_pymongo_coerce',
-                      '_limit', '_skip', '_hint', '_auto_dereference')
+                      '_limit', '_skip', '_hint', '_auto_dereference',
+                      '_readonly', '_lazy')
 
         for prop in copy_props:
             val = getattr(self, prop)
@@ -547,15 +1201,30 @@ class QuerySet(object):
 
         return c
 
-    def select_related(self, max_depth=1):
+    def select_related(self, max_depth=1, batch_size=None):
         """Handles dereferencing of :class:`~bson.dbref.DBRef` objects to
         a maximum depth in order to cut down the number queries to mongodb.
 
+        By default all the results are loaded into a list before being
+        dereferenced.  If `batch_size` is set the results are streamed
+        instead: each batch read from the cursor is dereferenced with a single
+        query per referenced collection before its documents are returned.
+
+        :param max_depth: the depth of references to dereference
+        :param batch_size: stream the results, dereferencing them in batches
+            of this size
+
         .. versionadded:: 0.5
+        .. versionchanged:: 0.8 added `batch_size`
         """
+        queryset = self.clone()
+        if batch_size:
+            batches = queryset.iter_batches(batch_size, select_related=True,
+                                            max_depth=max_depth)
+            return itertools.chain.from_iterable(batches)
+
         # Make select related work the same for querysets
         max_depth += 1
-        queryset = self.clone()
         return queryset._dereference(queryset, max_depth=max_depth)
 
     def limit(self, n):
@@ -790,6 +1459,10 @@ class QuerySet(object):
         .. note:: This effects all results and can be unset by calling
                   ``scalar`` without arguments. Calls ``only`` automatically.
 
+        The values are read from the documents returned by MongoDB and
+        converted by their fields, without creating documents, unless the
+        fields dereference their values.
+
         :param fields: One or more fields to return instead of a Document.
         """
         queryset = self.clone()
@@ -806,9 +1479,49 @@ class QuerySet(object):
         """An alias for scalar"""
         return self.scalar(*fields)
 
+    def to_columns(self, *fields):
+        """Read the values of `fields` into one column per field, without
+        creating documents::
+
+            columns = Reading.objects(sensor=sensor).to_columns('ts', 'value')
+            mean = columns['value'].mean()
+
+        The columns are NumPy arrays if NumPy is installed.  The values of
+        :class:`~mongoengine.IntField`, :class:`~mongoengine.LongField`,
+        :class:`~mongoengine.FloatField`, :class:`~mongoengine.BooleanField`
+        and, with NumPy, :class:`~mongoengine.DateTimeField` are stored with
+        native types, others are stored as objects.  Missing floats are
+        stored as NaN and a column holding any other value that doesn't fit
+        its type falls back to objects.  Without NumPy, typed columns are
+        :class:`array.array`\ s and the others are lists.
+
+        :param fields: the names of the fields to read
+        :rtype: dict of field names to columns
+
+        .. versionadded:: 0.8
+        """
+        if not fields:
+            raise OperationError('No fields given to read into columns')
+        columns = []
+        for name in fields:
+            field = self._document._lookup_field(name.split('__'))[-1]
+            columns.append(_Column.for_field(field))
+
+        queryset = self.scalar(*fields)
+        for batch in queryset.iter_batches(ITER_CHUNK_SIZE * 10):
+            if len(fields) == 1:
+                columns[0].extend(batch)
+                continue
+            for column, values in zip(columns, zip(*batch)):
+                column.extend(values)
+
+        return dict((name, column.finish())
+                    for name, column in zip(fields, columns))
+
     def as_pymongo(self, coerce_types=False):
         """Instead of returning Document instances, return raw values from
-        pymongo.
+        pymongo.  Rows are returned as pymongo read them unless fields were
+        selected with :meth:`only` or types are coerced.
 
         :param coerce_type: Field types (if applicable) would be use to
             coerce types.
@@ -823,13 +1536,82 @@ class QuerySet(object):
     def to_json(self):
         """Converts a queryset to JSON"""
         queryset = self.clone()
-        return json_util.dumps(queryset._collection_obj.find(queryset._query))
+        return json_util.dumps(queryset._cursor)
 
     def from_json(self, json_data):
         """Converts json data to unsaved objects"""
         son_data = json_util.loads(json_data)
         return [self._document._from_son(data) for data in son_data]
 
+    def dump_json(self, fp, batch_size=1000):
+        """Write the documents matched by the queryset to the file `fp` as
+        newline-delimited Extended JSON, one document per line, so that only
+        a batch of documents is held in memory::
+
+            with open('pages.json', 'w') as fp:
+                Page.objects(site=site).only('url', 'title').dump_json(fp)
+
+        The fields loaded, ordering, skip and limit of the queryset are
+        honoured.  Returns the number of documents written.
+
+        :param fp: a file-like object opened for writing
+        :param batch_size: the number of documents read from the cursor and
+            written at a time
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        if queryset._none or queryset._limit == 0:
+            return 0
+        cursor = queryset._cursor
+        cursor.batch_size(batch_size)
+
+        written = 0
+        while True:
+            batch = [json_util.dumps(son)
+                     for son in itertools.islice(cursor, batch_size)]
+            if not batch:
+                break
+            fp.write('\n'.join(batch) + '\n')
+            written += len(batch)
+        return written
+
+    def load_json(self, fp, chunk_size=1000, continue_on_error=False,
+                  write_concern=None):
+        """Insert the documents of the newline-delimited Extended JSON read
+        line by line from the file `fp`, as written by :meth:`dump_json`, in
+        chunks of `chunk_size` through :meth:`insert_stream`::
+
+            with open('pages.json') as fp:
+                Page.objects.load_json(fp)
+
+        Returns the statistics of each chunk inserted, see
+        :meth:`insert_stream`.
+
+        :param fp: a file-like object, or any iterable of lines
+        :param chunk_size: the number of documents inserted at a time
+        :param continue_on_error: carry on inserting the rest of the
+            documents when an insert fails, for instance on a duplicate key
+        :param write_concern: Extra keyword arguments are passed down which
+            will be used as options for the resultant
+            ``getLastError`` command.
+
+        .. versionadded:: 0.8
+        """
+        from_son = self._document._from_son
+
+        def load(line):
+            # The documents are new to this collection even though they
+            # have an id, so they are inserted rather than updated
+            doc = from_son(json_util.loads(line))
+            doc._created = True
+            return doc
+
+        docs = (load(line) for line in fp if line.strip())
+        return self.insert_stream(docs, chunk_size=chunk_size,
+                                  continue_on_error=continue_on_error,
+                                  write_concern=write_concern)
+
     # JS functionality
 
     def map_reduce(self, map_f, reduce_f, output, finalize_f=None, limit=None,
@@ -927,6 +1709,40 @@ class QuerySet(object):
             yield MapReduceDocument(queryset._document, queryset._collection,
                                     doc['_id'], doc['value'])
 
+    def aggregate(self, *pipeline, **kwargs):
+        """Run an aggregation pipeline on the documents matched by the
+        queryset, whose query is added to the start of the pipeline as a
+        ``$match`` stage::
+
+            totals = BlogPost.objects(published=True).aggregate(
+                {'$group': {'_id': '$~author', 'views': {'$sum': '$~views'}}})
+
+        As with :meth:`exec_js`, MongoEngine field names are replaced with
+        the database field names: field paths written ``$~field`` in the
+        values of the stages and keys written ``~field`` are translated.
+
+        Returns the documents produced by the pipeline.
+
+        :param pipeline: the stages of the pipeline, as dicts
+        :param kwargs: extra keyword arguments passed to pymongo's
+            ``aggregate``
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        if not hasattr(queryset._collection, 'aggregate'):
+            raise NotImplementedError("Requires MongoDB >= 2.1")
+
+        stages = [queryset._translate_stage(stage) for stage in pipeline]
+        if queryset._query:
+            stages.insert(0, {'$match': queryset._query})
+
+        results = queryset._collection.aggregate(stages, **kwargs)
+        # pymongo < 3.0 returns the command's response
+        if isinstance(results, dict):
+            results = results['result']
+        return results
+
     def exec_js(self, code, *fields, **options):
         """Execute a Javascript function on the server. A list of fields may be
         provided, which will be translated to their correct names and supplied
@@ -995,27 +1811,13 @@ class QuerySet(object):
 
         .. versionchanged:: 0.5 - updated to map_reduce as db.eval doesnt work
             with sharding.
+        .. versionchanged:: 0.8 - uses the aggregation framework, falling back
+            to map_reduce if it is unavailable.
         """
-        map_func = Code("""
-            function() {
-                emit(1, this[field] || 0);
-            }
-        """, scope={'field': field})
-
-        reduce_func = Code("""
-            function(key, values) {
-                var sum = 0;
-                for (var i in values) {
-                    sum += values[i];
-                }
-                return sum;
-            }
-        """)
-
-        for result in self.map_reduce(map_func, reduce_func, output='inline'):
-            return result.value
-        else:
-            return 0
+        try:
+            return self._aggregate_field(field, '$sum') or 0
+        except (NotImplementedError, pymongo.errors.OperationFailure):
+            return self._sum_map_reduce(field)
 
     def average(self, field):
         """Average over the values of the specified field.
@@ -1025,39 +1827,15 @@ class QuerySet(object):
 
         .. versionchanged:: 0.5 - updated to map_reduce as db.eval doesnt work
             with sharding.
+        .. versionchanged:: 0.8 - uses the aggregation framework, falling back
+            to map_reduce if it is unavailable.
         """
-        map_func = Code("""
-            function() {
-                if (this.hasOwnProperty(field))
-                    emit(1, {t: this[field] || 0, c: 1});
-            }
-        """, scope={'field': field})
-
-        reduce_func = Code("""
-            function(key, values) {
-                var out = {t: 0, c: 0};
-                for (var i in values) {
-                    var value = values[i];
-                    out.t += value.t;
-                    out.c += value.c;
-                }
-                return out;
-            }
-        """)
-
-        finalize_func = Code("""
-            function(key, value) {
-                return value.t / value.c;
-            }
-        """)
-
-        for result in self.map_reduce(map_func, reduce_func,
-                                      finalize_f=finalize_func, output='inline'):
-            return result.value
-        else:
-            return 0
+        try:
+            return self._aggregate_field(field, '$avg') or 0
+        except (NotImplementedError, pymongo.errors.OperationFailure):
+            return self._average_map_reduce(field)
 
-    def item_frequencies(self, field, normalize=False, map_reduce=True):
+    def item_frequencies(self, field, normalize=False, map_reduce=None):
         """Returns a dictionary of all items present in a field across
         the whole queried set of documents, and their corresponding frequency.
         This is useful for generating tag clouds, or searching documents.
@@ -1074,11 +1852,21 @@ class QuerySet(object):
 
         :param field: the field to use
         :param normalize: normalize the results so they add to 1.0
-        :param map_reduce: Use map_reduce over exec_js
+        :param map_reduce: Use map_reduce over exec_js, by default the
+            aggregation framework is used and map_reduce if it is unavailable
+            or if the field holds values of any type, such as a
+            :class:`~mongoengine.fields.DynamicField`
 
         .. versionchanged:: 0.5 defaults to map_reduce and can handle embedded
                             document lookups
+        .. versionchanged:: 0.8 defaults to the aggregation framework
         """
+        if map_reduce is None:
+            try:
+                return self._item_frequencies_aggregate(field,
+                                                        normalize=normalize)
+            except (NotImplementedError, pymongo.errors.OperationFailure):
+                map_reduce = True
         if map_reduce:
             return self._item_frequencies_map_reduce(field,
                                                      normalize=normalize)
@@ -1091,15 +1879,15 @@ class QuerySet(object):
         """
         self._iter = True
         try:
-            if self._limit == 0 or self._none:
-                raise StopIteration
-            if self._scalar:
-                return self._get_scalar(self._document._from_son(
-                        self._cursor.next()))
-            if self._as_pymongo:
-                return self._get_as_pymongo(self._cursor.next())
-
-            return self._document._from_son(self._cursor.next())
+            # Buffer the SON documents of a chunk and only convert those
+            # that are returned, so post_init isn't sent for results that
+            # are never read
+            if not self._result_buffer:
+                self._result_buffer.extend(self._next_docs(ITER_CHUNK_SIZE))
+                if not self._result_buffer:
+                    raise StopIteration
+                self._result_convert = self._get_converter()
+            return self._result_convert(self._result_buffer.popleft())
         except StopIteration, e:
             self.rewind()
             raise e
@@ -1110,6 +1898,7 @@ class QuerySet(object):
         .. versionadded:: 0.3
         """
         self._iter = False
+        self._result_buffer.clear()
         self._cursor.rewind()
 
     # Properties
@@ -1169,6 +1958,48 @@ class QuerySet(object):
         """Essential for chained queries with ReferenceFields involved"""
         return self.clone()
 
+    def __getstate__(self):
+        """Pickle the queryset without its collection, cursor and compiled
+        plans, so it can be sent to another process.  The database alias
+        and the name of the collection are kept instead, so querysets made
+        within :class:`~mongoengine.context_managers.switch_db` or
+        :class:`~mongoengine.context_managers.switch_collection` keep
+        their collection.
+        """
+        state = self.__dict__.copy()
+        for name in ('_collection_obj', '_cursor_obj', '_scalar_plans',
+                     '_as_pymongo_plan', '_QuerySet__dereference',
+                     '_result_buffer', '_result_convert'):
+            state.pop(name, None)
+        collection = self._collection_obj
+        if collection is not None:
+            state['_db_alias'] = _get_db_alias(collection.database)
+            state['_collection_name'] = collection.name
+        return state
+
+    def __setstate__(self, state):
+        """Unpickle the queryset with the collection it was pickled with,
+        or the collection of its document.
+        """
+        db_alias = state.pop('_db_alias', None)
+        collection_name = state.pop('_collection_name', None)
+        self.__dict__.update(state)
+        document = self._document
+        if (db_alias in (None, document._meta.get('db_alias',
+                                                  DEFAULT_CONNECTION_NAME))
+           and collection_name in (None,
+                                   document._get_collection_name())):
+            self._collection_obj = document._get_collection()
+        elif db_alias is None:
+            self._collection_obj = document._get_db()[collection_name]
+        else:
+            self._collection_obj = get_db(db_alias)[collection_name]
+        self._cursor_obj = None
+        self._scalar_plans = {}
+        self._as_pymongo_plan = None
+        self._result_buffer = deque()
+        self._result_convert = None
+
     @property
     def _query(self):
         if self._mongo_query is None:
@@ -1190,8 +2021,161 @@ class QuerySet(object):
         queryset._auto_dereference = False
         return queryset
 
+    def lazy(self):
+        """Convert the values of the fields of the documents returned the
+        first time they are read, rather than when the documents are loaded.
+        Fields that aren't read are saved back as they were loaded and aren't
+        validated again.  Dynamic documents and documents with their own
+        ``__init__`` are always loaded in full.
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        queryset._lazy = True
+        return queryset
+
+    def readonly(self, readonly=True):
+        """Return frozen, lightweight
+        :class:`~mongoengine.base.ReadOnlyDocument` instances instead of
+        documents.  They have no change tracking and no list or dict
+        wrappers, references are not dereferenced and they can't be saved.
+        Read-only results can be the default of a document class with the
+        `readonly_hydration` meta option::
+
+            for post in BlogPost.objects.readonly():
+                print post.title
+
+        :param readonly: whether to return read-only instances, pass `False`
+            to load documents when `readonly_hydration` is set
+
+        .. versionadded:: 0.8
+        """
+        queryset = self.clone()
+        queryset._readonly = readonly
+        return queryset
+
     # Helper Functions
 
+    def _translate_stage(self, stage):
+        """Translate the ``~field`` keys and ``$~field`` paths of an
+        aggregation pipeline stage to database field names.
+        """
+        if isinstance(stage, dict):
+            translated = {}
+            for key, value in stage.iteritems():
+                if key.startswith('~'):
+                    key = self._document._translate_field_name(key[1:])
+                translated[key] = self._translate_stage(value)
+            return translated
+        elif isinstance(stage, (list, tuple)):
+            return [self._translate_stage(value) for value in stage]
+        elif isinstance(stage, basestring) and stage.startswith('$~'):
+            return '$' + self._document._translate_field_name(stage[2:])
+        return stage
+
+    def _aggregate_field(self, field, operator):
+        """Return the result of the ``$group`` accumulator `operator` over
+        the values of `field`, or `None` if no document matched.
+        """
+        group = {'$group': {'_id': None,
+                            'value': {operator: '$~' + field}}}
+        for result in self.aggregate(group):
+            return result['value']
+        return None
+
+    def _sum_map_reduce(self, field):
+        map_func = Code("""
+            function() {
+                emit(1, this[field] || 0);
+            }
+        """, scope={'field': field})
+
+        reduce_func = Code("""
+            function(key, values) {
+                var sum = 0;
+                for (var i in values) {
+                    sum += values[i];
+                }
+                return sum;
+            }
+        """)
+
+        for result in self.map_reduce(map_func, reduce_func, output='inline'):
+            return result.value
+        else:
+            return 0
+
+    def _average_map_reduce(self, field):
+        map_func = Code("""
+            function() {
+                if (this.hasOwnProperty(field))
+                    emit(1, {t: this[field] || 0, c: 1});
+            }
+        """, scope={'field': field})
+
+        reduce_func = Code("""
+            function(key, values) {
+                var out = {t: 0, c: 0};
+                for (var i in values) {
+                    var value = values[i];
+                    out.t += value.t;
+                    out.c += value.c;
+                }
+                return out;
+            }
+        """)
+
+        finalize_func = Code("""
+            function(key, value) {
+                return value.t / value.c;
+            }
+        """)
+
+        for result in self.map_reduce(map_func, reduce_func,
+                                      finalize_f=finalize_func, output='inline'):
+            return result.value
+        else:
+            return 0
+
+    def _item_frequencies_aggregate(self, field, normalize=False):
+        fields = self._document._lookup_field(field.split('.'))
+        ListField = _import_class('ListField')
+        DynamicField = _import_class('DynamicField')
+        for part in fields:
+            if (not isinstance(part, BaseField) or type(part) is BaseField or
+               isinstance(part, DynamicField)):
+                # Values of any type may be lists, which can't be told apart
+                # from other values to be unwound
+                raise NotImplementedError('Cannot count the items of "%s" '
+                                          'with the aggregation framework'
+                                          % field)
+
+        # Unwind each list on the path so that their items are counted
+        # individually.  Missing and null lists are unwound as a single null
+        # so that they are counted as `None` like map/reduce does.
+        pipeline = []
+        value, path = '$', []
+        for part in fields:
+            path.append(part.db_field)
+            if isinstance(part, ListField):
+                pipeline.append({'$project': {'_value': {
+                    '$ifNull': [value + '.'.join(path), [None]]}}})
+                pipeline.append({'$unwind': '$_value'})
+                value, path = '$_value.', []
+        key = (value + '.'.join(path)).rstrip('.')
+        pipeline.append({'$group': {'_id': key, 'count': {'$sum': 1}}})
+
+        frequencies = {}
+        for result in self.aggregate(*pipeline):
+            frequencies[result['_id']] = result['count']
+
+        if normalize:
+            count = sum(frequencies.values())
+            frequencies = dict([(k, float(v) / count)
+                                for k, v in frequencies.items()])
+
+        return frequencies
+
     def _item_frequencies_map_reduce(self, field, normalize=False):
         map_func = """
             function() {
@@ -1336,6 +2320,276 @@ class QuerySet(object):
             self._cursor_obj.sort(key_list)
         return key_list
 
+    def _next_docs(self, size):
+        """Read up to `size` SON documents from the cursor
+        """
+        if self._limit == 0 or self._none:
+            return []
+        return list(itertools.islice(self._cursor, size))
+
+    def _next_batch(self, size):
+        """Read up to `size` results from the cursor and convert them
+        """
+        docs = self._next_docs(size)
+        if not docs:
+            return docs
+        return self._convert_batch(docs)
+
+    def _convert_batch(self, docs):
+        """Convert SON documents read from the cursor into results
+        """
+        convert = self._get_converter()
+        if convert is _as_is:
+            return docs
+        return [convert(doc) for doc in docs]
+
+    def _get_converter(self):
+        """Return the function converting a SON document read from the
+        cursor into a result
+        """
+        if self._scalar:
+            return self._get_scalar_from_son
+        if self._as_pymongo:
+            return self._get_as_pymongo_plan()
+        if self._readonly:
+            return partial(from_son_readonly, self._document)
+        if self._lazy:
+            return partial(self._document._from_son, _lazy=True)
+        return self._document._from_son
+
+    def _bulk_write_batch(self, ops, offset, ordered, write_concern, result):
+        """Send a batch of bulk write operations and add their results to
+        `result`, returning whether every operation succeeded.
+        """
+        collection = self._collection
+        if not hasattr(collection, 'initialize_ordered_bulk_op'):
+            bulk = _LegacyBulkWriteOperation(collection, ordered)
+        elif ordered:
+            bulk = collection.initialize_ordered_bulk_op()
+        else:
+            bulk = collection.initialize_unordered_bulk_op()
+
+        inserts = []
+        changed = []
+        for i, op in enumerate(ops):
+            if isinstance(op, BulkInsert):
+                doc = op.document
+                if not isinstance(doc, self._document):
+                    msg = ("Some documents inserted aren't instances of %s"
+                           % str(self._document))
+                    raise OperationError(msg)
+                if doc.pk and not doc._created:
+                    msg = ("Some documents have ObjectIds use "
+                           "BulkUpdate instead")
+                    raise OperationError(msg)
+                son = doc.to_mongo()
+                bulk.insert(son)
+                inserts.append((i, doc, son))
+                continue
+
+            queryset = self.clone()
+            if op.q_obj is not None:
+                queryset = queryset.filter(op.q_obj)
+            query = queryset._query
+            view = bulk.find(query)
+            if isinstance(op, BulkUpdate):
+                if op.upsert:
+                    view = view.upsert()
+                update = queryset._transform_update(query, op.upsert,
+                                                    op.update)
+                if op.multi:
+                    view.update(update)
+                else:
+                    view.update_one(update)
+            elif isinstance(op, BulkDelete):
+                if op.multi:
+                    view.remove()
+                else:
+                    view.remove_one()
+            else:
+                raise OperationError("Unknown bulk write operation: %r" % op)
+            changed.append(queryset)
+
+        docs = [doc for i, doc, son in inserts]
+        if docs:
+            signals.pre_bulk_insert.send(self._document, documents=docs)
+        try:
+            details = bulk.execute(write_concern)
+        except pymongo.errors.OperationFailure, err:
+            # Write errors are reported with the results of the operations
+            details = getattr(err, 'details', None)
+            if not details or 'writeErrors' not in details:
+                raise OperationError(u'Bulk write failed (%s)' % unicode(err))
+        succeeded = set(result._merge(details, ops, offset, ordered))
+
+        id_field = self._document._meta['id_field']
+        inserted = []
+        for i, doc, son in inserts:
+            if i in succeeded:
+                doc[id_field] = doc._fields[id_field].to_python(son['_id'])
+                doc._clear_changed_fields()
+                doc._created = False
+                result.inserted_ids[offset + i] = son['_id']
+                inserted.append(doc)
+        for queryset in changed:
+            queryset._invalidate_cached()
+        if docs:
+            signals.post_bulk_insert.send(self._document, documents=inserted,
+                                          loaded=False)
+        return len(succeeded) == len(ops)
+
+    def _transform_update(self, query, upsert, update):
+        """Transform Django-style update keyword arguments to an update
+        spec for the documents matching `query`.
+        """
+        update = transform.update(self._document, **update)
+
+        # If doing an atomic upsert on an inheritable class
+        # then ensure we add _cls to the update operation
+        if upsert and '_cls' in query:
+            if '$set' in update:
+                update["$set"]["_cls"] = self._document._class_name
+            else:
+                update["$set"] = {"_cls": self._document._class_name}
+        return update
+
+    def _can_use_cached(self):
+        """Whether this queryset loads full documents by their id alone, so
+        they can be shared through the identity map and document cache.
+        """
+        return not (not self._query_obj.empty or self._where_clause or
+                    self._none or self._loaded_fields or self._scalar or
+                    self._as_pymongo or self._readonly)
+
+    def _get_cached(self, object_id):
+        """Return the document with `object_id` from the active
+        :class:`~mongoengine.context_managers.identity_map` or the document
+        cache, or `None` if it was not found.
+        """
+        id_map = _import_class('identity_map').current()
+        cache = self._document._document_cache
+        if (id_map is None and cache is None) or not self._can_use_cached():
+            return None
+
+        doc = None
+        if id_map is not None:
+            doc = id_map.get(self._document, object_id)
+        if doc is None and cache is not None:
+            doc = cache.get(self._document, object_id)
+            if doc is not None and id_map is not None:
+                id_map.add(doc)
+        return doc
+
+    def _add_cached(self, doc):
+        """Store a document loaded by its id in the active
+        :class:`~mongoengine.context_managers.identity_map` and the document
+        cache.
+        """
+        id_map = _import_class('identity_map').current()
+        cache = self._document._document_cache
+        if (doc is None or (id_map is None and cache is None) or
+                not self._can_use_cached()):
+            return
+
+        if id_map is not None:
+            id_map.add(doc)
+        if cache is not None:
+            cache.add(self._document, doc.to_mongo())
+
+    def _invalidate_cached(self):
+        """Remove the documents matched by this queryset from the active
+        :class:`~mongoengine.context_managers.identity_map` and the document
+        cache after they were changed.
+        """
+        id_map = _import_class('identity_map').current()
+        if id_map is not None:
+            id_map.discard_collection(self._document)
+        cache = self._document._document_cache
+        if cache is not None:
+            cache.discard_query(self._document, self._query)
+
+    def _get_scalar_from_son(self, son):
+        """Return the scalar values of a SON, read directly from it if the
+        fields allow it or from the document built from it otherwise.
+        """
+        class_name = son.get('_cls', self._document._class_name)
+        try:
+            plan = self._scalar_plans[class_name]
+        except KeyError:
+            plan = self._scalar_plans[class_name] = \
+                self._compile_scalar(class_name)
+
+        if plan is not None:
+            data = []
+            for path, field in plan:
+                value = son
+                for key in path:
+                    if not isinstance(value, dict):
+                        break
+                    value = value.get(key)
+                else:
+                    if value is None:
+                        value = field.default
+                        if callable(value):
+                            value = value()
+                    else:
+                        value = field.to_python(value)
+                    data.append(value)
+                    continue
+                # An embedded document on the way is missing
+                break
+            else:
+                if len(data) == 1:
+                    return data[0]
+                return tuple(data)
+
+        doc = self._document._from_son(
+            son, _auto_dereference=self._auto_dereference)
+        return self._get_scalar(doc)
+
+    def _compile_scalar(self, class_name):
+        """Work out the path in the SON of each scalar field of documents of
+        `class_name` and the field converting its value.  Returns `None` if
+        any field may dereference its value when it is read, so the
+        documents have to be built.
+        """
+        doc_cls = self._document
+        if class_name != doc_cls._class_name:
+            doc_cls = get_document(class_name)
+        if doc_cls._dynamic:
+            return None
+
+        EmbeddedDocumentField = _import_class('EmbeddedDocumentField')
+        embedded_fields = (EmbeddedDocumentField,
+                           _import_class('GenericEmbeddedDocumentField'),
+                           ComplexBaseField)
+        plain_get = _func(BaseField.__get__)
+
+        def is_plain(field):
+            return (hasattr(field, 'db_field') and
+                    _func(type(field).__get__) is plain_get)
+
+        plan = []
+        for name in self._scalar:
+            try:
+                fields = doc_cls._lookup_field(name.split('__'))
+            except LookUpError:
+                return None
+            for field in fields[:-1]:
+                if not isinstance(field, EmbeddedDocumentField):
+                    return None
+            field = fields[-1]
+            if isinstance(field, ComplexBaseField):
+                # Lists and dicts of values that are neither references nor
+                # documents, which could hold references
+                item = field.field
+                if not is_plain(item) or isinstance(item, embedded_fields):
+                    return None
+            elif not is_plain(field):
+                return None
+            plan.append(([f.db_field for f in fields], field))
+        return plan
+
     def _get_scalar(self, doc):
 
         def lookup(obj, name):
@@ -1351,47 +2605,114 @@ class QuerySet(object):
         return tuple(data)
 
     def _get_as_pymongo(self, row):
-        # Extract which fields paths we should follow if .fields(...) was
-        # used. If not, handle all fields.
-        if not getattr(self, '__as_pymongo_fields', None):
-            self.__as_pymongo_fields = []
-            for field in self._loaded_fields.fields - set(['_cls', '_id']):
-                self.__as_pymongo_fields.append(field)
-                while '.' in field:
-                    field, _ = field.rsplit('.', 1)
-                    self.__as_pymongo_fields.append(field)
-
-        all_fields = not self.__as_pymongo_fields
-
-        def clean(data, path=None):
-            path = path or ''
-
+        return self._get_as_pymongo_plan()(row)
+
+    def _get_as_pymongo_plan(self):
+        if self._as_pymongo_plan is None:
+            self._as_pymongo_plan = self._compile_as_pymongo()
+        return self._as_pymongo_plan
+
+    def _compile_as_pymongo(self):
+        """Work out once how :meth:`as_pymongo` converts the rows.  Only
+        the fields loaded with :meth:`only` are kept, and the values are
+        coerced with the fields holding them if `coerce_types` was set.
+        Rows that need neither are returned as they are.
+        """
+        # Keep the paths of the fields loaded with .fields(...) and their
+        # parents.  If none were given, keep all fields.
+        fields = self._loaded_fields.fields - set(['_cls', '_id'])
+        parents = set()
+        for field in fields:
+            while '.' in field:
+                field, _ = field.rsplit('.', 1)
+                parents.add(field)
+        if not fields and not self._as_pymongo_coerce:
+            return _as_is
+        return self._as_pymongo_converter('', fields, parents, self._document)
+
+    def _as_pymongo_converter(self, path, fields, parents, field):
+        """Return the function converting the values at `path` of the rows,
+        held by `field` (the document class at the top), keeping the keys of
+        dicts found at the paths in `fields` and `parents` if any are given.
+
+        The converters of the keys are built when they are first seen and
+        kept for the declared fields and the paths in `fields` and
+        `parents`.  The keys of dict and map fields and of dynamic documents
+        can differ in every row, so their values share one converter.
+        """
+        coerce = self._as_pymongo_coerce
+        EmbeddedDocumentField = _import_class('EmbeddedDocumentField')
+        if isinstance(field, EmbeddedDocumentField):
+            field = field.document_type
+
+        # db field name -> field, for documents and embedded documents
+        declared = {}
+        if hasattr(field, '_fields'):
+            declared = dict((f.db_field, f) for f in field._fields.values())
+        item_field = None
+        to_python = None
+        if isinstance(field, ComplexBaseField):
+            item_field = field.field
+        elif coerce and path and not declared:
+            to_python = getattr(field, 'to_python', None)
+
+        def make(new_path, child_field):
+            if not fields or new_path in fields:
+                if coerce:
+                    return self._as_pymongo_converter(new_path, None, None,
+                                                      child_field)
+                return _as_is
+            return self._as_pymongo_converter(new_path, fields, parents,
+                                              child_field)
+
+        children = {}
+        shared = []
+
+        def child(key):
+            new_path = '%s.%s' % (path, key) if path else key
+            listed = not fields or new_path in fields or new_path in parents
+            if key in declared or (fields and listed):
+                converter = None
+                if listed:
+                    converter = make(new_path,
+                                     declared.get(key, item_field))
+                children[key] = converter
+                return converter
+            if not listed:
+                return None
+            if not shared:
+                shared.append(make(new_path, item_field))
+            return shared[0]
+
+        items = []
+
+        def convert_items(data):
+            # The items of lists are held by the list's field, at its path
+            if item_field is None:
+                return [convert(d) for d in data]
+            if not items:
+                items.append(self._as_pymongo_converter(path, fields,
+                                                        parents, item_field))
+            convert_item = items[0]
+            return [convert_item(d) for d in data]
+
+        def convert(data):
             if isinstance(data, dict):
                 new_data = {}
                 for key, value in data.iteritems():
-                    new_path = '%s.%s' % (path, key) if path else key
-                    if all_fields or new_path in self.__as_pymongo_fields:
-                        new_data[key] = clean(value, path=new_path)
-                data = new_data
+                    converter = children[key] if key in children else \
+                        child(key)
+                    if converter is _as_is:
+                        new_data[key] = value
+                    elif converter is not None:
+                        new_data[key] = converter(value)
+                return new_data
             elif isinstance(data, list):
-                data = [clean(d, path=path) for d in data]
-            else:
-                if self._as_pymongo_coerce:
-                    # If we need to coerce types, we need to determine the
-                    # type of this field and use the corresponding
-                    # .to_python(...)
-                    from mongoengine.fields import EmbeddedDocumentField
-                    obj = self._document
-                    for chunk in path.split('.'):
-                        obj = getattr(obj, chunk, None)
-                        if obj is None:
-                            break
-                        elif isinstance(obj, EmbeddedDocumentField):
-                            obj = obj.document_type
-                    if obj and data is not None:
-                        data = obj.to_python(data)
+                return convert_items(data)
+            elif to_python is not None and data is not None:
+                return to_python(data)
             return data
-        return clean(row)
+        return convert
 
     def _sub_js_fields(self, code):
         """When fields are specified with [~fieldname] syntax, where
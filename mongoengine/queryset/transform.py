@@ -23,67 +23,30 @@ MATCH_OPERATORS      = (COMPARISON_OPERATORS + GEO_OPERATORS +
 UPDATE_OPERATORS     = ('set', 'unset', 'inc', 'dec', 'pop', 'push',
                         'push_all', 'pull', 'pull_all', 'add_to_set')
 
+# Operators comparing a field to a single value
+SINGULAR_OPERATORS   = ((None, 'ne', 'gt', 'gte', 'lt', 'lte', 'not') +
+                        STRING_OPERATORS)
+
+# The maximum number of query and update plans cached for each document
+# class
+QUERY_PLAN_CACHE_SIZE = 1000
+
 
 def query(_doc_cls=None, _field_operation=False, **query):
     """Transform a query from Django-style format to Mongo format.
     """
     mongo_query = {}
     merge_query = defaultdict(list)
-    for key, value in sorted(query.items()):
-        if key == "__raw__":
+    for key, plan in _query_plan(_doc_cls, query):
+        value = query[key]
+        if plan is None:
             mongo_query.update(value)
             continue
 
-        parts = key.split('__')
-        indices = [(i, p) for i, p in enumerate(parts) if p.isdigit()]
-        parts = [part for part in parts if not part.isdigit()]
-        # Check for an operator and transform to mongo-style if there is
-        op = None
-        if parts[-1] in MATCH_OPERATORS:
-            op = parts.pop()
-
-        negate = False
-        if parts[-1] == 'not':
-            parts.pop()
-            negate = True
-
-        if _doc_cls:
-            # Switch field names to proper names [set in Field(name='foo')]
-            try:
-                fields = _doc_cls._lookup_field(parts)
-            except Exception, e:
-                raise InvalidQueryError(e)
-            parts = []
-
-            cleaned_fields = []
-            for field in fields:
-                append_field = True
-                if isinstance(field, basestring):
-                    parts.append(field)
-                    append_field = False
-                else:
-                    parts.append(field.db_field)
-                if append_field:
-                    cleaned_fields.append(field)
-
+        key, op, negate, field = plan
+        if field is not None:
             # Convert value to proper value
-            field = cleaned_fields[-1]
-
-            singular_ops = [None, 'ne', 'gt', 'gte', 'lt', 'lte', 'not']
-            singular_ops += STRING_OPERATORS
-            if op in singular_ops:
-                if isinstance(field, basestring):
-                    if (op in STRING_OPERATORS and
-                       isinstance(value, basestring)):
-                        StringField = _import_class('StringField')
-                        value = StringField.prepare_query_value(op, value)
-                    else:
-                        value = field
-                else:
-                    value = field.prepare_query_value(op, value)
-            elif op in ('in', 'nin', 'all', 'near'):
-                # 'in', 'nin' and 'all' require a list of values
-                value = [field.prepare_query_value(op, v) for v in value]
+            value = _prepare_query_value(field, op, value)
 
         # if op and op not in COMPARISON_OPERATORS:
         if op:
@@ -117,9 +80,6 @@ def query(_doc_cls=None, _field_operation=False, **query):
         if negate:
             value = {'$not': value}
 
-        for i, part in indices:
-            parts.insert(i, part)
-        key = '.'.join(parts)
         if op is None or key not in mongo_query:
             mongo_query[key] = value
         elif key in mongo_query:
@@ -153,91 +113,118 @@ def query(_doc_cls=None, _field_operation=False, **query):
     return mongo_query
 
 
+def _query_plan(_doc_cls, query):
+    """Return the compiled plan of a query: the sorted keys of the query
+    with the mongo key, operator, negation and field of each of them.  The
+    plans are cached on the document class for each set of keys, so that
+    only the values need converting when the same filters are used again.
+    """
+    shape = tuple(sorted(query))
+    if _doc_cls is None:
+        return [(key, _compile_query_key(None, key)) for key in shape]
+
+    plans = _doc_cls._query_plans
+    plan = plans.get(shape)
+    if plan is None:
+        plan = [(key, _compile_query_key(_doc_cls, key)) for key in shape]
+        if len(plans) >= QUERY_PLAN_CACHE_SIZE:
+            plans.clear()
+        plans[shape] = plan
+    return plan
+
+
+def _compile_query_key(_doc_cls, key):
+    """Compile a key of a query to the mongo key, operator, negation and
+    field to prepare the value with, or `None` for raw queries.
+    """
+    if key == "__raw__":
+        return None
+
+    parts = key.split('__')
+    indices = [(i, p) for i, p in enumerate(parts) if p.isdigit()]
+    parts = [part for part in parts if not part.isdigit()]
+    # Check for an operator and transform to mongo-style if there is
+    op = None
+    if parts[-1] in MATCH_OPERATORS:
+        op = parts.pop()
+
+    negate = False
+    if parts[-1] == 'not':
+        parts.pop()
+        negate = True
+
+    field = None
+    if _doc_cls:
+        # Switch field names to proper names [set in Field(name='foo')]
+        try:
+            fields = _doc_cls._lookup_field(parts)
+        except Exception, e:
+            raise InvalidQueryError(e)
+        parts = []
+
+        cleaned_fields = []
+        for field in fields:
+            append_field = True
+            if isinstance(field, basestring):
+                parts.append(field)
+                append_field = False
+            else:
+                parts.append(field.db_field)
+            if append_field:
+                cleaned_fields.append(field)
+
+        field = cleaned_fields[-1]
+
+    for i, part in indices:
+        parts.insert(i, part)
+    return ('.'.join(parts), op, negate, field)
+
+
+def _prepare_query_value(field, op, value):
+    """Convert a query value with the field it is compared to."""
+    if op in SINGULAR_OPERATORS:
+        if isinstance(field, basestring):
+            if (op in STRING_OPERATORS and
+               isinstance(value, basestring)):
+                StringField = _import_class('StringField')
+                value = StringField.prepare_query_value(op, value)
+            else:
+                value = field
+        else:
+            value = field.prepare_query_value(op, value)
+    elif op in ('in', 'nin', 'all', 'near'):
+        # 'in', 'nin' and 'all' require a list of values
+        value = [field.prepare_query_value(op, v) for v in value]
+    return value
+
+
 def update(_doc_cls=None, **update):
     """Transform an update spec from Django-style format to Mongo format.
     """
     mongo_update = {}
-    for key, value in update.items():
-        if key == "__raw__":
+    for key, plan in _update_plan(_doc_cls, update):
+        value = update[key]
+        if plan is None:
             mongo_update.update(value)
             continue
-        parts = key.split('__')
-        # Check for an operator and transform to mongo-style if there is
-        op = None
-        if parts[0] in UPDATE_OPERATORS:
-            op = parts.pop(0)
-            # Convert Pythonic names to Mongo equivalents
-            if op in ('push_all', 'pull_all'):
-                op = op.replace('_all', 'All')
-            elif op == 'dec':
-                # Support decrement by flipping a positive value's sign
-                # and using 'inc'
-                op = 'inc'
-                if value > 0:
-                    value = -value
-            elif op == 'add_to_set':
-                op = op.replace('_to_set', 'ToSet')
-
-        match = None
-        if parts[-1] in COMPARISON_OPERATORS:
-            match = parts.pop()
-
-        if _doc_cls:
-            # Switch field names to proper names [set in Field(name='foo')]
-            try:
-                fields = _doc_cls._lookup_field(parts)
-            except Exception, e:
-                raise InvalidQueryError(e)
-            parts = []
-
-            cleaned_fields = []
-            for field in fields:
-                append_field = True
-                if isinstance(field, basestring):
-                    # Convert the S operator to $
-                    if field == 'S':
-                        field = '$'
-                    parts.append(field)
-                    append_field = False
-                else:
-                    parts.append(field.db_field)
-                if append_field:
-                    cleaned_fields.append(field)
 
+        key, op, negate, match, field, nested = plan
+        if negate and value > 0:
+            # Support decrement by flipping a positive value's sign
+            value = -value
+
+        if field is not None:
             # Convert value to proper value
-            field = cleaned_fields[-1]
-
-            if op in (None, 'set', 'push', 'pull'):
-                if field.required or value is not None:
-                    value = field.prepare_query_value(op, value)
-            elif op in ('pushAll', 'pullAll'):
-                value = [field.prepare_query_value(op, v) for v in value]
-            elif op == 'addToSet':
-                if isinstance(value, (list, tuple, set)):
-                    value = [field.prepare_query_value(op, v) for v in value]
-                elif field.required or value is not None:
-                    value = field.prepare_query_value(op, value)
+            value = _prepare_update_value(field, op, value)
 
         if match:
-            match = '$' + match
             value = {match: value}
 
-        key = '.'.join(parts)
-
-        if not op:
-            raise InvalidQueryError("Updates must supply an operation "
-                                    "eg: set__FIELD=value")
-
-        if 'pull' in op and '.' in key:
+        if nested:
             # Dot operators don't work on pull operations
             # it uses nested dict syntax
-            if op == 'pullAll':
-                raise InvalidQueryError("pullAll operations only support "
-                                        "a single field depth")
-
-            parts.reverse()
-            for key in parts:
-                value = {key: value}
+            for part in nested:
+                value = {part: value}
         elif op == 'addToSet' and isinstance(value, list):
             value = {key: {"$each": value}}
         else:
@@ -250,3 +237,106 @@ def update(_doc_cls=None, **update):
             mongo_update[key].update(value)
 
     return mongo_update
+
+
+def _update_plan(_doc_cls, update):
+    """Return the compiled plan of an update, cached on the document class
+    for each set of keys like the plans of :func:`query`.
+    """
+    shape = tuple(sorted(update))
+    if _doc_cls is None:
+        return [(key, _compile_update_key(None, key)) for key in shape]
+
+    plans = _doc_cls._update_plans
+    plan = plans.get(shape)
+    if plan is None:
+        plan = [(key, _compile_update_key(_doc_cls, key)) for key in shape]
+        if len(plans) >= QUERY_PLAN_CACHE_SIZE:
+            plans.clear()
+        plans[shape] = plan
+    return plan
+
+
+def _compile_update_key(_doc_cls, key):
+    """Compile a key of an update to the mongo key, operator, whether to
+    negate the value, comparison operator, field to prepare the value with
+    and the parts of nested pull operations, or `None` for raw updates.
+    """
+    if key == "__raw__":
+        return None
+
+    parts = key.split('__')
+    # Check for an operator and transform to mongo-style if there is
+    op = None
+    negate = False
+    if parts[0] in UPDATE_OPERATORS:
+        op = parts.pop(0)
+        # Convert Pythonic names to Mongo equivalents
+        if op in ('push_all', 'pull_all'):
+            op = op.replace('_all', 'All')
+        elif op == 'dec':
+            # Support decrement by flipping a positive value's sign
+            # and using 'inc'
+            op = 'inc'
+            negate = True
+        elif op == 'add_to_set':
+            op = op.replace('_to_set', 'ToSet')
+
+    match = None
+    if parts[-1] in COMPARISON_OPERATORS:
+        match = '$' + parts.pop()
+
+    field = None
+    if _doc_cls:
+        # Switch field names to proper names [set in Field(name='foo')]
+        try:
+            fields = _doc_cls._lookup_field(parts)
+        except Exception, e:
+            raise InvalidQueryError(e)
+        parts = []
+
+        cleaned_fields = []
+        for field in fields:
+            append_field = True
+            if isinstance(field, basestring):
+                # Convert the S operator to $
+                if field == 'S':
+                    field = '$'
+                parts.append(field)
+                append_field = False
+            else:
+                parts.append(field.db_field)
+            if append_field:
+                cleaned_fields.append(field)
+
+        field = cleaned_fields[-1]
+
+    key = '.'.join(parts)
+
+    if not op:
+        raise InvalidQueryError("Updates must supply an operation "
+                                "eg: set__FIELD=value")
+
+    nested = None
+    if 'pull' in op and '.' in key:
+        if op == 'pullAll':
+            raise InvalidQueryError("pullAll operations only support "
+                                    "a single field depth")
+        nested = parts[::-1]
+
+    return (key, op, negate, match, field, nested)
+
+
+def _prepare_update_value(field, op, value):
+    """Convert an update value with the field it is set on."""
+    if op in (None, 'set', 'push', 'pull'):
+        if field.required or value is not None:
+            value = field.prepare_query_value(op, value)
+    elif op in ('pushAll', 'pullAll'):
+        value = [field.prepare_query_value(op, v) for v in value]
+    elif op == 'addToSet':
+        if isinstance(value, (list, tuple, set)):
+            value = [field.prepare_query_value(op, v) for v in value]
+        elif field.required or value is not None:
+            value = field.prepare_query_value(op, value)
+    return value
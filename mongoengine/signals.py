@@ -1,12 +1,78 @@
 # -*- coding: utf-8 -*-
 
 __all__ = ['pre_init', 'post_init', 'pre_save', 'post_save',
-           'pre_delete', 'post_delete']
+           'pre_delete', 'post_delete', 'pre_bulk_insert', 'post_bulk_insert',
+           'pre_bulk_update', 'post_bulk_update', 'pre_bulk_delete',
+           'post_bulk_delete']
 
 signals_available = False
 try:
-    from blinker import Namespace
+    from blinker import NamedSignal
     signals_available = True
+
+    class Namespace(dict):
+        def signal(self, name, doc=None):
+            try:
+                return self[name]
+            except KeyError:
+                return self.setdefault(name, _Signal(name, doc))
+
+    class _Signal(NamedSignal):
+        """A signal remembering whether each sender has receivers, so
+        sending to a document class nobody listens to costs a dict lookup.
+        The flags are reset whenever a receiver is connected or
+        disconnected.
+        """
+
+        def __init__(self, name, doc=None):
+            super(_Signal, self).__init__(name, doc)
+            self._has_receivers = {}
+
+        def has_receivers_for(self, sender):
+            """True if there are live receivers connected to `sender` or to
+            any sender.
+            """
+            sender_id = id(sender)
+            try:
+                return self._has_receivers[sender_id]
+            except KeyError:
+                pass
+            has_receivers = False
+            for receiver in self.receivers_for(sender):
+                has_receivers = True
+                break
+            self._has_receivers[sender_id] = has_receivers
+            return has_receivers
+
+        def send(self, *sender, **kwargs):
+            if len(sender) == 1 and not self.has_receivers_for(sender[0]):
+                return []
+            return super(_Signal, self).send(*sender, **kwargs)
+
+        def connect(self, *args, **kwargs):
+            try:
+                return super(_Signal, self).connect(*args, **kwargs)
+            finally:
+                self._has_receivers.clear()
+
+        def disconnect(self, *args, **kwargs):
+            try:
+                return super(_Signal, self).disconnect(*args, **kwargs)
+            finally:
+                self._has_receivers.clear()
+
+        def _cleanup_receiver(self, *args, **kwargs):
+            try:
+                return super(_Signal, self)._cleanup_receiver(*args, **kwargs)
+            finally:
+                self._has_receivers.clear()
+
+        def _cleanup_sender(self, *args, **kwargs):
+            try:
+                return super(_Signal, self)._cleanup_sender(*args, **kwargs)
+            finally:
+                self._has_receivers.clear()
+
 except ImportError:
     class Namespace(object):
         def signal(self, name, doc=None):
@@ -28,8 +94,9 @@ except ImportError:
                                'because the blinker library is '
                                'not installed.')
         send = lambda *a, **kw: None
-        connect = disconnect = has_receivers_for = receivers_for = \
-            temporarily_connected_to = _fail
+        has_receivers_for = lambda *a, **kw: False
+        connect = disconnect = receivers_for = temporarily_connected_to = \
+            _fail
         del _fail
 
 # the namespace for code signals.  If you are not mongoengine code, do
@@ -44,3 +111,7 @@ pre_delete = _signals.signal('pre_delete')
 post_delete = _signals.signal('post_delete')
 pre_bulk_insert = _signals.signal('pre_bulk_insert')
 post_bulk_insert = _signals.signal('post_bulk_insert')
+pre_bulk_update = _signals.signal('pre_bulk_update')
+post_bulk_update = _signals.signal('post_bulk_update')
+pre_bulk_delete = _signals.signal('pre_bulk_delete')
+post_bulk_delete = _signals.signal('post_bulk_delete')
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from __future__ import with_statement
+import sys
+sys.path[0:0] = [""]
+import unittest
+
+from mongoengine import *
+from mongoengine.context_managers import query_counter
+
+__all__ = ("DocumentCacheTest", )
+
+
+class DocumentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        connect(db='mongoenginetest')
+
+    def test_document_cache(self):
+        """Ensure documents are read through the cache and invalidated
+        when they change.
+        """
+        class Setting(Document):
+            name = StringField()
+            meta = {'cache': {'max_entries': 2, 'ttl': 60}}
+
+        class Page(Document):
+            setting = ReferenceField(Setting)
+
+        Setting.drop_collection()
+        Page.drop_collection()
+
+        settings = [Setting(name="Setting %s" % i).save() for i in xrange(3)]
+        Page(setting=settings[0]).save()
+        cache = Setting._document_cache
+
+        with query_counter() as q:
+            setting = Setting.objects.with_id(settings[0].id)
+            self.assertEqual(q, 1)
+            self.assertEqual(Setting.objects.get(pk=settings[0].id).name,
+                             "Setting 0")
+            self.assertFalse(Setting.objects.with_id(settings[0].id)
+                             is setting)
+            self.assertEqual(Page.objects.first().setting.name, "Setting 0")
+            self.assertEqual(q, 2)
+        self.assertEqual(cache.stats(),
+                         {'hits': 3, 'misses': 1, 'entries': 1})
+
+        # Least recently used documents are evicted
+        Setting.objects.in_bulk([s.id for s in settings])
+        self.assertEqual(len(cache), 2)
+
+        setting.name = "Changed"
+        setting.save()
+        self.assertEqual(Setting.objects.with_id(setting.id).name, "Changed")
+
+        Setting.objects(id=setting.id).update(set__name="Updated")
+        self.assertEqual(Setting.objects.with_id(setting.id).name, "Updated")
+
+        Setting.objects(id=setting.id).delete()
+        self.assertEqual(Setting.objects.with_id(setting.id), None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -685,6 +685,170 @@ class DeltaTest(unittest.TestCase):
         self.assertEqual(doc._get_changed_fields(), ['list_field'])
         self.assertEqual(doc._delta(), ({}, {'list_field': 1}))
 
+    def test_delta_tracks_embedded_paths(self):
+        """Ensure changes deep in embedded documents are reported to the
+        document with their full path as they happen.
+        """
+        class Comment(EmbeddedDocument):
+            text = StringField(db_field='t')
+
+        class Post(EmbeddedDocument):
+            comments = ListField(EmbeddedDocumentField(Comment))
+
+        class Blog(Document):
+            posts = ListField(EmbeddedDocumentField(Post), db_field='p')
+
+        Blog.drop_collection()
+        comments = [Comment(text=str(i)) for i in xrange(100)]
+        Blog(posts=[Post(comments=comments)]).save()
+
+        blog = Blog.objects.first()
+        blog.posts[0].comments[42].text = 'changed'
+        self.assertEqual(blog._changed_fields, ['p.0.comments.42.t'])
+        self.assertEqual(blog._delta(),
+                         ({'p.0.comments.42.t': 'changed'}, {}))
+
+        # Paths follow the embedded documents when the list is reordered
+        comment = blog.posts[0].comments.pop(0)
+        comment.text = 'removed'
+        blog.posts[0].comments[41].text = 'moved'
+        self.assertEqual(blog._get_changed_fields(), ['p.0.comments'])
+        self.assertEqual(blog._changed_fields[-1], 'p.0.comments.41.t')
+
+        blog.save()
+        self.assertEqual(blog._get_changed_fields(), [])
+        self.assertEqual(blog.posts[0].comments[41]._changed_fields, [])
+
+        blog = Blog.objects.first()
+        self.assertEqual(len(blog.posts[0].comments), 99)
+        self.assertEqual(blog.posts[0].comments[41].text, 'moved')
+
+    def test_delta_tracks_plain_containers(self):
+        """Ensure embedded documents in plain lists and dicts assigned to a
+        document report their changes to it.
+        """
+        class Comment(EmbeddedDocument):
+            body = StringField()
+
+        class Post(Document):
+            comments = ListField(EmbeddedDocumentField(Comment))
+            mapping = MapField(EmbeddedDocumentField(Comment))
+
+        Post.drop_collection()
+        comment, other = Comment(body='a'), Comment(body='b')
+        post = Post(comments=[comment], mapping={'k': other})
+        post.save()
+
+        comment.body = 'c'
+        other.body = 'd'
+        self.assertEqual(post._get_changed_fields(),
+                         ['comments.0.body', 'mapping.k.body'])
+        self.assertEqual(post._delta(), ({'comments.0.body': 'c',
+                                          'mapping.k.body': 'd'}, {}))
+        post.save()
+
+        post = Post.objects.first()
+        comment = Comment(body='e')
+        post.comments = [comment]
+        post.save()
+        comment.body = 'f'
+        self.assertEqual(post._delta(), ({'comments.0.body': 'f'}, {}))
+        post.save()
+
+        post = Post.objects.first()
+        self.assertEqual(post.comments[0].body, 'f')
+        self.assertEqual(post.mapping['k'].body, 'd')
+
+    def test_delta_ignores_removed_embedded_documents(self):
+        """Ensure embedded documents taken out of a document no longer
+        report their changes to it.
+        """
+        class Comment(EmbeddedDocument):
+            body = StringField()
+
+        class Post(Document):
+            comments = ListField(EmbeddedDocumentField(Comment))
+            mapping = MapField(EmbeddedDocumentField(Comment))
+            comment = EmbeddedDocumentField(Comment)
+
+        Post.drop_collection()
+        Post(comments=[Comment(body=str(i)) for i in xrange(6)],
+             mapping={'a': Comment(body='a'), 'b': Comment(body='b')},
+             comment=Comment(body='c')).save()
+        post = Post.objects.first()
+
+        popped = post.comments.pop(0)
+        post.save()
+        popped.body = 'x'
+        self.assertEqual(post._delta(), ({}, {}))
+
+        removed = post.comments[1]
+        post.comments.remove(removed)
+        post.save()
+        removed.body = 'x'
+        self.assertEqual(post._delta(), ({}, {}))
+
+        sliced = post.comments[1:3]
+        post.comments[1:3] = [Comment(body='new')]
+        post.save()
+        for comment in sliced:
+            comment.body = 'x'
+        self.assertEqual(post._delta(), ({}, {}))
+
+        dropped = post.comments[1]
+        post.comments = [post.comments[0]]
+        post.save()
+        dropped.body = 'x'
+        self.assertEqual(post._delta(), ({}, {}))
+        post.comments[0].body = 'kept'
+        self.assertEqual(post._delta(), ({'comments.0.body': 'kept'}, {}))
+        post.save()
+
+        popped = post.mapping.pop('a')
+        replaced = post.mapping['b']
+        post.mapping['b'] = Comment(body='d')
+        replaced_comment = post.comment
+        post.comment = Comment(body='e')
+        post.save()
+        for comment in (popped, replaced, replaced_comment):
+            comment.body = 'x'
+        self.assertEqual(post._delta(), ({}, {}))
+
+        post = Post.objects.first()
+        self.assertEqual([c.body for c in post.comments], ['kept'])
+        self.assertEqual(post.mapping.keys(), ['b'])
+        self.assertEqual(post.mapping['b'].body, 'd')
+        self.assertEqual(post.comment.body, 'e')
+
+    def test_delta_converts_changed_paths_only(self):
+        """Ensure saving an existing document only converts its changes.
+        """
+        class Doc(Document):
+            name = StringField()
+            count = IntField()
+            tags = ListField(StringField())
+
+        Doc.drop_collection()
+        Doc(name='test', count=1, tags=['a']).save()
+
+        doc = Doc.objects.first()
+
+        def to_mongo():
+            self.fail('The whole document was converted')
+        doc.to_mongo = to_mongo
+
+        doc.count = 2
+        doc.tags.append('b')
+        doc.name = None
+        self.assertEqual(doc._delta(), ({'count': 2, 'tags': ['a', 'b']},
+                                        {'name': 1}))
+        doc.save()
+
+        doc = Doc.objects.first()
+        self.assertEqual(doc.count, 2)
+        self.assertEqual(doc.tags, ['a', 'b'])
+        self.assertEqual(doc.name, None)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,7 +17,7 @@ from mongoengine.errors import (NotRegistered, InvalidDocumentError,
                                 InvalidQueryError)
 from mongoengine.queryset import NULLIFY, Q
 from mongoengine.connection import get_db
-from mongoengine.base import get_document
+from mongoengine.base import BaseDocument, get_document
 from mongoengine.context_managers import switch_db, query_counter
 from mongoengine import signals
 
@@ -443,6 +443,33 @@ class InstanceTest(unittest.TestCase):
         self.assertEqual(Employee(name="Bob", age=35, salary=0).to_mongo().keys(),
                          ['_cls', 'name', 'age', 'salary'])
 
+    def test_to_mongo_conversions(self):
+        """Ensure the compiled serializer converts values like the fields'
+        to_mongo.
+        """
+        class Comment(EmbeddedDocument):
+            text = StringField(db_field='t')
+
+        class Post(Document):
+            title = StringField(primary_key=True)
+            views = IntField()
+            ratio = FloatField()
+            tags = ListField(StringField())
+            scores = ListField(IntField())
+            comments = ListField(EmbeddedDocumentField(Comment))
+
+        post = Post(title='Hello', views='3', ratio=1, tags=('a', u'b'),
+                    scores=[1, '2'], comments=[Comment(text='Hi')])
+        son = post.to_mongo()
+        self.assertEqual(son.keys(), ['_id', 'views', 'ratio', 'tags',
+                                      'scores', 'comments'])
+        self.assertEqual(son['_id'], u'Hello')
+        self.assertEqual(son['views'], 3)
+        self.assertTrue(isinstance(son['ratio'], float))
+        self.assertEqual(son['tags'], [u'a', u'b'])
+        self.assertEqual(son['scores'], [1, 2])
+        self.assertEqual(son['comments'], [{'t': u'Hi'}])
+
     def test_embedded_document(self):
         """Ensure that embedded documents are set up correctly.
         """
@@ -1372,6 +1399,102 @@ class InstanceTest(unittest.TestCase):
 
         self.assertRaises(InvalidDocumentError, raise_invalid_document)
 
+    def test_from_son_matches_constructor(self):
+        """Ensure the compiled SON loader builds the same document as the
+        constructor based one.
+        """
+        class Comment(EmbeddedDocument):
+            body = StringField()
+            votes = IntField(default=0)
+
+        class BlogPost(Document):
+            title = StringField(db_field='t')
+            views = IntField(default=1)
+            tags = ListField(StringField())
+            info = DictField()
+            comments = ListField(EmbeddedDocumentField(Comment))
+            status = StringField(choices=(('D', 'Draft'), ('P', 'Published')))
+            created = ComplexDateTimeField()
+            meta = {'allow_inheritance': True}
+
+        class Article(BlogPost):
+            summary = StringField()
+
+        son = {'_id': bson.ObjectId(), '_cls': 'BlogPost.Article',
+               't': u'Hello', 'tags': [u'a', u'b'], 'status': u'P',
+               'comments': [{'body': u'First', 'votes': 2}],
+               'summary': u'Summary', 'created': '2013,04,01,10,05,02,000001',
+               'extra': 5}
+
+        fast = BlogPost._from_son(son)
+        slow = Article._from_son_via_init(son)
+
+        self.assertTrue(isinstance(fast, Article))
+        self.assertEqual(fast.to_mongo(), slow.to_mongo())
+        self.assertEqual(sorted(fast._data), sorted(slow._data))
+        self.assertEqual(fast._changed_fields, [])
+        self.assertFalse(fast._created)
+        self.assertEqual(fast.views, 1)
+        self.assertEqual(fast.get_status_display(), 'Published')
+        self.assertEqual(fast.comments[0].votes, 2)
+        self.assertEqual(fast.created, slow.created)
+
+        fast.title = 'Changed'
+        self.assertEqual(fast._delta(), ({'t': 'Changed'}, {}))
+
+    def test_from_son_custom_init(self):
+        """Ensure documents with a custom __init__ are still loaded through
+        the constructor.
+        """
+        class Person(Document):
+            name = StringField()
+
+            def __init__(self, *args, **kwargs):
+                super(Person, self).__init__(*args, **kwargs)
+                self.loaded = True
+
+        self.assertEqual(Person._son_loader, None)
+        person = Person._from_son({'_id': bson.ObjectId(), 'name': u'Ross'})
+        self.assertTrue(person.loaded)
+        self.assertEqual(person.name, 'Ross')
+
+    def test_compiled_setattr(self):
+        """Ensure documents without a shard key or dynamic fields get a
+        simpler __setattr__ that still behaves the same.
+        """
+        class Person(Document):
+            name = StringField()
+
+        class Sharded(Document):
+            name = StringField()
+            meta = {'shard_key': ('name',)}
+
+        class Custom(Document):
+            name = StringField()
+
+            def __setattr__(self, name, value):
+                super(Custom, self).__setattr__(name, value)
+
+        self.assertTrue(Person._compiled_setattr)
+        self.assertTrue(Sharded.__dict__['__setattr__'] is
+                        BaseDocument.__dict__['__setattr__'])
+        self.assertFalse('_compiled_setattr' in Custom.__dict__)
+
+        Person.drop_collection()
+        person = Person(name='Ross').save()
+        person.name = 'Rachel'
+        self.assertEqual(person._get_changed_fields(), ['name'])
+        self.assertFalse(person._created)
+
+        person = Person(name='Joey')
+        self.assertTrue(person._created)
+        person.id = bson.ObjectId()
+        self.assertFalse(person._created)
+
+        Sharded.drop_collection()
+        sharded = Sharded(name='Ross').save()
+        self.assertRaises(OperationError, setattr, sharded, 'name', 'Joey')
+
     def test_reverse_delete_rule_cascade_and_nullify(self):
         """Ensure that a referenced document is also deleted upon deletion.
         """
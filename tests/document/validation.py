@@ -141,6 +141,38 @@ class ValidatorErrorTest(unittest.TestCase):
             self.assertEqual(e.to_dict(), {
                 "e": {'val': 'OK could not be converted to int'}})
 
+    def test_validate_changed(self):
+        """Ensure save(validate='changed') only validates the changed fields.
+        """
+        class SubDoc(EmbeddedDocument):
+            val = IntField(min_value=0)
+
+        class Doc(Document):
+            name = StringField(max_length=5)
+            size = StringField(choices=('S', 'M'))
+            subs = ListField(EmbeddedDocumentField(SubDoc))
+
+        Doc.drop_collection()
+        Doc(name='test', subs=[SubDoc(val=1), SubDoc(val=2)]).save()
+
+        doc = Doc.objects.first()
+        doc._data['name'] = 'too long'
+        doc.subs[1].val = -1
+        try:
+            doc.save(validate='changed')
+            self.fail('ValidationError not raised')
+        except ValidationError, e:
+            self.assertEqual(e.to_dict(), {
+                'subs': {1: {'val': 'Integer value is too small'}}})
+
+        doc.subs[1].val = 3
+        doc.save(validate='changed')
+        self.assertRaises(ValidationError, doc.validate)
+        self.assertEqual(Doc.objects.first().subs[1].val, 3)
+
+        doc.size = 'L'
+        self.assertRaises(ValidationError, doc.save, validate='changed')
+
 
 if __name__ == '__main__':
     unittest.main()
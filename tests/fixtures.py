@@ -21,3 +21,16 @@ class Mixin(object):
 
 class Base(Document):
     meta = {'allow_inheritance': True}
+
+
+class ParallelPerson(Document):
+    name = StringField()
+    age = IntField()
+
+
+def count_partition(queryset):
+    return queryset.count()
+
+
+def partition_names(queryset):
+    return list(queryset.scalar('name'))
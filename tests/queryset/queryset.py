@@ -15,14 +15,19 @@ from pymongo.read_preferences import ReadPreference
 from bson import ObjectId
 
 from mongoengine import *
+from mongoengine import signals
+from mongoengine.base import BaseList, ReadOnlyDocument
 from mongoengine.connection import get_connection
 from mongoengine.python_support import PY3
-from mongoengine.context_managers import query_counter
+from mongoengine.context_managers import (query_counter, switch_db,
+                                          switch_collection)
 from mongoengine.queryset import (QuerySet, QuerySetManager,
                                   MultipleObjectsReturned, DoesNotExist,
                                   queryset_manager)
 from mongoengine.errors import InvalidQueryError
 
+from tests.fixtures import ParallelPerson, count_partition, partition_names
+
 __all__ = ("QuerySetTest",)
 
 
@@ -524,6 +529,38 @@ class QuerySetTest(unittest.TestCase):
         self.assertEqual(club.members['John']['gender'], "F")
         self.assertEqual(club.members['John']['age'], 14)
 
+    def test_prepare_update(self):
+        """Ensure prepared updates can be executed with new values and
+        filters.
+        """
+        class Page(Document):
+            name = StringField()
+            views = IntField(default=0)
+            tags = ListField(StringField())
+
+        Page.drop_collection()
+        home = Page(name="home").save()
+        about = Page(name="about").save()
+
+        hit = Page.objects.prepare_update(inc__views=1, push__tags=None)
+        self.assertEqual(hit.execute(Q(name="home"), push__tags="a"), 1)
+        self.assertEqual(hit.execute(Q(pk=home.pk), push__tags="b"), 1)
+        self.assertEqual(hit.execute(push__tags="c"), 2)
+
+        home.reload()
+        self.assertEqual(home.views, 3)
+        self.assertEqual(home.tags, ["a", "b", "c"])
+        self.assertEqual(about.reload().views, 1)
+
+        hit = Page.objects(name="about").prepare_update(dec__views=1)
+        hit.execute()
+        self.assertEqual(about.reload().views, 0)
+
+        self.assertRaises(InvalidQueryError, hit.execute, inc__views=1)
+        self.assertRaises(InvalidQueryError, Page.objects.prepare_update,
+                          set__title="Home")
+        self.assertRaises(OperationError, Page.objects.prepare_update)
+
     def test_get_or_create(self):
         """Ensure that ``get_or_create`` returns one result or creates a new
         document.
@@ -668,6 +705,105 @@ class QuerySetTest(unittest.TestCase):
                             'continue_on_error': True})
         self.assertEqual(Blog.objects.count(), 3)
 
+    def test_bulk_write(self):
+        """Ensure mixed operations are sent together and their results
+        reported per operation.
+        """
+        class User(Document):
+            name = StringField(unique=True)
+            age = IntField()
+
+        User.drop_collection()
+        User.objects.insert([User(name="Bob", age=1), User(name="Ann")])
+
+        new_user = User(name="Ross")
+        result = User.objects.bulk_write([
+            BulkInsert(new_user),
+            BulkInsert(User(name="Bob")),
+            BulkUpdate(Q(name="Bob"), set__age=30),
+            BulkUpdate(Q(name="Zed"), upsert=True, multi=False, set__age=5),
+            BulkDelete(Q(name="Ann")),
+        ], batch_size=2)
+
+        self.assertEqual(result.n_inserted, 1)
+        self.assertEqual(result.n_matched, 1)
+        self.assertEqual(result.n_upserted, 1)
+        self.assertEqual(result.n_removed, 1)
+        self.assertEqual(result.inserted_ids, {0: new_user.pk})
+        self.assertEqual(result.upserted_ids.keys(), [3])
+        self.assertEqual([e['index'] for e in result.errors], [1])
+
+        self.assertEqual(User.objects.get(name="Bob").age, 30)
+        self.assertEqual(User.objects.get(name="Zed").age, 5)
+        self.assertEqual(User.objects(name="Ann").count(), 0)
+
+        # Ordered writes stop at the first error
+        result = User.objects.bulk_write([BulkInsert(User(name="Bob")),
+                                          BulkInsert(User(name="Tom"))],
+                                         ordered=True, batch_size=1)
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(User.objects(name="Tom").count(), 0)
+
+    def test_save_all(self):
+        """Ensure changed documents are saved in batches and marked as
+        saved.
+        """
+        class User(Document):
+            name = StringField(unique=True)
+            age = IntField()
+
+        User.drop_collection()
+        User.objects.insert([User(name="User %s" % i, age=i)
+                             for i in xrange(4)])
+
+        users = list(User.objects.order_by('age'))
+        for user in users[:3]:
+            user.age = 100
+        users[3].name = "Renamed"
+        new_user = User(name="New")
+
+        with query_counter() as q:
+            User.objects.save_all(users + [new_user])
+            # One insert and one update for each distinct change
+            self.assertEqual(q, 3)
+
+        self.assertEqual(User.objects(age=100).count(), 3)
+        self.assertEqual(User.objects.get(age=3).name, "Renamed")
+        self.assertTrue(new_user.pk)
+        self.assertEqual(users[0]._get_changed_fields(), [])
+
+        users[0].name = "Renamed"
+        self.assertRaises(NotUniqueError, User.objects.save_all, users)
+        self.assertEqual(users[0]._get_changed_fields(), ['name'])
+
+    def test_insert_stream(self):
+        """Ensure documents are inserted in chunks and get their ids
+        without being read back.
+        """
+        class User(Document):
+            name = StringField(unique=True)
+
+        User.drop_collection()
+
+        users = [User(name="User %s" % i) for i in xrange(5)]
+        users[3].name = "User 0"
+
+        stats = User.objects.insert_stream(iter(users), chunk_size=2,
+                                           continue_on_error=True)
+
+        self.assertEqual([(s['sent'], s['inserted']) for s in stats],
+                         [(2, 2), (2, 1), (1, 1)])
+        self.assertEqual(stats[1]['errors'][0]['index'], 3)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(users[3].pk, None)
+        self.assertEqual(User.objects.get(name="User 4").pk, users[4].pk)
+
+        # Inserts stop at the first error by default
+        stats = User.objects.insert_stream([User(name="User 0"),
+                                            User(name="User 5")])
+        self.assertEqual(stats[0]['inserted'], 0)
+        self.assertEqual(User.objects.count(), 4)
+
     def test_get_changed_fields_query_count(self):
 
         class Person(Document):
@@ -783,6 +919,87 @@ class QuerySetTest(unittest.TestCase):
         self.assertEqual(people1, people2)
         self.assertEqual(people1, people3)
 
+    def test_iterate_past_chunk_size(self):
+        """Ensure iterating converts results in chunks without losing or
+        repeating any.
+        """
+        from mongoengine.queryset.queryset import ITER_CHUNK_SIZE
+        total = ITER_CHUNK_SIZE + 5
+        self.Person.objects.insert([self.Person(name="User", age=i)
+                                    for i in xrange(total)])
+
+        people = self.Person.objects.order_by('age')
+        self.assertEqual([p.age for p in people], range(total))
+
+        self.assertEqual(people.next().age, 0)
+        people.rewind()
+        self.assertEqual(people.next().age, 0)
+        self.assertEqual(len([p for p in people]), total)
+
+    def test_iterate_converts_returned_results(self):
+        """Ensure iterating only converts the results that are returned.
+        """
+        self.Person.objects.insert([self.Person(name="User", age=i)
+                                    for i in xrange(10)])
+
+        loaded = []
+
+        def on_init(sender, document, **kwargs):
+            loaded.append(document.age)
+
+        signals.post_init.connect(on_init, sender=self.Person)
+        try:
+            people = self.Person.objects.order_by('age')
+            self.assertEqual(people.next().age, 0)
+            self.assertEqual(loaded, [0])
+            self.assertEqual(people.next().age, 1)
+            self.assertEqual(loaded, [0, 1])
+            self.assertEqual(people.first().age, 0)
+            self.assertEqual(loaded, [0, 1, 0])
+        finally:
+            signals.post_init.disconnect(on_init, sender=self.Person)
+
+    def test_iter_batches(self):
+        """Ensure results can be iterated over in batches.
+        """
+        for i in xrange(25):
+            self.Person(name="User %s" % i, age=i).save()
+
+        people = self.Person.objects.order_by('age')
+        batches = list(people.iter_batches(10))
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+        self.assertEqual([p.age for b in batches for p in b], range(25))
+        self.assertTrue(isinstance(batches[0][0], self.Person))
+
+        batches = list(people.scalar('age').iter_batches(20))
+        self.assertEqual(batches, [range(20), range(20, 25)])
+
+        batches = list(people.limit(3).as_pymongo().iter_batches(2))
+        self.assertEqual([[p['age'] for p in b] for b in batches],
+                         [[0, 1], [2]])
+
+        self.assertEqual(list(people.none().iter_batches()), [])
+
+    def test_iter_batches_select_related(self):
+        """Ensure the references of each batch are fetched with a single
+        query.
+        """
+        class BlogPost(Document):
+            author = ReferenceField(self.Person)
+
+        BlogPost.drop_collection()
+
+        for i in xrange(10):
+            author = self.Person(name="Author %s" % i).save()
+            BlogPost(author=author).save()
+
+        with query_counter() as q:
+            for batch in BlogPost.objects.iter_batches(20,
+                                                       select_related=True):
+                self.assertEqual(len(batch), 10)
+                [post.author.name for post in batch]
+            self.assertEqual(q, 2)
+
     def test_repr(self):
         """Test repr behavior isnt destructive"""
 
@@ -1870,10 +2087,12 @@ class QuerySetTest(unittest.TestCase):
             self.assertEqual(f['watch'], 2)
             self.assertEqual(f['film'], 1)
 
-        exec_js = BlogPost.objects.item_frequencies('tags')
+        aggregate = BlogPost.objects.item_frequencies('tags')
         map_reduce = BlogPost.objects.item_frequencies('tags', map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = BlogPost.objects.item_frequencies('tags', map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
         # Ensure query is taken into account
         def test_assertions(f):
@@ -1883,10 +2102,12 @@ class QuerySetTest(unittest.TestCase):
             self.assertEqual(f['actors'], 1)
             self.assertEqual(f['watch'], 1)
 
-        exec_js = BlogPost.objects(hits__gt=1).item_frequencies('tags')
+        aggregate = BlogPost.objects(hits__gt=1).item_frequencies('tags')
         map_reduce = BlogPost.objects(hits__gt=1).item_frequencies('tags', map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = BlogPost.objects(hits__gt=1).item_frequencies('tags', map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
         # Check that normalization works
         def test_assertions(f):
@@ -1895,10 +2116,12 @@ class QuerySetTest(unittest.TestCase):
             self.assertAlmostEqual(f['watch'], 2.0/8.0)
             self.assertAlmostEqual(f['film'], 1.0/8.0)
 
-        exec_js = BlogPost.objects.item_frequencies('tags', normalize=True)
+        aggregate = BlogPost.objects.item_frequencies('tags', normalize=True)
         map_reduce = BlogPost.objects.item_frequencies('tags', normalize=True, map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = BlogPost.objects.item_frequencies('tags', normalize=True, map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
         # Check item_frequencies works for non-list fields
         def test_assertions(f):
@@ -1906,10 +2129,12 @@ class QuerySetTest(unittest.TestCase):
             self.assertEqual(f[1], 1)
             self.assertEqual(f[2], 2)
 
-        exec_js = BlogPost.objects.item_frequencies('hits')
+        aggregate = BlogPost.objects.item_frequencies('hits')
         map_reduce = BlogPost.objects.item_frequencies('hits', map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = BlogPost.objects.item_frequencies('hits', map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
         BlogPost.drop_collection()
 
@@ -1945,10 +2170,12 @@ class QuerySetTest(unittest.TestCase):
             self.assertEqual(f['62-3331-1656'], 2)
             self.assertEqual(f['62-3332-1656'], 1)
 
-        exec_js = Person.objects.item_frequencies('phone.number')
+        aggregate = Person.objects.item_frequencies('phone.number')
         map_reduce = Person.objects.item_frequencies('phone.number', map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = Person.objects.item_frequencies('phone.number', map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
         # Ensure query is taken into account
         def test_assertions(f):
@@ -1956,20 +2183,24 @@ class QuerySetTest(unittest.TestCase):
             self.assertEqual(set(['62-3331-1656']), set(f.keys()))
             self.assertEqual(f['62-3331-1656'], 2)
 
-        exec_js = Person.objects(phone__number='62-3331-1656').item_frequencies('phone.number')
+        aggregate = Person.objects(phone__number='62-3331-1656').item_frequencies('phone.number')
         map_reduce = Person.objects(phone__number='62-3331-1656').item_frequencies('phone.number', map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = Person.objects(phone__number='62-3331-1656').item_frequencies('phone.number', map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
         # Check that normalization works
         def test_assertions(f):
             self.assertEqual(f['62-3331-1656'], 2.0/3.0)
             self.assertEqual(f['62-3332-1656'], 1.0/3.0)
 
-        exec_js = Person.objects.item_frequencies('phone.number', normalize=True)
+        aggregate = Person.objects.item_frequencies('phone.number', normalize=True)
         map_reduce = Person.objects.item_frequencies('phone.number', normalize=True, map_reduce=True)
-        test_assertions(exec_js)
+        exec_js = Person.objects.item_frequencies('phone.number', normalize=True, map_reduce=False)
+        test_assertions(aggregate)
         test_assertions(map_reduce)
+        test_assertions(exec_js)
 
     def test_item_frequencies_null_values(self):
 
@@ -1993,6 +2224,11 @@ class QuerySetTest(unittest.TestCase):
         freq = Person.objects.item_frequencies('city', normalize=True, map_reduce=True)
         self.assertEqual(freq, {'CRB': 0.5, None: 0.5})
 
+        freq = Person.objects.item_frequencies('city', map_reduce=False)
+        self.assertEqual(freq, {'CRB': 1.0, None: 1.0})
+        freq = Person.objects.item_frequencies('city', normalize=True, map_reduce=False)
+        self.assertEqual(freq, {'CRB': 0.5, None: 0.5})
+
     def test_item_frequencies_with_null_embedded(self):
         class Data(EmbeddedDocument):
             name = StringField()
@@ -2021,6 +2257,9 @@ class QuerySetTest(unittest.TestCase):
         ot = Person.objects.item_frequencies('extra.tag', map_reduce=True)
         self.assertEqual(ot, {None: 1.0, u'friend': 1.0})
 
+        ot = Person.objects.item_frequencies('extra.tag')
+        self.assertEqual(ot, {None: 1.0, u'friend': 1.0})
+
     def test_item_frequencies_with_0_values(self):
         class Test(Document):
             val = IntField()
@@ -2034,6 +2273,8 @@ class QuerySetTest(unittest.TestCase):
         self.assertEqual(ot, {0: 1})
         ot = Test.objects.item_frequencies('val', map_reduce=False)
         self.assertEqual(ot, {0: 1})
+        ot = Test.objects.item_frequencies('val')
+        self.assertEqual(ot, {0: 1})
 
     def test_item_frequencies_with_False_values(self):
         class Test(Document):
@@ -2048,6 +2289,8 @@ class QuerySetTest(unittest.TestCase):
         self.assertEqual(ot, {False: 1})
         ot = Test.objects.item_frequencies('val', map_reduce=False)
         self.assertEqual(ot, {False: 1})
+        ot = Test.objects.item_frequencies('val')
+        self.assertEqual(ot, {False: 1})
 
     def test_item_frequencies_normalize(self):
         class Test(Document):
@@ -2067,6 +2310,46 @@ class QuerySetTest(unittest.TestCase):
         freqs = Test.objects.item_frequencies('val', map_reduce=True, normalize=True)
         self.assertEqual(freqs, {1: 50.0/70, 2: 20.0/70})
 
+        freqs = Test.objects.item_frequencies('val', normalize=True)
+        self.assertEqual(freqs, {1: 50.0/70, 2: 20.0/70})
+
+    def test_item_frequencies_missing_lists(self):
+        """Ensure documents without the list, or with a null list, are
+        counted as `None` by every backend.
+        """
+        class BlogPost(Document):
+            tags = ListField(StringField(), db_field='blogTags')
+
+        BlogPost.drop_collection()
+        BlogPost(tags=['music', 'film']).save()
+        BlogPost(tags=['music']).save()
+        BlogPost._get_collection().insert({})
+        BlogPost._get_collection().insert({'blogTags': None})
+
+        expected = {'music': 2, 'film': 1, None: 2}
+        self.assertEqual(BlogPost.objects.item_frequencies('tags'),
+                         expected)
+        self.assertEqual(BlogPost.objects.item_frequencies(
+            'tags', map_reduce=True), expected)
+
+    def test_item_frequencies_dynamic_lists(self):
+        """Ensure the items of lists stored in fields of any type are
+        counted individually.
+        """
+        class BlogPost(DynamicDocument):
+            title = StringField()
+
+        BlogPost.drop_collection()
+        BlogPost(title='a', tags=['music', 'film']).save()
+        BlogPost(title='b', tags=['music']).save()
+        BlogPost(title='c', tags='film').save()
+
+        expected = {'music': 2, 'film': 2}
+        self.assertEqual(BlogPost.objects.item_frequencies('tags'),
+                         expected)
+        self.assertEqual(BlogPost.objects.item_frequencies(
+            'tags', map_reduce=True), expected)
+
     def test_average(self):
         """Ensure that field can be averaged correctly.
         """
@@ -2095,6 +2378,38 @@ class QuerySetTest(unittest.TestCase):
         self.Person(name='ageless person').save()
         self.assertEqual(int(self.Person.objects.sum('age')), sum(ages))
 
+    def test_aggregate(self):
+        """Ensure aggregation pipelines start with the query of the queryset
+        and use the database names of fields.
+        """
+        class BlogPost(Document):
+            author = StringField(db_field='a')
+            views = IntField(db_field='v')
+            tags = ListField(StringField(), db_field='t')
+
+        BlogPost.drop_collection()
+        BlogPost(author='Bob', views=10, tags=['a', 'b']).save()
+        BlogPost(author='Bob', views=5, tags=['a']).save()
+        BlogPost(author='Joe', views=1).save()
+
+        results = BlogPost.objects(views__gt=1).aggregate(
+            {'$group': {'_id': '$~author', 'views': {'$sum': '$~views'}}})
+        self.assertEqual(list(results), [{'_id': 'Bob', 'views': 15}])
+
+        results = BlogPost.objects.aggregate(
+            {'$project': {'~author': 1, '_id': 0}},
+            {'$sort': {'~author': 1}})
+        self.assertEqual(list(results), [{'a': 'Bob'}, {'a': 'Bob'},
+                                         {'a': 'Joe'}])
+
+        self.assertEqual(BlogPost.objects.sum('views'), 16)
+        self.assertEqual(BlogPost.objects(author='Joe').average('views'), 1)
+        self.assertEqual(BlogPost.objects(author='Jim').sum('views'), 0)
+        self.assertEqual(BlogPost.objects.item_frequencies('tags'),
+                         {'a': 2, 'b': 1})
+        self.assertEqual(BlogPost.objects.item_frequencies('author'),
+                         {'Bob': 2, 'Joe': 1})
+
     def test_distinct(self):
         """Ensure that the QuerySet.distinct method works.
         """
@@ -2687,6 +3002,47 @@ class QuerySetTest(unittest.TestCase):
 
         Post.drop_collection()
 
+    def test_paginate(self):
+        """Ensure pages are read after the continuation token.
+        """
+        for i in xrange(25):
+            self.Person(name="User %s" % i, age=i % 10).save()
+
+        people = self.Person.objects(age__lt=8).order_by('-age')
+        pages = []
+        page, token = people.paginate(size=10)
+        pages.append(page)
+        while token is not None:
+            page, token = people.paginate(after=token, size=10)
+            pages.append(page)
+
+        self.assertEqual([len(p) for p in pages], [10, 10, 1])
+        results = [person for p in pages for person in p]
+        self.assertEqual([p.age for p in results],
+                         sorted([i % 10 for i in xrange(25) if i % 10 < 8],
+                                reverse=True))
+        self.assertEqual(len(set(p.id for p in results)), 21)
+
+        page, token = people.scalar('name').paginate(size=30)
+        self.assertEqual(len(page), 21)
+        self.assertEqual(token, None)
+
+        # The ordering is read even when it isn't loaded
+        names = people.scalar('name')
+        page, token = names.paginate(size=8)
+        pages = [page]
+        while token is not None:
+            page, token = names.paginate(after=token, size=8)
+            pages.append(page)
+        self.assertEqual([len(p) for p in pages], [8, 8, 5])
+        self.assertEqual(sorted(name for p in pages for name in p),
+                         sorted(p.name for p in results))
+
+        self.assertRaises(InvalidQueryError, people.paginate, after='junk')
+        page, token = people.paginate(size=5)
+        self.assertRaises(InvalidQueryError,
+                          people.order_by('age').paginate, after=token)
+
     def test_order_then_filter(self):
         """Ensure that ordering still works after filtering.
         """
@@ -2733,6 +3089,75 @@ class QuerySetTest(unittest.TestCase):
 
         Number.drop_collection()
 
+    def test_partition(self):
+        """Ensure partitions match disjoint ranges of the matching documents.
+        """
+        for i in xrange(50):
+            self.Person(name="User %s" % i, age=i).save()
+
+        people = self.Person.objects(age__gte=10)
+        partitions = people.partition(4)
+        self.assertTrue(1 < len(partitions) <= 4)
+        ages = [p.age for partition in partitions for p in partition]
+        self.assertEqual(sorted(ages), range(10, 50))
+
+        self.assertEqual(len(people.partition(1)), 1)
+        self.assertEqual(len(self.Person.objects(age__gt=50).partition(4)), 1)
+
+    def test_parallel_map(self):
+        """Ensure the results of each partition are merged.
+        """
+        for i in xrange(50):
+            self.Person(name="User %s" % i, age=i).save()
+
+        people = self.Person.objects(age__lt=40)
+        self.assertEqual(people.parallel_map(lambda qs: qs.count(),
+                                             workers=4), 40)
+        ages = people.parallel_map(lambda qs: list(qs.scalar('age')),
+                                   workers=4)
+        self.assertEqual(sorted(ages), range(40))
+        self.assertRaises(ValueError, people.parallel_map, len,
+                          executor='fork')
+
+    def test_parallel_map_process(self):
+        """Ensure partitions are run in worker processes against the
+        collection of the queryset.
+        """
+        register_connection('testdb-1', 'mongoenginetest2')
+        ParallelPerson.drop_collection()
+        for i in xrange(50):
+            ParallelPerson(name="User %s" % i, age=i).save()
+
+        people = ParallelPerson.objects(age__lt=40)
+        self.assertEqual(people.parallel_map(count_partition, workers=4,
+                                             executor='process'), 40)
+        names = people.parallel_map(partition_names, workers=4,
+                                    executor='process')
+        self.assertEqual(sorted(names),
+                         sorted("User %s" % i for i in xrange(40)))
+
+        with switch_collection(ParallelPerson, 'parallel_archive') as cls:
+            cls.drop_collection()
+            cls(name="Archived").save()
+            archived = cls.objects
+        self.assertEqual(archived.parallel_map(partition_names, workers=2,
+                                               executor='process'),
+                         ["Archived"])
+
+        with switch_db(ParallelPerson, 'testdb-1') as cls:
+            cls.drop_collection()
+            cls(name="Other").save()
+            other = cls.objects
+        self.assertEqual(other.parallel_map(partition_names, workers=2,
+                                            executor='process'),
+                         ["Other"])
+
+        with switch_db(ParallelPerson, 'testdb-1') as cls:
+            cls.drop_collection()
+        with switch_collection(ParallelPerson, 'parallel_archive') as cls:
+            cls.drop_collection()
+        ParallelPerson.drop_collection()
+
     def test_unset_reference(self):
         class Comment(Document):
             text = StringField()
@@ -3040,6 +3465,85 @@ class QuerySetTest(unittest.TestCase):
         val = SettingValue.objects.scalar('key', 'value')
         self.assertEqual(list(val), [('test', 'test value')])
 
+    def test_scalar_without_documents(self):
+        """Ensure scalar values are read from the SON without building
+        documents unless their fields dereference them.
+        """
+        class Address(EmbeddedDocument):
+            city = StringField()
+
+        class User(Document):
+            name = StringField(db_field='n')
+            age = IntField(default=18)
+            tags = ListField(StringField())
+            address = EmbeddedDocumentField(Address)
+            friends = ListField(ReferenceField('self'))
+
+        User.drop_collection()
+        bob = User(name='Bob', tags=['a'],
+                   address=Address(city='Russell')).save()
+        User(name='Joe', age=30, friends=[bob]).save()
+
+        def from_son(cls, *args, **kwargs):
+            self.fail('A document was built')
+        User._from_son = classmethod(from_son)
+        try:
+            users = User.objects.order_by('name')
+            self.assertEqual(
+                list(users.values_list('name', 'age', 'tags')),
+                [('Bob', 18, ['a']), ('Joe', 30, [])])
+            self.assertEqual(users.scalar('address__city')[0], 'Russell')
+            self.assertEqual(users.scalar('name').in_bulk([bob.pk]),
+                             {bob.pk: 'Bob'})
+        finally:
+            del User._from_son
+
+        self.assertEqual(User.objects(name='Joe').scalar('friends').get(),
+                         [bob])
+
+    def test_to_columns(self):
+        """Ensure to_columns reads the values of each field into a column.
+        """
+        class Reading(Document):
+            sensor = StringField()
+            value = FloatField()
+            count = IntField()
+            ts = DateTimeField()
+
+        Reading.drop_collection()
+        ts = datetime(2013, 1, 1, 12, 30)
+        for i in xrange(3):
+            Reading(sensor='s%s' % i, value=i / 2.0, count=i, ts=ts).save()
+        Reading(sensor='s3').save()
+
+        columns = Reading.objects.order_by('sensor').to_columns(
+            'sensor', 'value', 'count', 'ts')
+        self.assertEqual(sorted(columns), ['count', 'sensor', 'ts', 'value'])
+        self.assertEqual(list(columns['sensor']), ['s0', 's1', 's2', 's3'])
+        self.assertEqual(list(columns['value'])[:3], [0.0, 0.5, 1.0])
+        value = columns['value'][3]
+        self.assertNotEqual(value, value)  # NaN
+        self.assertEqual(list(columns['count']), [0, 1, 2, None])
+        self.assertEqual(list(columns['ts']), [ts, ts, ts, None])
+
+        columns = Reading.objects(sensor='s1').to_columns('count')
+        self.assertEqual(list(columns['count']), [1])
+
+    def test_exists(self):
+        """Ensure exists() tells whether any document matches.
+        """
+        self.Person(name="User A", age=20).save()
+
+        self.assertTrue(self.Person.objects.exists())
+        self.assertTrue(self.Person.objects(age=20).exists())
+        self.assertFalse(self.Person.objects(age=30).exists())
+        self.assertFalse(self.Person.objects.skip(1).exists())
+        self.assertFalse(self.Person.objects.none().exists())
+
+        with query_counter() as q:
+            self.Person.objects.exists()
+            self.assertEqual(q, 1)
+
     def test_scalar_cursor_behaviour(self):
         """Ensure that a query returns a valid set of results.
         """
@@ -3243,6 +3747,42 @@ class QuerySetTest(unittest.TestCase):
 
         self.assertEqual(doc_objects, Doc.objects.from_json(json_data))
 
+    def test_dump_and_load_json(self):
+        """Ensure querysets can be written as newline-delimited JSON and
+        loaded back.
+        """
+        from StringIO import StringIO
+
+        class Doc(Document):
+            name = StringField()
+            number = IntField()
+            created = DateTimeField()
+
+        Doc.drop_collection()
+        created = datetime(2013, 1, 1, 12, 30)
+        for i in xrange(5):
+            Doc(name='Doc %s' % i, number=i, created=created).save()
+
+        fp = StringIO()
+        qs = Doc.objects.order_by('-number').only('name', 'number')
+        self.assertEqual(qs[1:4].dump_json(fp, batch_size=2), 3)
+        lines = fp.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(
+            [Doc.from_json(line).number for line in lines], [3, 2, 1])
+        self.assertEqual(Doc.from_json(lines[0]).created, None)
+
+        fp = StringIO()
+        Doc.objects.dump_json(fp)
+        docs = list(Doc.objects)
+        Doc.drop_collection()
+
+        fp.seek(0)
+        stats = Doc.objects.load_json(fp, chunk_size=2)
+        self.assertEqual([s['inserted'] for s in stats], [2, 2, 1])
+        self.assertEqual(list(Doc.objects), docs)
+        self.assertEqual(Doc.objects.first().created, created)
+
     def test_as_pymongo(self):
 
         from decimal import Decimal
@@ -3276,6 +3816,157 @@ class QuerySetTest(unittest.TestCase):
         self.assertEqual(results[1]['name'], 'Barack Obama')
         self.assertEqual(results[1]['price'], Decimal('2.22'))
 
+    def test_as_pymongo_embedded(self):
+        """Ensure as_pymongo keeps the whole of the embedded documents
+        loaded and returns rows untouched when there is nothing to do.
+        """
+        class Address(EmbeddedDocument):
+            city = StringField()
+            zip_code = IntField()
+
+        class User(Document):
+            name = StringField()
+            address = EmbeddedDocumentField(Address)
+
+        User.drop_collection()
+        User(name="Bob Dole",
+             address=Address(city="Russell", zip_code=67665)).save()
+
+        row = User.objects.as_pymongo().first()
+        self.assertEqual(row, User._get_collection().find_one())
+
+        row = User.objects.only('address').as_pymongo().first()
+        self.assertEqual(row, {'address': {'city': 'Russell',
+                                           'zip_code': 67665}})
+
+        row = User.objects.only('address.city').as_pymongo(
+            coerce_types=True).first()
+        self.assertEqual(row, {'address': {'city': 'Russell'}})
+
+    def test_lazy(self):
+        """Ensure lazy querysets convert values when they are first read and
+        save unread values unchanged.
+        """
+        class Comment(EmbeddedDocument):
+            author = StringField()
+
+        class BlogPost(Document):
+            title = StringField()
+            hits = IntField()
+            comments = ListField(EmbeddedDocumentField(Comment))
+
+        BlogPost.drop_collection()
+        BlogPost(title="Test", hits=1,
+                 comments=[Comment(author="Ross")]).save()
+
+        post = BlogPost.objects.lazy().first()
+        self.assertTrue('comments' in post._unread_fields())
+        self.assertEqual(post.hits, 1)
+        self.assertFalse('hits' in post._unread_fields())
+
+        post.title = "New title"
+        self.assertEqual(post._delta(), ({'title': "New title"}, {}))
+        post.save()
+        self.assertTrue('comments' in post._unread_fields())
+
+        post = BlogPost.objects.lazy().first()
+        self.assertEqual(post.title, "New title")
+        self.assertEqual(post.comments[0].author, "Ross")
+        post.comments[0].author = "Bob"
+        post.save()
+
+        post = BlogPost.objects.first()
+        self.assertEqual(post._unread_fields(), ())
+        self.assertEqual(post.comments[0].author, "Bob")
+
+    def test_readonly(self):
+        """Ensure read-only querysets return frozen documents.
+        """
+        class Comment(EmbeddedDocument):
+            author = StringField()
+
+        class BlogPost(Document):
+            title = StringField()
+            tags = ListField(StringField())
+            comments = ListField(EmbeddedDocumentField(Comment))
+
+            @property
+            def slug(self):
+                return self.title.lower()
+
+        class Setting(Document):
+            name = StringField()
+            meta = {'readonly_hydration': True}
+
+        BlogPost.drop_collection()
+        Setting.drop_collection()
+
+        BlogPost(title="Test", tags=["a"],
+                 comments=[Comment(author="Ross")]).save()
+        Setting(name="debug").save()
+
+        post = BlogPost.objects.readonly().first()
+        self.assertTrue(isinstance(post, ReadOnlyDocument))
+        self.assertEqual(post._document, BlogPost)
+        self.assertEqual(post.title, "Test")
+        self.assertEqual(post.slug, "test")
+        self.assertEqual(post.tags, ["a"])
+        self.assertFalse(isinstance(post.tags, BaseList))
+        self.assertEqual(post.comments[0].author, "Ross")
+        self.assertEqual(post, BlogPost.objects.readonly().get(pk=post.pk))
+
+        self.assertRaises(OperationError, setattr, post, 'title', "New")
+        self.assertRaises(OperationError, post.save)
+        self.assertRaises(OperationError, post.delete)
+
+        self.assertTrue(isinstance(Setting.objects.first(), ReadOnlyDocument))
+        self.assertTrue(isinstance(Setting.objects.readonly(False).first(),
+                                   Setting))
+
+    def test_readonly_hydration_internal_querysets(self):
+        """Ensure documents with readonly_hydration can still be reloaded
+        and deleted, and keep their class and static methods when read-only.
+        """
+        class Setting(Document):
+            name = StringField()
+            meta = {'readonly_hydration': True}
+
+            @classmethod
+            def named(cls, name):
+                return cls.objects.readonly(False).get(name=name)
+
+            @staticmethod
+            def normalize(name):
+                return name.lower()
+
+        Setting.drop_collection()
+        Setting(name="debug").save()
+
+        setting = Setting.objects.readonly(False).first()
+        setting.name = "changed"
+        setting.reload()
+        self.assertTrue(isinstance(setting, Setting))
+        self.assertEqual(setting.name, "debug")
+        self.assertEqual(setting._changed_fields, [])
+
+        readonly = Setting.objects.first()
+        self.assertTrue(isinstance(readonly, ReadOnlyDocument))
+        self.assertEqual(readonly.named("debug"), setting)
+        self.assertEqual(readonly.normalize("DEBUG"), "debug")
+
+        deleted = []
+
+        def receiver(sender, document, **kwargs):
+            deleted.append(document)
+
+        pre_delete.connect(receiver, sender=Setting)
+        try:
+            Setting.objects.delete()
+        finally:
+            pre_delete.disconnect(receiver, sender=Setting)
+        self.assertEqual(Setting.objects.count(), 0)
+        self.assertTrue(isinstance(deleted[0], Setting))
+
     def test_no_dereference(self):
 
         class Organization(Document):
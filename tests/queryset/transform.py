@@ -107,6 +107,56 @@ class TransformTest(unittest.TestCase):
 
         self.assertEqual(q1, q2)
 
+    def test_query_plan_cache(self):
+        """Ensure that query plans are cached for each set of keys and only
+        the values are converted again.
+        """
+        class Author(EmbeddedDocument):
+            name = StringField(db_field='n')
+
+        class BlogPost(Document):
+            author = EmbeddedDocumentField(Author, db_field='a')
+            age = IntField()
+
+        BlogPost._query_plans.clear()
+        query = transform.query(BlogPost, author__name__icontains='ross',
+                                age__gte='3')
+        self.assertEqual(query['a.n'].pattern, 'ross')
+        self.assertEqual(query['age'], {'$gte': 3})
+        self.assertEqual(BlogPost._query_plans.keys(),
+                         [('age__gte', 'author__name__icontains')])
+
+        query = transform.query(BlogPost, author__name__icontains='bob',
+                                age__gte=5)
+        self.assertEqual(query['a.n'].pattern, 'bob')
+        self.assertEqual(query['age'], {'$gte': 5})
+        self.assertEqual(len(BlogPost._query_plans), 1)
+
+        self.assertRaises(InvalidQueryError, transform.query, BlogPost,
+                          title='test')
+        self.assertEqual(len(BlogPost._query_plans), 1)
+
+    def test_update_plan_cache(self):
+        """Ensure that update plans are cached for each set of keys.
+        """
+        class BlogPost(Document):
+            views = IntField(db_field='v')
+            tags = ListField(StringField())
+
+        BlogPost._update_plans.clear()
+        update = transform.update(BlogPost, inc__views=1, push__tags='a')
+        self.assertEqual(update, {'$inc': {'v': 1}, '$push': {'tags': 'a'}})
+
+        update = transform.update(BlogPost, push__tags='b', inc__views=2)
+        self.assertEqual(update, {'$inc': {'v': 2}, '$push': {'tags': 'b'}})
+        self.assertEqual(BlogPost._update_plans.keys(),
+                         [('inc__views', 'push__tags')])
+
+        self.assertEqual(transform.update(BlogPost, dec__views=3),
+                         {'$inc': {'v': -3}})
+        self.assertEqual(transform.update(BlogPost, dec__views=-3),
+                         {'$inc': {'v': -3}})
+
     def test_raw_query_and_Q_objects(self):
         """
         Test raw plays nicely
@@ -6,7 +6,8 @@ import unittest
 from mongoengine import *
 from mongoengine.connection import get_db
 from mongoengine.context_managers import (switch_db, switch_collection,
-                                          no_dereference, query_counter)
+                                          no_dereference, identity_map,
+                                          query_counter)
 
 
 class ContextManagersTest(unittest.TestCase):
@@ -139,6 +140,54 @@ class ContextManagersTest(unittest.TestCase):
         self.assertTrue(isinstance(group.ref, User))
         self.assertTrue(isinstance(group.generic, User))
 
+    def test_identity_map(self):
+        """Ensure documents are only loaded once inside an identity_map.
+        """
+        connect('mongoenginetest')
+
+        class User(Document):
+            name = StringField()
+
+        class Group(Document):
+            ref = ReferenceField(User)
+            generic = GenericReferenceField()
+            members = ListField(ReferenceField(User))
+
+        User.drop_collection()
+        Group.drop_collection()
+
+        user = User(name='user').save()
+        Group(ref=user, generic=user, members=[user]).save()
+        Group(ref=user, generic=user, members=[user]).save()
+
+        with identity_map():
+            with query_counter() as q:
+                loaded = User.objects.with_id(user.id)
+                self.assertEqual(q, 1)
+                self.assertTrue(User.objects.get(pk=user.id) is loaded)
+                self.assertTrue(User.objects.with_id(str(user.id)) is loaded)
+
+                for group in Group.objects:
+                    self.assertTrue(group.ref is loaded)
+                    self.assertTrue(group.generic is loaded)
+                    self.assertTrue(group.members[0] is loaded)
+                self.assertEqual(q, 2)
+
+                self.assertFalse(User.objects.only('name').with_id(user.id)
+                                 is loaded)
+
+            loaded.name = 'changed'
+            loaded.save()
+            self.assertFalse(User.objects.with_id(user.id) is loaded)
+
+            User.objects.update(set__name='updated')
+            self.assertEqual(User.objects.get(pk=user.id).name, 'updated')
+
+            User.objects.with_id(user.id).delete()
+            self.assertEqual(User.objects.with_id(user.id), None)
+
+        self.assertEqual(identity_map.current(), None)
+
     def test_query_counter(self):
         connect('mongoenginetest')
         db = get_db()
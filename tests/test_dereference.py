@@ -1177,6 +1177,41 @@ class FieldTest(unittest.TestCase):
 
         self.assertEqual(2, len([brand for bg in brand_groups for brand in bg.brands]))
 
+    def test_select_related_batch_size(self):
+        """Ensure streaming select_related fetches the references of each
+        batch with one query per collection.
+        """
+        class Person(Document):
+            name = StringField()
+            meta = {'allow_inheritance': True}
+
+        class Employee(Person):
+            pass
+
+        class BlogPost(Document):
+            author = ReferenceField(Person)
+            editor = GenericReferenceField()
+
+        Person.drop_collection()
+        BlogPost.drop_collection()
+
+        for i in xrange(10):
+            author = Person(name="Author %s" % i).save()
+            editor = Employee(name="Editor %s" % i).save()
+            BlogPost(author=author, editor=editor).save()
+
+        with query_counter() as q:
+            posts = BlogPost.objects.select_related(batch_size=20)
+            self.assertEqual(q, 0)
+
+            names = [(post.author.name, post.editor.name) for post in posts]
+            self.assertEqual(len(names), 10)
+            # One query for the posts then one for both the authors and the
+            # editors, which share a collection
+            self.assertEqual(q, 2)
+
+        self.assertEqual(sorted(names)[0], ("Author 0", "Editor 0"))
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -263,5 +263,67 @@ class SignalTests(unittest.TestCase):
         # second time, it must be an update
         self.assertEqual(self.get_signal_output(ei.save), ['Is updated'])
 
+    def test_has_receivers_for(self):
+        """ Receivers are looked up again when they are (dis)connected."""
+        def receiver(sender, **kwargs):
+            signal_output.append('pre_save %s' % sender.__name__)
+
+        self.assertFalse(signals.pre_save.has_receivers_for(self.ExplicitId))
+        signals.pre_save.connect(receiver, sender=self.ExplicitId)
+        self.assertTrue(signals.pre_save.has_receivers_for(self.ExplicitId))
+        self.assertEqual(self.get_signal_output(self.ExplicitId(id=1).save),
+                         ['pre_save ExplicitId', 'Is created'])
+
+        signals.pre_save.disconnect(receiver, sender=self.ExplicitId)
+        self.assertFalse(signals.pre_save.has_receivers_for(self.ExplicitId))
+        self.assertEqual(self.get_signal_output(self.ExplicitId(id=2).save),
+                         ['Is created'])
+
+    def test_bulk_signals(self):
+        """ Bulk updates and deletes send one signal each."""
+        def pre_bulk_update(sender, queryset, update, **kwargs):
+            signal_output.append('pre_bulk_update %s' % sorted(update))
+            update['set__name'] = 'Changed'
+
+        def post_bulk_update(sender, queryset, update, updated, **kwargs):
+            signal_output.append('post_bulk_update %s' % updated)
+
+        def pre_bulk_delete(sender, queryset, **kwargs):
+            signal_output.append('pre_bulk_delete %s' % queryset.count())
+
+        def post_bulk_delete(sender, queryset, deleted, **kwargs):
+            signal_output.append('post_bulk_delete %s' % deleted)
+
+        class Post(Document):
+            name = StringField()
+            views = IntField()
+
+        Post.drop_collection()
+        for i in range(3):
+            Post(name='Post %s' % i).save()
+
+        signals.pre_bulk_update.connect(pre_bulk_update, sender=Post)
+        signals.post_bulk_update.connect(post_bulk_update, sender=Post)
+        signals.pre_bulk_delete.connect(pre_bulk_delete, sender=Post)
+        signals.post_bulk_delete.connect(post_bulk_delete, sender=Post)
+        try:
+            self.assertEqual(
+                self.get_signal_output(Post.objects.update, inc__views=1),
+                ["pre_bulk_update ['inc__views']", 'post_bulk_update 3'])
+            self.assertEqual(Post.objects(name='Changed').count(), 3)
+
+            # Deleting a document alone doesn't send the bulk signals
+            self.assertEqual(
+                self.get_signal_output(Post.objects.first().delete), [])
+
+            self.assertEqual(self.get_signal_output(Post.objects.delete),
+                             ['pre_bulk_delete 2', 'post_bulk_delete 2'])
+            self.assertEqual(Post.objects.count(), 0)
+        finally:
+            signals.pre_bulk_update.disconnect(pre_bulk_update, sender=Post)
+            signals.post_bulk_update.disconnect(post_bulk_update, sender=Post)
+            signals.pre_bulk_delete.disconnect(pre_bulk_delete, sender=Post)
+            signals.post_bulk_delete.disconnect(post_bulk_delete, sender=Post)
+
 if __name__ == '__main__':
     unittest.main()